@@ -0,0 +1,51 @@
+"""
+Repeat fetches through HTTPCache against the local stub API.
+
+Shows a cold fetch, a warm one served from the cache, and a fetch after the
+TTL has passed that revalidates with ETags instead of downloading again.
+
+    python benchmarks/bench_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import PageFetcher  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+from ratelimit import TokenBucket  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+PAGES = 40
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "http_cache.db")
+    now = [time.time()]
+    cache = HTTPCache(path=path, ttl=60, clock=lambda: now[0])
+
+    with StubAPI(total_jobs=400, latency=0.05) as api:
+        def run(label):
+            before = api.requests
+            fetcher = PageFetcher({}, base_url=api.url, concurrency=4, limiter=TokenBucket(rate=20), cache=cache)
+            start = time.perf_counter()
+            jobs = fetcher.fetch_all(PAGES)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<32} {len(jobs):>4} jobs {elapsed:6.2f}s  api calls={api.requests - before:>3}  {cache.stats()}")
+
+        run("cold")
+        run("warm (memory)")
+
+        # A fresh process only has the SQLite file to go on
+        cache = HTTPCache(path=path, ttl=60, clock=lambda: now[0])
+        run("warm (disk, new process)")
+
+        now[0] += 120
+        run("after TTL (revalidate)")
+        print(f"304 responses from stub: {api.not_modified}")
+
+
+if __name__ == "__main__":
+    main()
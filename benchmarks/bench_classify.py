@@ -0,0 +1,114 @@
+"""
+Golden-output check and benchmark for the compiled classifier.
+
+Runs the old per-pattern classify_job next to CLASSIFIER on hand-picked edge
+cases and a synthetic corpus, fails if any label differs, then times both on
+short and long descriptions.
+
+    python benchmarks/bench_classify.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from groupme_internships import CS_BLOCKLIST, CS_TOKENS, FILTERS, classify_job  # noqa: E402
+from job import Job  # noqa: E402
+
+GOLDEN = [
+    ("Software Engineer Intern", "", "CS/IT"),
+    ("Security Guard", "Patrol the software campus overnight", "Health Sciences"),
+    ("Biomedical Engineer Intern", "Design medical devices", "Engineering"),
+    ("Data Entry Clerk", "Enter records into the computer system", "Other"),
+    ("Networking Event Coordinator", "Plan our networking mixer", "Other"),
+    ("Paralegal Intern", "Support our legal team", "Social Sciences / Law"),
+    ("Frontend Developer", "React, TypeScript, AWS", "CS/IT"),
+    ("Full-Stack Engineer", "Node and Postgres", "CS/IT"),
+    ("Cashier", "Front of store retail", "Other"),
+    ("Janitor", "Keep the facilities clean", "Other"),
+    ("Custodian", "Software company office", "Health Sciences"),
+    ("Mechanical Design Intern", "SolidWorks and FEA", "Engineering"),
+    ("Museum Curator Assistant", "Art history collections", "Humanities"),
+    ("Public Policy Fellow", "Research for the city government", "Social Sciences / Law"),
+    ("Clinical Research Assistant", "Hospital lab work", "Health Sciences"),
+    ("Machine Learning Intern", "NLP and computer vision research", "CS/IT"),
+    ("Marketing Intern", "Brand campaigns", "Business"),
+    ("", "", "Other"),
+]
+
+VOCAB = (
+    "the team will work with our partners across many projects to deliver results in a fast "
+    "paced environment you should be curious collaborative and eager to learn new skills "
+    "software developer engineer cloud aws data analytics machine learning security guard "
+    "retail cashier driver mechanical civil electrical biomedical finance accounting marketing "
+    "sales writing editor design museum history policy government law legal clinical lab "
+    "medicine nursing pharmacy neuroscience robotics network networking event data entry"
+).split()
+
+
+def legacy_classifier():
+    """classify_job as it was before CompiledClassifier"""
+    allowed = [re.compile(rf"\b{p}\b", re.I) for p in CS_TOKENS]
+    block = [re.compile(rf"\b{p}\b", re.I) for p in CS_BLOCKLIST]
+    filters = {field: re.compile(source, re.I) for field, source in FILTERS.items()}
+
+    def classify(job):
+        text = f"{job.title} {job.description}"
+        if filters["CS/IT"].search(text):
+            if any(p.search(text) for p in allowed) and not any(p.search(text) for p in block):
+                return "CS/IT"
+        for field, pat in filters.items():
+            if field != "CS/IT" and pat.search(text):
+                return field
+        return "Other"
+
+    return classify
+
+
+def synthetic_jobs(count, description_words, seed=0):
+    rng = random.Random(seed)
+    return [
+        Job(
+            title=" ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, 4))).title(),
+            description=" ".join(rng.choice(VOCAB) for _ in range(rng.randint(0, description_words))),
+        )
+        for _ in range(count)
+    ]
+
+
+def timed(fn, jobs):
+    start = time.perf_counter()
+    labels = [fn(job) for job in jobs]
+    return labels, time.perf_counter() - start
+
+
+def main():
+    legacy = legacy_classifier()
+
+    for title, description, expected in GOLDEN:
+        job = Job(title, description=description)
+        assert legacy(job) == expected, (title, legacy(job), expected)
+        assert classify_job(job) == expected, (title, classify_job(job), expected)
+    print(f"golden cases: {len(GOLDEN)} ok")
+
+    # Sparse vocabulary so plenty of jobs fall through to later categories or Other
+    sparse = [Job(t, description=d) for t, d in
+              (("Intern " + w, "a b c " + w) for w in VOCAB)]
+    for job in sparse:
+        assert legacy(job) == classify_job(job), job
+
+    print(f"{'desc words':>10} {'jobs':>6} {'legacy ms':>10} {'compiled ms':>11} {'speedup':>8}")
+    for words in (20, 200, 2000):
+        jobs = synthetic_jobs(2000, words, seed=words)
+        old, old_time = timed(legacy, jobs)
+        new, new_time = timed(classify_job, jobs)
+        mismatches = [(j.title, a, b) for j, a, b in zip(jobs, old, new) if a != b]
+        assert not mismatches, mismatches[:5]
+        print(f"{words:>10} {len(jobs):>6} {old_time * 1e3:10.1f} {new_time * 1e3:11.1f} {old_time / new_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+The resident scheduler (--daemon) against the local stub.
+
+First a simulated day on a FakeClock: fetch hourly, CS/IT posts every 30
+minutes, Humanities once a day, the rest hourly, with new postings showing
+up in the stub feed every hour. Prints how often each cycle ran and what
+got posted. The day takes seconds, since waiting only moves the fake clock.
+
+Then what staying resident saves: a one-shot run in a fresh interpreter
+(the old cron job) vs the same run repeated in a warm process, both with
+the job store already filled and nothing new to post.
+
+    python benchmarks/bench_daemon.py
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("METRICS_REPORT_PATH", "")
+os.environ.setdefault("ACCESS_TOKEN", "bench-token")
+os.environ.setdefault("POST_RATE", "1000")
+os.environ.setdefault("POST_BURST", "1000")
+os.environ.setdefault("FETCH_RATE", "1000")
+os.environ.setdefault("MAX_PAGES", "40")
+os.environ.setdefault("FETCH_INTERVAL", "3600")
+os.environ.setdefault("POST_SCHEDULE", "CS/IT=1800,Humanities=86400")
+STATE_DIR = tempfile.mkdtemp()
+os.environ.setdefault("HTTP_CACHE_PATH", os.path.join(STATE_DIR, "http_cache.db"))
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(STATE_DIR, "jobs.db"))
+os.environ.setdefault("PATTERN_CACHE_PATH", os.path.join(STATE_DIR, "pattern_cache.bin"))
+for name in ("CS_ID", "ENGINEERING_ID", "MED_ID", "LAW_ID", "BUSINESS_ID", "HUMANITIES_ID"):
+    os.environ.setdefault(name, name.lower())
+
+import groupme_internships as g  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from scheduler import FakeClock, Scheduler  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+DAY = 24 * 60 * 60
+NEW_PER_HOUR = 20
+
+
+def simulated_day(api):
+    backlog = generate_jobs(200 + NEW_PER_HOUR * 25, seed=3)
+    api.jobs = backlog[:200]
+    backlog = backlog[200:]
+
+    def new_postings():
+        # Newest first, like the real feed
+        api.jobs[:0] = backlog[:NEW_PER_HOUR]
+        del backlog[:NEW_PER_HOUR]
+
+    clock = FakeClock(start=time.time())
+    scheduler = Scheduler(clock=clock, seed=1)
+    # The HTTP cache ages on the simulated clock too, so cached pages go stale as they would in a real day
+    g.HTTP_CACHE.clock = clock.time
+    # Registered before run_daemon's tasks, so each hour's postings land before that hour's fetch
+    scheduler.every("new postings", 3600, new_postings, delay=3600)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        g.run_daemon(scheduler, until=clock.time() + DAY)
+    elapsed = time.perf_counter() - start
+    g.HTTP_CACHE.clock = time.time
+
+    print(f"simulated 24h in {elapsed:.1f}s; {len(api.jobs)} jobs in the feed, {len(api.messages)} posts")
+    print(f"{'task':<30} {'runs':>5} {'failures':>9} {'mean gap':>9}")
+    for name, task in scheduler.status()["tasks"].items():
+        gap = DAY / task["runs"] if task["runs"] else 0
+        print(f"{name:<30} {task['runs']:>5} {task['failures']:>9} {gap / 60:8.0f}m")
+    posted = {}
+    for group_id, _ in api.messages:
+        posted[group_id] = posted.get(group_id, 0) + 1
+    print("posts per subgroup:", ", ".join(f"{group} {count}" for group, count in sorted(posted.items())))
+
+
+def cold_vs_warm(api):
+    env = dict(os.environ, RAPIDAPI_URL=api.url, DRY_RUN="1")
+    cold = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT, "groupme_internships.py")], env=env, cwd=ROOT,
+                       check=True, capture_output=True)
+        cold.append(time.perf_counter() - start)
+
+    g.DRY_RUN = True
+    warm = []
+    for _ in range(3):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            g.post_last_week_internships()
+        warm.append(time.perf_counter() - start)
+    print(f"one run, nothing new: fresh interpreter {min(cold) * 1e3:.0f}ms, warm process {min(warm) * 1e3:.0f}ms")
+
+
+def main():
+    with StubAPI(jobs=[]) as api:
+        g.RAPIDAPI_URL = api.url
+        g.GROUPME_API_BASE = api.base_url
+        simulated_day(api)
+        cold_vs_warm(api)
+
+
+if __name__ == "__main__":
+    main()
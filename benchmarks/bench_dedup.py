@@ -0,0 +1,86 @@
+"""
+Old pairwise dedup loop vs DedupIndex.
+
+Checks both give the same answer where the old loop is still affordable,
+then shows the index scaling up to 100k jobs.
+
+    python benchmarks/bench_dedup.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import dedupe_jobs  # noqa: E402
+from job import Job  # noqa: E402
+
+LEVELS = ["", "Senior ", "Junior ", "Lead "]
+ROLES = ["Software Engineer", "Data Analyst", "Marketing", "Finance", "Mechanical Engineer",
+         "Research Assistant", "Product Manager", "UX Designer", "Legal", "Clinical Research"]
+TEAMS = ["", " - Platform", " - Payments", " - Growth", " - Cloud Infrastructure", " (Remote)", " - Team A"]
+SUFFIXES = [" Intern", " Internship", " Summer 2026 Intern", " Student Position"]
+
+
+def synthetic_jobs(count, seed=0):
+    rng = random.Random(seed)
+    orgs = [f"Company {i}" for i in range(max(1, count // 15))]
+    return [
+        Job(
+            organization=rng.choice(orgs),
+            title=rng.choice(LEVELS) + rng.choice(ROLES) + rng.choice(TEAMS) + rng.choice(SUFFIXES),
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_dedupe(jobs):
+    """The loop get_internships_data used before DedupIndex"""
+    unique_jobs = []
+    seen = set()
+    for job in jobs:
+        company = job.organization.lower().strip()
+        title = job.title.lower().strip()
+        title_cleaned = re.sub(r'\b(intern|internship|summer|2024|2025|2026|student|position|role|opportunity)\b', '', title)
+        title_cleaned = re.sub(r'\s+', ' ', title_cleaned).strip()
+        job_key = (company, title_cleaned)
+        is_duplicate = False
+        for existing_company, existing_title in seen:
+            if company == existing_company:
+                title_words = set(title_cleaned.split())
+                existing_words = set(existing_title.split())
+                if title_words and existing_words:
+                    common_words = title_words.intersection(existing_words)
+                    if len(common_words) / max(len(title_words), len(existing_words)) > 0.7:
+                        is_duplicate = True
+                        break
+        if not is_duplicate and job_key not in seen:
+            seen.add(job_key)
+            unique_jobs.append(job)
+    return unique_jobs
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'jobs':>7} {'legacy s':>10} {'index s':>10} {'us/job':>8} {'unique':>7}")
+    for count in (1_000, 5_000, 10_000, 50_000, 100_000):
+        jobs = synthetic_jobs(count)
+        fast, fast_time = timed(dedupe_jobs, jobs)
+        if count <= 5_000:
+            slow, slow_time = timed(legacy_dedupe, jobs)
+            assert [id(j) for j in slow] == [id(j) for j in fast], "DedupIndex disagrees with the old loop"
+            legacy = f"{slow_time:10.3f}"
+        else:
+            legacy = f"{'-':>10}"
+        print(f"{count:>7} {legacy} {fast_time:10.3f} {fast_time / count * 1e6:8.1f} {len(fast):>7}")
+
+
+if __name__ == "__main__":
+    main()
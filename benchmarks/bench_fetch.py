@@ -0,0 +1,66 @@
+"""
+Serial vs concurrent page fetching against the local stub API.
+
+    python benchmarks/bench_fetch.py
+"""
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import PageFetcher  # noqa: E402
+from ratelimit import TokenBucket  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+PAGES = 40
+
+
+def serial_fetch(url, pages):
+    """The old get_internships_data loop: one page at a time, 0.5s sleep in between"""
+    jobs = []
+    for page in range(pages):
+        response = requests.get(url, params={"offset": page * 10})
+        data = response.json()
+        if not data:
+            break
+        jobs.extend(data)
+        time.sleep(0.5)
+    return jobs
+
+
+def run(label, fn):
+    start = time.perf_counter()
+    jobs = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {len(jobs):>4} jobs  {elapsed:6.2f}s")
+    return jobs
+
+
+def main():
+    with StubAPI(total_jobs=400, latency=0.05) as api:
+        run("serial + 0.5s sleep", lambda: serial_fetch(api.url, PAGES))
+
+    for quota in (10, 20, 40):
+        with StubAPI(total_jobs=400, latency=0.05, quota_per_sec=quota) as api:
+            fetcher = PageFetcher({}, base_url=api.url, concurrency=8, limiter=TokenBucket(rate=quota))
+            run(f"concurrent, quota {quota}/s", lambda: fetcher.fetch_all(PAGES))
+            print(f"    requests={api.requests} throttled={api.throttled}")
+
+    # Quota set higher than the server allows: the bucket has to learn from 429s
+    with StubAPI(total_jobs=400, latency=0.05, quota_per_sec=10) as api:
+        fetcher = PageFetcher({}, base_url=api.url, concurrency=8, limiter=TokenBucket(rate=50))
+        run("concurrent, bucket 50/s vs server 10/s", lambda: fetcher.fetch_all(PAGES))
+        print(f"    requests={api.requests} throttled={api.throttled}")
+
+    # Short result set: stops after the first short page instead of walking all 40 offsets
+    with StubAPI(total_jobs=125, latency=0.05) as api:
+        fetcher = PageFetcher({}, base_url=api.url, concurrency=8, limiter=TokenBucket(rate=100))
+        run("concurrent, 125 jobs available", lambda: fetcher.fetch_all(PAGES))
+        print(f"    requests={api.requests}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Memory held by a parsed corpus: raw RapidAPI dicts vs Job records.
+
+Serializes a synthetic corpus with every field the API sends, then parses
+the same JSON text both ways and reports what tracemalloc says stays
+allocated per job, and how long each parse took.
+
+    python benchmarks/bench_job_memory.py
+"""
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_jobs  # noqa: E402
+from job import jobs_from_records  # noqa: E402
+
+# The rest of an active-jb-7d record, which the bot never reads
+EXTRA_FIELDS = {
+    "date_posted": "2025-09-30T14:03:11",
+    "date_created": "2025-09-30T14:20:45",
+    "date_validthrough": "2025-10-30T14:03:11",
+    "organization_url": "https://www.linkedin.com/company/example",
+    "organization_logo": "https://media.licdn.com/dms/image/v2/example/company-logo_200_200/0/1700000000000",
+    "locations_derived": ["New York, New York, United States"],
+    "locations_raw": [{"@type": "Place", "address": {"addressCountry": "US", "addressLocality": "New York"}}],
+    "location_type": None,
+    "remote_derived": False,
+    "employment_type": ["INTERN"],
+    "source": "linkedin",
+    "source_type": "jobboard",
+    "seniority": "Internship",
+    "recruiter_name": None,
+    "linkedin_org_employees": 5000,
+    "linkedin_org_industry": "Software Development",
+}
+
+
+def make_records(count, description_words=(80, 400)):
+    """Synthetic jobs with every field of a real record"""
+    rng = random.Random(count)
+    records = generate_jobs(count, description_words=description_words, seed=count)
+    for i, record in enumerate(records):
+        record.update(EXTRA_FIELDS)
+        record["id"] = str(1_800_000_000 + i)
+        record["linkedin_org_employees"] = rng.randint(10, 100_000)
+    return records
+
+
+def measure(parse, text):
+    """(objects, bytes still allocated after parse(text), seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    parsed = parse(text)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return parsed, held, elapsed
+
+
+def main():
+    print(f"{'jobs':>7} {'dicts MiB':>10} {'Jobs MiB':>9} {'B/job':>13} {'saved':>6} {'parse':>15}")
+    for count in (10_000, 50_000):
+        text = json.dumps(make_records(count))
+        raw, raw_bytes, raw_time = measure(json.loads, text)
+        jobs, job_bytes, job_time = measure(lambda t: jobs_from_records(json.loads(t)), text)
+        assert len(raw) == len(jobs) == count
+        del raw, jobs
+        print(f"{count:>7} {raw_bytes / 2**20:10.1f} {job_bytes / 2**20:9.1f} "
+              f"{raw_bytes // count:>6} -> {job_bytes // count:<5} {1 - job_bytes / raw_bytes:5.0%} "
+              f"{raw_time * 1e3:6.0f} -> {job_time * 1e3:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Label cache over successive 7-day windows.
+
+Each daily run sees the last 7 days of postings, so six sevenths of every
+window were already classified the day before. Times classify_jobs with a
+cold cache, on following days, after a restart (labels come back from the
+SQLite file), and after a rule change (fingerprint differs, all misses).
+
+    python benchmarks/bench_label_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["LABEL_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "label_cache.db")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+
+import groupme_internships as g  # noqa: E402
+from bench_classify import synthetic_jobs  # noqa: E402
+from label_cache import LabelCache, ruleset_fingerprint  # noqa: E402
+
+JOBS_PER_DAY = 300
+DESCRIPTION_WORDS = 300
+
+
+def window(jobs, day):
+    return jobs[day * JOBS_PER_DAY:(day + 7) * JOBS_PER_DAY]
+
+
+def run(label, jobs):
+    before = g.LABEL_CACHE.stats()
+    start = time.perf_counter()
+    labels = g.classify_jobs(jobs)
+    elapsed = time.perf_counter() - start
+    after = g.LABEL_CACHE.stats()
+    hits = after["hits"] + after["disk_hits"] - before["hits"] - before["disk_hits"]
+    print(f"{label:<28} {len(jobs):>5} jobs {elapsed * 1e3:8.1f}ms  hits={hits:>5}  misses={after['misses'] - before['misses']:>5}")
+    return labels
+
+
+def main():
+    jobs = synthetic_jobs(JOBS_PER_DAY * 10, DESCRIPTION_WORDS, seed=7)
+    path = os.environ["LABEL_CACHE_PATH"]
+
+    uncached = g.classify_uncached(window(jobs, 0))
+    assert run("day 1 (cold)", window(jobs, 0)) == uncached
+    for day in (1, 2, 3):
+        run(f"day {day + 1}", window(jobs, day))
+
+    # New process: memory is empty, the file still has this ruleset's labels
+    g.LABEL_CACHE = LabelCache(g.LABEL_CACHE.fingerprint, path=path)
+    assert run("restart (from disk)", window(jobs, 3)) == g.classify_uncached(window(jobs, 3))
+    run("restart, next day", window(jobs, 3))
+
+    # Editing the token lists changes the fingerprint and drops every stored label
+    g.LABEL_CACHE = LabelCache(ruleset_fingerprint("edited rules"), path=path)
+    run("after a rule change", window(jobs, 3))
+
+    print(f"on disk: {os.path.getsize(path) / 1024:.0f} KiB for {len(window(jobs, 3))} labels")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Parsing recorded RapidAPI pages: response.json() vs the streaming parsers.
+
+Takes the GET bodies out of RecordingTransport fixtures (HTTP_RECORD_PATH
+files from real runs), or records fresh ones from the local stub with full
+active-jb-7d records at 10 and 100 jobs per page. Each page is parsed
+with:
+
+  json.loads    the old path, response.json() then jobs_from_records
+  raw_decode    jobs_from_json without ijson, one record at a time
+  ijson         jobs_from_json with ijson's C backend (if installed)
+
+and, for the streaming parsers, again with descriptions cut to
+--description-chars. Checks the parsers agree, then reports parse time per
+page, the tracemalloc peak while parsing the largest page, and the memory
+the resulting Jobs hold.
+
+    python benchmarks/bench_parse.py
+    python benchmarks/bench_parse.py recording.jsonl.gz
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job  # noqa: E402
+from bench_job_memory import make_records  # noqa: E402
+from job import jobs_from_json, jobs_from_records  # noqa: E402
+from replay import RecordingTransport, load_recording  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+PAGE_SIZES = (10, 100)
+JOBS = 2000
+
+
+def record_stub(page_size, directory):
+    """Record every page of a synthetic corpus served `page_size` at a time"""
+    path = os.path.join(directory, f"pages-{page_size}.jsonl.gz")
+    transport = RecordingTransport(path)
+    with StubAPI(jobs=make_records(JOBS, description_words=(80, 1200)), page_size=page_size) as api:
+        for offset in range(0, JOBS, page_size):
+            transport.get(api.url, params={"offset": offset})
+    return path
+
+
+def page_bodies(path):
+    return [exchange["body"].encode("utf-8") for exchange in load_recording(path)
+            if exchange["method"] == "GET" and exchange["status"] == 200 and exchange["body"].lstrip().startswith("[")]
+
+
+def parsers(description_chars):
+    found = [("json.loads", lambda body: jobs_from_records(json.loads(body) or [])),
+             ("raw_decode", lambda body: jobs_from_json(body, use_ijson=False))]
+    if job.ijson:
+        found.append(("ijson", jobs_from_json))
+    found.append((f"raw_decode {description_chars}",
+                  lambda body: jobs_from_json(body, description_chars, use_ijson=False)))
+    if job.ijson:
+        found.append((f"ijson {description_chars}", lambda body: jobs_from_json(body, description_chars)))
+    return found
+
+
+def best_time(parse, bodies, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            parse(body)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def memory(parse, bodies):
+    """(peak bytes while parsing the largest page, bytes the Jobs of every page hold)"""
+    largest = max(bodies, key=len)
+    gc.collect()
+    tracemalloc.start()
+    parse(largest)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    gc.collect()
+    tracemalloc.start()
+    jobs = [parse(body) for body in bodies]
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    return peak, held
+
+
+def run(label, bodies, description_chars):
+    jobs = sum(body.count(b'"organization"') for body in bodies)
+    print(f"\n{label}: {len(bodies)} pages, {jobs} jobs, {sum(map(len, bodies)) / 2**20:.1f} MiB of JSON, "
+          f"largest page {max(map(len, bodies)) / 1024:.0f} KiB")
+
+    expected = [jobs_from_records(json.loads(body) or []) for body in bodies]
+    for name, parse in parsers(description_chars):
+        if not name[-1].isdigit():
+            assert [parse(body) for body in bodies] == expected, f"{name} disagrees with json.loads"
+
+    print(f"{'parser':<16} {'us/page':>9} {'peak KiB':>9} {'held MiB':>9}")
+    for name, parse in parsers(description_chars):
+        elapsed = best_time(parse, bodies)
+        peak, held = memory(parse, bodies)
+        print(f"{name:<16} {elapsed / len(bodies) * 1e6:9.0f} {peak / 1024:9.0f} {held / 2**20:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recordings", nargs="*", help="RecordingTransport fixtures (default: record the stub)")
+    parser.add_argument("--description-chars", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"ijson backend: {job.ijson.backend if job.ijson else 'not installed'}")
+    if args.recordings:
+        for path in args.recordings:
+            run(path, page_bodies(path), args.description_chars)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        for page_size in PAGE_SIZES:
+            run(f"stub, {page_size} jobs/page", page_bodies(record_stub(page_size, directory)), args.description_chars)
+
+
+if __name__ == "__main__":
+    main()
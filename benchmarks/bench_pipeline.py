@@ -0,0 +1,89 @@
+"""
+Batch vs streaming runs of the whole fetch -> dedup -> classify -> post flow
+against the local stub API.
+
+The batch path fetches every page, then classifies, then renders and posts.
+The streaming path (post_last_week_internships) posts a subgroup's first
+message as soon as it has a full chunk, while later pages are still in
+flight. Reports time to the first post, total time and the tracemalloc peak.
+
+    python benchmarks/bench_pipeline.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("HTTP_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+os.environ.setdefault("POST_RATE", "1000")
+os.environ.setdefault("POST_BURST", "1000")
+os.environ.setdefault("MAX_PAGES", "40")
+os.environ.setdefault("FETCH_RATE", "40")
+for name in ("CS_ID", "ENGINEERING_ID", "MED_ID", "LAW_ID", "BUSINESS_ID", "HUMANITIES_ID"):
+    os.environ.setdefault(name, name.lower())
+
+import groupme_internships as g  # noqa: E402
+from stub_server import StubAPI, make_jobs  # noqa: E402
+
+DESCRIPTION_BYTES = 8000
+
+
+def make_corpus(count):
+    jobs = make_jobs(count)
+    for job in jobs:
+        job["description"] = (job["description"] + " ") * (DESCRIPTION_BYTES // len(job["description"]))
+    return jobs
+
+
+def batch():
+    jobs = g.get_internships_data()
+    classified = g.classify_data(jobs)
+    for subgroup in g.SUBGROUPS:
+        category = subgroup.categories[0]
+        if classified.get(category):
+            for message in g.topic_handler(category, classified):
+                g.post_to_subgroup(message, subgroup.subgroup_id)
+
+
+def streaming():
+    g.JOB_STORE_PATH = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    g.post_last_week_internships()
+
+
+def measure(label, run):
+    g.HTTP_CACHE.clear()
+    posts = []
+    start = time.perf_counter()
+    g.post_to_subgroup = lambda text, subgroup_id, source_guid=None: posts.append(time.perf_counter()) or True
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        sys.stdout.close()
+        sys.stdout = stdout
+    total = time.perf_counter() - start
+
+    first = posts[0] - start if posts else float("nan")
+    print(f"{label:<10} first post {first:6.2f}s  total {total:6.2f}s  posts={len(posts):>3}  peak={peak / 2**20:6.1f} MiB")
+
+
+def main():
+    with StubAPI(jobs=make_corpus(400), latency=0.05) as api:
+        g.RAPIDAPI_URL = api.url
+        print(f"{int(os.environ['MAX_PAGES'])} pages x 10 jobs, ~{DESCRIPTION_BYTES // 1000} KB descriptions, 50ms latency")
+        measure("batch", batch)
+        measure("streaming", streaming)
+
+
+if __name__ == "__main__":
+    main()
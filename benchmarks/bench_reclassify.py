@@ -0,0 +1,128 @@
+"""
+Incremental reclassification after rule edits vs relabelling every job.
+
+Fills a job store with a synthetic corpus labelled by the current rules
+(with a long tail of rarer words mixed into the descriptions, so the
+token index is about the size a real store's would be), then applies a series of tuning edits to CS_TOKENS, CS_BLOCKLIST and
+FILTERS, one after another. After each edit, one copy of the store goes
+through reclassify() (diff the rules, look the affected jobs up in the
+token index, relabel only those) and another is relabelled in full. Checks
+that both end with the same labels and prints each edit's report.
+
+    python benchmarks/bench_reclassify.py [jobs] [first|scored]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+
+import groupme_internships as g  # noqa: E402
+from classifier import CompiledClassifier, ScoredClassifier  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from job import Job  # noqa: E402
+from job_store import JobStore  # noqa: E402
+from job_table import JobTable  # noqa: E402
+from reclassify import format_report, index_jobs, reclassify, ruleset  # noqa: E402
+
+JOBS = 20_000
+DESCRIPTION_WORDS = (80, 300)
+RARE_WORDS = 30  # per description, from a Zipf-ish vocabulary of VOCABULARY_SIZE
+VOCABULARY_SIZE = 40_000
+
+
+def corpus(count):
+    rng = random.Random(11)
+    syllables = [consonant + vowel for consonant in "bdfgklmnprstvz" for vowel in "aeiou"]
+    vocabulary = list({"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(VOCABULARY_SIZE)})
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    records = generate_jobs(count, description_words=DESCRIPTION_WORDS, seed=11)
+    for record in records:
+        record["description"] += " " + " ".join(rng.choices(vocabulary, weights, k=RARE_WORDS))
+    return [Job.from_record(record) for record in records]
+
+
+def edits():
+    """(description, rules) after each successive tuning edit"""
+    tokens, blocklist, filters = list(g.CS_TOKENS), list(g.CS_BLOCKLIST), dict(g.FILTERS)
+    tokens = tokens + [r"kubernetes"]
+    yield "add CS token kubernetes", (tokens, blocklist, filters)
+    blocklist = blocklist + [r"security engineer"]
+    yield "block security engineer", (tokens, blocklist, filters)
+    # Moves the word boundary after "host", so "hosting" stops being blocked
+    blocklist = [entry.replace(r"|cook", "") for entry in blocklist]
+    yield "drop cook from CS_BLOCKLIST", (tokens, blocklist, filters)
+    filters = dict(filters, Humanities=filters["Humanities"].replace(r"(english|", r"(english|research|counselor|"))
+    yield "research, counselor to Humanities", (tokens, blocklist, filters)
+    filters = dict(filters, Business=filters["Business"].replace(r"sales|", ""))
+    yield "drop sales from Business", (tokens, blocklist, filters)
+    tokens = [token for token in tokens if token not in (r"ml", r"ai")]
+    yield "drop ml and ai from CS_TOKENS", (tokens, blocklist, filters)
+
+
+def classifier(rules, mode):
+    compiled = CompiledClassifier(*rules)
+    if mode == "scored":
+        scorer = ScoredClassifier(compiled)
+        return lambda jobs: [[field for field, _ in ranked] for ranked in scorer.classify_batch(jobs)]
+
+    def classify(jobs):
+        table = JobTable.from_jobs(jobs)
+        compiled.classify_table(table)
+        labels = compiled.labels
+        return [[labels[label_id]] if labels[label_id] != "Other" else [] for label_id in table.category]
+    return classify
+
+
+def labels(store):
+    return {row['job_id']: labels for batch in store.iter_labelled() for row, labels in batch}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else JOBS
+    mode = sys.argv[2] if len(sys.argv) > 2 else "first"
+    settings = mode
+    rules = (g.CS_TOKENS, g.CS_BLOCKLIST, g.FILTERS)
+    directory = tempfile.mkdtemp()
+    incremental_path, full_path = os.path.join(directory, "incremental.db"), os.path.join(directory, "full.db")
+
+    jobs = corpus(count)
+    keyed = list({job.key: job for job in jobs}.items())
+    start = time.perf_counter()
+    with JobStore(incremental_path) as store:
+        store.upsert_jobs(keyed)
+        store.set_labels(zip([job_id for job_id, _ in keyed], classifier(rules, mode)([job for _, job in keyed])))
+        reclassify(store, ruleset(*rules, settings=settings), None)  # records the rules
+        print(f"{len(keyed)} stored jobs ({mode} mode), labelled in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        index_jobs(store)
+        print(f"token index: {len(store.vocabulary())} tokens, built in {time.perf_counter() - start:.2f}s\n")
+    shutil.copy(incremental_path, full_path)
+
+    print(f"{'edit':<34} {'checked':>8} {'moved':>6} {'incremental':>12} {'full':>8}")
+    reports = []
+    for description, rules in edits():
+        current = ruleset(*rules, settings=settings)
+        classify = classifier(rules, mode)
+        with JobStore(incremental_path) as incremental, JobStore(full_path) as full:
+            report = reclassify(incremental, current, classify)
+            everything = reclassify(full, current, classify, full=True)
+            assert labels(incremental) == labels(full), f"{description}: incremental labels differ from a full pass"
+        print(f"{description:<34} {report['checked']:>8} {report['moved']:>6} "
+              f"{report['seconds']:11.2f}s {everything['seconds']:7.2f}s")
+        reports.append((description, report))
+
+    for description, report in reports:
+        print(f"\n{description}")
+        print(format_report(report))
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Record one full run against the local stub, then replay it offline under
+injected failures.
+
+The recording holds every RapidAPI page and GroupMe post exchanged by
+post_last_week_internships. Each replay reruns the bot from an empty job
+store against that recording, with the recorded latencies and a given mix
+of 429s, 5xx, timeouts and refused connections, and reports how long the
+run took and what the retry layers (Transport, PageFetcher, PostDispatcher)
+did about the failures.
+
+    python benchmarks/bench_replay.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("HTTP_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+os.environ.setdefault("METRICS_REPORT_PATH", "")
+os.environ.setdefault("ACCESS_TOKEN", "bench-token")
+os.environ.setdefault("POST_RATE", "1000")
+os.environ.setdefault("POST_BURST", "1000")
+os.environ.setdefault("FETCH_RATE", "1000")
+os.environ.setdefault("MAX_PAGES", "30")
+os.environ.setdefault("HTTP_BACKOFF", "0.02")
+for name in ("CS_ID", "ENGINEERING_ID", "MED_ID", "LAW_ID", "BUSINESS_ID", "HUMANITIES_ID"):
+    os.environ.setdefault(name, name.lower())
+
+import groupme_internships as g  # noqa: E402
+import dispatcher  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from metrics import counter_total  # noqa: E402
+from replay import RecordingTransport, ReplayTransport  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+SCENARIOS = [
+    ("clean", {}),
+    ("5% 5xx", {"5xx": 0.05}),
+    ("5% 429", {"429": 0.05}),
+    ("3% timeout", {"timeout": 0.03}),
+    ("3% connect", {"connect": 0.03}),
+    ("mixed 10%", {"429": 0.03, "5xx": 0.03, "timeout": 0.02, "connect": 0.02}),
+]
+
+
+def run_bot():
+    g.JOB_STORE_PATH = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    g.HTTP_CACHE.clear()
+    g.METRICS.reset()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        g.post_last_week_internships()
+    return time.perf_counter() - start, g.METRICS.report()
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "recording.jsonl.gz")
+    # Dispatcher backoff between post attempts, shortened like HTTP_BACKOFF above
+    dispatcher.PostDispatcher.__init__.__defaults__ = tuple(
+        0.02 if default == 1.0 else default for default in dispatcher.PostDispatcher.__init__.__defaults__)
+
+    with StubAPI(jobs=generate_jobs(250), latency=0.02) as api:
+        g.RAPIDAPI_URL = api.url
+        g.GROUPME_API_BASE = api.base_url
+        g.TRANSPORT = RecordingTransport(path, **g.TRANSPORT_SETTINGS)
+        elapsed, report = run_bot()
+        print(f"recorded   {elapsed:6.2f}s  {counter_total(report, 'http_requests_total')} exchanges, "
+              f"{len(api.messages)} posts, {os.path.getsize(path) / 1024:.0f} KiB fixture")
+
+    print(f"{'scenario':<12} {'time':>7} {'pages':>6} {'jobs':>5} {'posts':>6} {'failed':>7} "
+          f"{'http':>5} {'fetch retry':>12} {'post retry':>11}  injected")
+    for label, errors in SCENARIOS:
+        g.TRANSPORT = ReplayTransport(path, latency="recorded", errors=errors, seed=1, **g.TRANSPORT_SETTINGS)
+        elapsed, report = run_bot()
+        print(f"{label:<12} {elapsed:6.2f}s {counter_total(report, 'pages_fetched_total'):>6} "
+              f"{counter_total(report, 'jobs_new_total'):>5} "
+              f"{counter_total(report, 'posts_total', result='sent'):>6} "
+              f"{counter_total(report, 'posts_total', result='failed'):>7} "
+              f"{counter_total(report, 'http_requests_total'):>5} "
+              f"{counter_total(report, 'fetch_retries_total'):>12} "
+              f"{counter_total(report, 'post_retries_total'):>11}  {g.TRANSPORT.stats()['injected']}")
+
+
+if __name__ == "__main__":
+    main()
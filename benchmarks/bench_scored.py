@@ -0,0 +1,73 @@
+"""
+Multi-label scored classification: sanity cases and batch vs per-job timing.
+
+Checks a few jobs that first-match classification gets wrong, checks that
+scoring a page at once gives the same labels as scoring each job alone,
+then times the current per-job classify_job loop, per-job scoring, and
+batch scoring one page (10 jobs) and one whole run at a time. Last, counts
+how many jobs get more than one label, both for bench_classify's word
+salad (every description mentions most categories) and for corpus.py
+postings.
+
+    python benchmarks/bench_scored.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_classify import synthetic_jobs  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from groupme_internships import SCORER, classify_job  # noqa: E402
+from job import Job  # noqa: E402
+
+CASES = [
+    ("Biomedical Engineer Intern", "Design medical devices in a clinical lab", {"Engineering", "Health Sciences"}),
+    ("Paralegal Intern", "Support our legal team", {"Social Sciences / Law"}),
+    ("Security Guard", "Patrol the software campus overnight", set()),
+    ("Software Engineer Intern", "", {"CS/IT"}),
+    ("Machine Learning Intern", "NLP research for clinical trials at our pharma lab", {"CS/IT"}),
+    ("Healthcare Operations Intern", "Support our clinic's operations team", {"Health Sciences", "Business"}),
+    ("Company Intern", "three shops, paid, other duties", set()),
+]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def pages(jobs, size=10):
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def main():
+    for title, description, expected in CASES:
+        labels = {field for field, _ in SCORER.classify(Job(title, description=description))}
+        assert labels == expected, (title, labels, expected)
+    print(f"scored cases: {len(CASES)} ok")
+
+    print(f"{'desc words':>10} {'jobs':>6} {'first-match':>12} {'scored/job':>11} {'scored/page':>12} {'scored/all':>11}")
+    for words in (20, 200, 2000):
+        jobs = synthetic_jobs(2000, words, seed=words)
+
+        _, first_time = timed(lambda: [classify_job(job) for job in jobs])
+        single, single_time = timed(lambda: [SCORER.classify(job) for job in jobs])
+        paged, paged_time = timed(lambda: [labels for page in pages(jobs) for labels in SCORER.classify_batch(page)])
+        whole, whole_time = timed(lambda: SCORER.classify_batch(jobs))
+        assert single == paged == whole
+
+        print(f"{words:>10} {len(jobs):>6} {first_time * 1e3:10.1f}ms {single_time * 1e3:9.1f}ms "
+              f"{paged_time * 1e3:10.1f}ms {whole_time * 1e3:9.1f}ms")
+
+    for name, jobs in (("word salad", synthetic_jobs(2000, 200, seed=1)),
+                       ("corpus", [Job.from_record(record) for record in generate_jobs(2000, duplicate_rate=0)])):
+        labelled = SCORER.classify_batch(jobs)
+        fanned = sum(len(labels) > 1 for labels in labelled)
+        print(f"{name}: jobs with more than one label: {fanned}/{len(labelled)}")
+
+
+if __name__ == "__main__":
+    main()
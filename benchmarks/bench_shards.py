@@ -0,0 +1,104 @@
+"""
+Sharded fetching: several location/title queries under one API quota.
+
+The stub serves a corpus spread over a few countries, with a US feed of
+about 400 jobs (the 40-page cap) and smaller regional ones. Fetches:
+
+  US only            the old single location_filter=United States query
+  shards in turn     every shard with its own PageFetcher, one after another
+  FetchPlanner       every shard at once in one pool, one token bucket
+
+then merges the shards through one DedupIndex, and finally reruns the
+planner the way scheduled runs do, with every job already known, so each
+shard stops after its first page. Reports jobs fetched, unique jobs after
+the merge, requests and wall-clock time.
+
+    python benchmarks/bench_shards.py
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_jobs  # noqa: E402
+from dedup import DedupIndex  # noqa: E402
+from fetcher import FetchPlanner, PageFetcher, shard_name  # noqa: E402
+from job import jobs_from_json  # noqa: E402
+from ratelimit import TokenBucket  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+from transport import Transport  # noqa: E402
+
+PAGES = 40
+CONCURRENCY = 4
+RATE = 40  # requests per second, shared by every shard
+LATENCY = 0.08
+
+# Share of the corpus posted in each country
+COUNTRIES = {"United States": 400, "Canada": 90, "United Kingdom": 130, "Germany": 45, "India": 160}
+
+SHARDS = [{"location_filter": country} for country in COUNTRIES] + [
+    {"location_filter": "United States", "title_filter": "software"},  # overlaps the US shard
+]
+
+
+def corpus():
+    jobs = generate_jobs(sum(COUNTRIES.values()), seed=5)
+    rng = random.Random(5)
+    countries = [country for country, count in COUNTRIES.items() for _ in range(count)]
+    rng.shuffle(countries)
+    for job, country in zip(jobs, countries):
+        city = job["locations_derived"][0].split(",")[0]
+        job["locations_derived"] = [f"{city}, {country}"]
+    return jobs
+
+
+def fetchers(url, transport, shards, limiter, known=None):
+    return [PageFetcher({}, base_url=url, params=params, concurrency=CONCURRENCY, limiter=limiter,
+                        get=transport.get, known=known, parse=jobs_from_json) for params in shards]
+
+
+def merged(jobs):
+    index = DedupIndex()
+    return [job for job in jobs if index.add(job)]
+
+
+def run(label, api, fetch):
+    api.requests = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = fetch()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<18} {len(jobs):>6} {len(merged(jobs)):>7} {api.requests:>9} {elapsed:8.2f}s")
+    return jobs
+
+
+def main():
+    print(f"{len(SHARDS)} shards: " + "; ".join(shard_name(params) for params in SHARDS))
+    print(f"{LATENCY * 1e3:.0f}ms latency, {RATE} requests/s shared, {CONCURRENCY} in flight\n")
+    print(f"{'fetch':<18} {'jobs':>6} {'unique':>7} {'requests':>9} {'time':>9}")
+    transport = Transport(pool_size=CONCURRENCY)
+    with StubAPI(jobs=corpus(), latency=LATENCY) as api:
+        run("US only", api, lambda: fetchers(api.url, transport, SHARDS[:1], TokenBucket(rate=RATE))[0]
+            .fetch_all(PAGES))
+
+        def in_turn():
+            limiter = TokenBucket(rate=RATE)
+            return [job for fetcher in fetchers(api.url, transport, SHARDS, limiter) for job in fetcher.fetch_all(PAGES)]
+
+        sequential = run("shards in turn", api, in_turn)
+        planned = run("FetchPlanner", api, lambda: FetchPlanner(
+            fetchers(api.url, transport, SHARDS, TokenBucket(rate=RATE)), CONCURRENCY).fetch_all(PAGES))
+        seen = {job.key for job in planned}
+        run("rerun, all known", api, lambda: FetchPlanner(
+            fetchers(api.url, transport, SHARDS, TokenBucket(rate=RATE), lambda job: job.key in seen),
+            CONCURRENCY).fetch_all(PAGES))
+    transport.close()
+    assert merged(planned) == merged(sequential), "the planner should find the same jobs"
+
+
+if __name__ == "__main__":
+    main()
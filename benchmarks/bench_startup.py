@@ -0,0 +1,69 @@
+"""
+What a fresh interpreter spends before the bot does anything.
+
+Imports each module in a new process under `python -X importtime` and
+reports its cumulative import time, best of a few runs, and whether
+requests came along with it. Then times compiling every classifier
+pattern in a new process from scratch vs from a PatternCache snapshot.
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("groupme_internships", "render", "job", "classifier", "fetcher", "transport", "metrics")
+RUNS = 5
+
+COMPILE = """
+import os, time
+start = time.perf_counter()
+import groupme_internships as g
+imported = time.perf_counter()
+g.CLASSIFIER.patterns, g.CLASSIFIER.folded, g.SCORER.rest, g.SCORER.pattern, g.SCORER.folded
+compiled = time.perf_counter()
+g.PATTERN_CACHE.save()
+print(imported - start, compiled - imported, g.PATTERN_CACHE.hits)
+"""
+
+
+def run(code, **env):
+    env = dict(os.environ, HTTP_CACHE_PATH="", LABEL_CACHE_PATH="", **env)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # a deployed bot has its .pyc files
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, cwd=ROOT,
+                          check=True, capture_output=True, text=True)
+
+
+def import_time(module):
+    """(best cumulative ms, whether requests was imported)"""
+    run(f"import {module}")  # write .pyc files first
+    times = []
+    for _ in range(RUNS):
+        rows = [line.split("|") for line in run(f"import {module}").stderr.splitlines()]
+        times.append(next(int(row[1]) for row in rows if row[-1] == f" {module}"))
+    return min(times) / 1e3, any(row[-1].strip() == "requests" for row in rows)
+
+
+def compile_time(path):
+    """Best (import s, compile s, snapshot hits) over RUNS processes sharing one snapshot path ("" for none)"""
+    results = [tuple(map(float, run(COMPILE, PATTERN_CACHE_PATH=path).stdout.split())) for _ in range(RUNS)]
+    return min(results, key=lambda result: result[1])
+
+
+def main():
+    print(f"{'module':<22} {'import ms':>10}  requests")
+    for module in MODULES:
+        elapsed, requests = import_time(module)
+        print(f"{module:<22} {elapsed:10.1f}  {'yes' if requests else 'no'}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, cold, _ = compile_time("")
+        _, warm, hits = compile_time(os.path.join(directory, "pattern_cache.bin"))
+    print(f"\nclassifier patterns: re.compile {cold * 1e3:.1f}ms, from snapshot {warm * 1e3:.1f}ms ({hits:.0f} patterns)")
+
+
+if __name__ == "__main__":
+    main()
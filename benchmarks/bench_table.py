@@ -0,0 +1,74 @@
+"""
+Column-wise classification over a JobTable vs the old per-job classify_data.
+
+Checks both give identical output, then times them at 1k, 10k and 100k
+jobs, the scale of a backfill over months of postings.
+
+    python benchmarks/bench_table.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Time the classifier itself, not the label cache
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_MAX_ENTRIES", "0")
+
+from bench_classify import synthetic_jobs  # noqa: E402
+from categories import CATEGORIES  # noqa: E402
+from groupme_internships import CLASSIFIER, classify_data, classify_job  # noqa: E402
+from job import Job  # noqa: E402
+from job_table import JobTable  # noqa: E402
+
+DESCRIPTION_WORDS = 100
+
+
+def legacy_classify_data(jobs):
+    """classify_data as it was before JobTable: one text per job"""
+    classified_jobs = {category.key: [] for category in CATEGORIES}
+    for job in jobs:
+        field = classify_job(job)
+        if field == "Other":
+            continue
+        classified_jobs[field].append(job)
+    return classified_jobs
+
+
+def make_jobs(count):
+    return [
+        Job(job.title, f"Company {i % 997}", f"https://www.linkedin.com/jobs/view/intern-at-company-{4300000000 + i}",
+            job.description)
+        for i, job in enumerate(synthetic_jobs(count, DESCRIPTION_WORDS, seed=count))
+    ]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{DESCRIPTION_WORDS}-word descriptions")
+    print(f"{'jobs':>7} {'per-job':>10} {'table':>10} {'speedup':>8}   {'build':>8} {'classify':>9} {'rest':>8}")
+    for count in (1_000, 10_000, 100_000):
+        jobs = make_jobs(count)
+
+        old, old_time = timed(legacy_classify_data, jobs)
+        new, new_time = timed(classify_data, jobs)
+        assert old == new
+
+        # Where the table path spends its time
+        table, build_time = timed(JobTable.from_jobs, jobs)
+        _, classify_time = timed(CLASSIFIER.classify_table, table)
+        rest_time = new_time - build_time - classify_time
+
+        print(f"{count:>7} {old_time * 1e3:8.0f}ms {new_time * 1e3:8.0f}ms {old_time / new_time:7.1f}x   "
+              f"{build_time * 1e3:6.0f}ms {classify_time * 1e3:7.0f}ms {rest_time * 1e3:6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Many tenants from one fetch: a shared cycle vs a separate bot per tenant.
+
+Each synthetic tenant has its own token and six subgroups, one per
+category; every other tenant narrows its CS/IT subgroup to software and
+data roles and keeps Business jobs out of its Engineering one. The shared
+run loads them all from one TENANTS_PATH file and does one fetch and
+classify cycle, fanning out to every subgroup. The separate runs are what
+hosting each tenant as its own bot costs: one full cycle per tenant, each
+with an empty job store, HTTP cache and label cache.
+
+Reports feed requests, posts and wall-clock time. Shared fetch requests
+stay flat as tenants are added; only the posts grow.
+
+    python benchmarks/bench_tenants.py
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("HTTP_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+os.environ.setdefault("METRICS_REPORT_PATH", "")
+os.environ.setdefault("POST_RATE", "1000")
+os.environ.setdefault("POST_BURST", "1000")
+os.environ.setdefault("FETCH_RATE", "40")
+os.environ.setdefault("MAX_PAGES", "40")
+
+import groupme_internships as g  # noqa: E402
+from categories import CATEGORIES  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+from tenants import load_tenants  # noqa: E402
+
+TENANTS = (1, 5, 20, 50)
+SEPARATE_UP_TO = 20  # separate runs past this just take long
+LATENCY = 0.02
+
+
+def tenant_config(count):
+    tenants = []
+    for t in range(count):
+        subgroups = []
+        for c, category in enumerate(CATEGORIES):
+            subgroup = {"id": f"{t}-{c}", "categories": [category.key]}
+            if t % 2 and category.key == "CS/IT":
+                subgroup["include"] = ["software", "data"]
+            if t % 2 and category.key == "Engineering":
+                subgroup["exclude"] = ["business"]
+            subgroups.append(subgroup)
+        tenants.append({"name": f"tenant-{t}", "token_env": f"TENANT_{t}_TOKEN", "subgroups": subgroups})
+        os.environ[f"TENANT_{t}_TOKEN"] = f"token-{t}"
+    return {"tenants": tenants}
+
+
+def use(subgroups):
+    g.SUBGROUPS = subgroups
+    g.TOKEN_ENVS = {subgroup.subgroup_id: subgroup.token_env for subgroup in subgroups if subgroup.token_env}
+
+
+def run_once(api, subgroups):
+    """One fresh scheduled run for these subgroups: (feed requests, posts)"""
+    use(subgroups)
+    g.JOB_STORE_PATH = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    g.HTTP_CACHE.clear()
+    g.LABEL_CACHE.clear()
+    requests, posts = api.requests, len(api.messages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        g.post_last_week_internships()
+    posts = len(api.messages) - posts
+    return api.requests - requests - posts, posts
+
+
+def measure(api, runs):
+    start = time.perf_counter()
+    totals = [sum(column) for column in zip(*(run_once(api, subgroups) for subgroups in runs))]
+    return (*totals, time.perf_counter() - start)
+
+
+def main():
+    print(f"{LATENCY * 1e3:.0f}ms latency, {os.environ['MAX_PAGES']} pages, 6 subgroups per tenant\n")
+    print(f"{'tenants':>7}  {'run':<9} {'fetches':>8} {'posts':>6} {'time':>8}")
+    with tempfile.TemporaryDirectory() as directory, StubAPI(jobs=generate_jobs(400, seed=7), latency=LATENCY) as api:
+        g.RAPIDAPI_URL = api.url
+        g.GROUPME_API_BASE = api.base_url
+        for count in TENANTS:
+            path = os.path.join(directory, f"tenants-{count}.json")
+            with open(path, "w") as f:
+                json.dump(tenant_config(count), f)
+            subgroups = load_tenants(path)
+
+            shared = measure(api, [subgroups])
+            print(f"{count:>7}  {'shared':<9} {shared[0]:>8} {shared[1]:>6} {shared[2]:7.2f}s")
+            if count <= SEPARATE_UP_TO:
+                by_tenant = {}
+                for subgroup in subgroups:
+                    by_tenant.setdefault(subgroup.tenant, []).append(subgroup)
+                separate = measure(api, list(by_tenant.values()))
+                print(f"{'':>7}  {'separate':<9} {separate[0]:>8} {separate[1]:>6} {separate[2]:7.2f}s")
+                assert separate[1] == shared[1], "fanning out should post exactly what separate bots would"
+
+
+if __name__ == "__main__":
+    main()
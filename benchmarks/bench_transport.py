@@ -0,0 +1,70 @@
+"""
+Per-request latency: the old one-connection-per-post path vs Transport.
+
+Runs against the stub API over TLS with a throwaway self-signed cert. Both
+sides verify the certificate, so the difference is the handshake and
+connection setup that pooling saves.
+
+    python benchmarks/bench_transport.py
+"""
+import json
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport import Transport  # noqa: E402
+from stub_server import StubAPI, make_self_signed_cert  # noqa: E402
+
+REQUESTS = 100
+
+
+def old_post(url, cafile, text):
+    """post_to_subgroup before Transport: new Request and SSL context every message"""
+    payload = json.dumps({"message": {"source_guid": str(uuid.uuid4()), "text": text}}).encode("utf-8")
+    req = urllib.request.Request(f"{url}?token=x", data=payload, headers={"Content-Type": "application/json"})
+    context = ssl.create_default_context(cafile=cafile)
+    with urllib.request.urlopen(req, context=context) as resp:
+        return resp.status
+
+
+def pooled_post(transport, url, text):
+    payload = {"message": {"source_guid": str(uuid.uuid4()), "text": text}}
+    return transport.post(url, params={"token": "x"}, json=payload).status_code
+
+
+def measure(label, fn):
+    latencies = []
+    for i in range(REQUESTS):
+        start = time.perf_counter()
+        status = fn(i)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        assert status in (200, 201), status
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<32} median {statistics.median(latencies):6.2f}ms  p95 {p95:6.2f}ms  total {sum(latencies):7.1f}ms")
+
+
+def main():
+    certfile, keyfile = make_self_signed_cert(tempfile.mkdtemp())
+    api = StubAPI(total_jobs=400).start(certfile=certfile, keyfile=keyfile)
+    try:
+        post_url = f"{api.base_url}/v3/groups/123/messages"
+        transport = Transport(verify=certfile)
+
+        measure("POST, new connection each time", lambda i: old_post(post_url, certfile, f"message {i}"))
+        measure("POST, pooled Transport", lambda i: pooled_post(transport, post_url, f"message {i}"))
+        measure("GET page, pooled Transport", lambda i: transport.get(api.url, params={"offset": i % 40 * 10}).status_code)
+        transport.close()
+    finally:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
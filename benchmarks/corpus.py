@@ -0,0 +1,110 @@
+"""
+Synthetic RapidAPI-shaped internship postings.
+
+Records carry the fields the active-jb-7d endpoint returns and the bot
+reads (id, title, organization, url, description, ...), spread over all
+six subgroup categories plus some that fit none. A share of them are
+reposts of an earlier posting with a reworded title, as happens in the
+real feed, so dedup has something to find.
+
+    from corpus import generate_jobs
+    jobs = generate_jobs(10_000, duplicate_rate=0.15, description_words=(80, 400))
+"""
+import random
+from datetime import datetime, timedelta
+
+ROLES = {
+    "CS/IT": ["Software Engineer", "Backend Developer", "Data Engineer", "Machine Learning", "DevOps Engineer",
+              "Frontend Developer", "Cloud Infrastructure", "Security Engineer", "Mobile Developer (iOS)"],
+    "Engineering": ["Mechanical Engineering", "Civil Engineering", "Electrical Engineering", "Aerospace Design",
+                    "Manufacturing Engineering", "Chemical Process", "Structural Analysis"],
+    "Health Sciences": ["Clinical Research", "Public Health", "Pharmacy", "Nursing Assistant", "Laboratory",
+                        "Neuroscience Research", "Healthcare Operations"],
+    "Social Sciences / Law": ["Legal", "Paralegal", "Public Policy", "Government Affairs", "Psychology Research",
+                              "Social Work", "Criminology"],
+    "Business": ["Finance", "Accounting", "Marketing", "Investment Banking", "Supply Chain", "Sales",
+                 "Human Resources", "Management Consulting"],
+    "Humanities": ["Editorial", "Communications", "Graphic Design", "Museum Curator", "Film Production",
+                   "History Research", "Music"],
+    "Other": ["Summer Camp Counselor", "Warehouse Associate", "Retail Associate", "Event Staff"],
+}
+
+VOCABULARY = {
+    "CS/IT": "python java aws cloud backend services apis kubernetes software developer data pipelines sql",
+    "Engineering": "cad solidworks mechanical prototypes testing manufacturing electrical circuits structural",
+    "Health Sciences": "clinical patients laboratory medical research healthcare pharmacy public health trials",
+    "Social Sciences / Law": "legal research policy government litigation paralegal justice psychology",
+    "Business": "finance accounting marketing sales strategy operations investment clients consulting",
+    "Humanities": "writing editor media design museum history publishing communications film",
+    "Other": "customers shifts team friendly outdoors lifting schedule store",
+}
+
+FILLER = (
+    "you will join a collaborative team and work on real projects from day one alongside mentors who care "
+    "about your growth we value curiosity ownership and clear communication interns present their work at "
+    "the end of the summer and many receive return offers applicants should be enrolled in a degree program"
+).split()
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Wonka", "Tyrell",
+             "Cyberdyne", "Soylent", "Massive Dynamic", "Pied Piper", "Aperture", "Gringotts"]
+SUFFIXES = [" Intern", " Internship", " Summer 2026 Intern", " Intern - Summer 2026", " Student Position"]
+TEAMS = ["", "", " - Platform", " - Growth", " (Remote)", " - New York", " II"]
+CITIES = ["New York, NY", "San Francisco, CA", "Austin, TX", "Chicago, IL", "Boston, MA", "Seattle, WA"]
+
+CATEGORY_WEIGHTS = {"CS/IT": 30, "Engineering": 15, "Health Sciences": 12, "Social Sciences / Law": 8,
+                    "Business": 20, "Humanities": 8, "Other": 7}
+
+
+def _description(rng, category, words):
+    vocabulary = VOCABULARY[category].split()
+    # Roughly one topical word in five, the rest boilerplate
+    return " ".join(rng.choice(vocabulary) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(words))
+
+
+def _slug(text):
+    return "-".join("".join(ch if ch.isalnum() else " " for ch in text.lower()).split())
+
+
+def generate_jobs(count, duplicate_rate=0.1, description_words=(80, 400), seed=0):
+    """
+    `count` postings, about `duplicate_rate` of them reposts of an earlier
+    one (same company, title reworded with intern/summer noise). Description
+    lengths are drawn uniformly from the `description_words` range.
+    """
+    rng = random.Random(seed)
+    categories = list(CATEGORY_WEIGHTS)
+    weights = list(CATEGORY_WEIGHTS.values())
+    organizations = [f"{rng.choice(COMPANIES)} {suffix}" for suffix in range(max(1, count // 12))]
+    posted = datetime(2026, 10, 18)
+
+    jobs = []
+    for i in range(count):
+        job_id = 4300000000 + i
+        if jobs and rng.random() < duplicate_rate:
+            original = rng.choice(jobs)
+            organization = original["organization"]
+            base = original["title"].split(" Intern")[0].split(" Student")[0]
+            title = base + rng.choice(SUFFIXES)
+            category = original["_category"]
+        else:
+            category = rng.choices(categories, weights)[0]
+            organization = rng.choice(organizations)
+            title = rng.choice(ROLES[category]) + rng.choice(TEAMS) + rng.choice(SUFFIXES)
+
+        jobs.append({
+            "id": str(job_id),
+            "date_posted": (posted - timedelta(hours=rng.randint(0, 7 * 24))).isoformat(),
+            "title": title,
+            "organization": organization,
+            "organization_url": f"https://www.linkedin.com/company/{_slug(organization)}",
+            "url": f"https://www.linkedin.com/jobs/view/{_slug(title)}-at-{_slug(organization)}-{job_id}",
+            "locations_derived": [f"{rng.choice(CITIES)}, United States"],
+            "employment_type": ["INTERN"],
+            "remote_derived": rng.random() < 0.2,
+            "description": _description(rng, category, rng.randint(*description_words)),
+            "_category": category,
+        })
+
+    for job in jobs:
+        del job["_category"]
+    return jobs
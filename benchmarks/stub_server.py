@@ -0,0 +1,219 @@
+"""
+Local stand-in for the RapidAPI internships endpoint.
+
+Serves offset-paginated /active-jb-7d pages from a synthetic job list,
+narrowed by location_filter and title_filter (case-insensitive substring
+matches; a job without locations_derived matches any location), with
+optional per-request latency and a requests-per-second limit that answers
+429 with Retry-After once exceeded. Like RapidAPI, every page reports the
+plan quota in x-ratelimit-requests-remaining / -reset: requests left this
+billing period and seconds until it renews (about a month), answering 429
+once it's used up. Pages carry an ETag and honour If-None-Match with a 304.
+
+Also accepts GroupMe-style POST /groups/<id>/messages (answering 201), and
+can serve over TLS with a throwaway self-signed certificate.
+"""
+import hashlib
+import json
+import os
+import socket
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import parse_qs, urlparse
+
+
+def make_jobs(count):
+    return [
+        {
+            "title": f"Software Engineer Intern {i}",
+            "organization": f"Company {i % 97}",
+            "url": f"https://www.linkedin.com/jobs/view/software-engineer-intern-at-company-{4300000000 + i}",
+            "description": "Build backend services in Python and AWS.",
+        }
+        for i in range(count)
+    ]
+
+
+def matches(job, query):
+    """Whether a job fits the request's location_filter and title_filter"""
+    location = query.get("location_filter", [""])[0].lower()
+    title = query.get("title_filter", [""])[0].lower()
+    if title and title not in job.get("title", "").lower():
+        return False
+    if location and "locations_derived" in job:
+        return any(location in place.lower() for place in job["locations_derived"])
+    return True
+
+
+def make_self_signed_cert(directory):
+    """Write a localhost cert/key pair with the openssl CLI. Returns (certfile, keyfile)."""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", keyfile, "-out", certfile, "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+        check=True, capture_output=True,
+    )
+    return certfile, keyfile
+
+
+class StubAPI:
+    def __init__(self, jobs=None, total_jobs=400, page_size=10, latency=0.0, quota_per_sec=None,
+                 plan_quota=10_000, plan_period=30 * 24 * 60 * 60):
+        self.jobs = jobs if jobs is not None else make_jobs(total_jobs)
+        self.page_size = page_size
+        self.latency = latency
+        self.quota_per_sec = quota_per_sec
+        self.plan_quota = plan_quota
+        self.plan_used = 0
+        self.plan_ends = time.monotonic() + plan_period
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.requests = 0
+        self.throttled = 0
+        self.not_modified = 0
+        self.messages = []  # (group_id, message dict) for every accepted POST
+        self.scheme = "http"
+        self.server = None
+        self.thread = None
+
+    def _admit(self):
+        """
+        Plan quota, then a fixed one-second window. Returns (retry after or
+        None if allowed, plan requests remaining, seconds until the plan renews)
+        """
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            reset = max(0.0, self.plan_ends - now)
+            if self.plan_used >= self.plan_quota:
+                self.throttled += 1
+                return reset, 0, reset
+            if self.quota_per_sec is not None:
+                if now - self.window_start >= 1.0:
+                    self.window_start = now
+                    self.window_count = 0
+                if self.window_count >= self.quota_per_sec:
+                    self.throttled += 1
+                    return max(0.0, 1.0 - (now - self.window_start)), self.plan_quota - self.plan_used, reset
+                self.window_count += 1
+            self.plan_used += 1
+            return None, self.plan_quota - self.plan_used, reset
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out as separate writes; without this,
+                # Nagle + delayed ACK add ~40ms to every kept-alive response
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if not parsed.path.endswith("/active-jb-7d"):
+                    self.send_error(404)
+                    return
+
+                retry_after, remaining, reset = api._admit()
+                if api.latency:
+                    time.sleep(api.latency)
+
+                if retry_after is not None:
+                    self.send_response(429)
+                    self.send_header("Retry-After", f"{retry_after:.3f}")
+                    self.send_header("x-ratelimit-requests-remaining", str(remaining))
+                    self.send_header("x-ratelimit-requests-reset", f"{reset:.0f}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                query = parse_qs(parsed.query)
+                offset = int(query.get("offset", ["0"])[0])
+                # Only scans as far as the page asked for
+                page = islice((job for job in api.jobs if matches(job, query)), offset, offset + api.page_size)
+                body = json.dumps(list(page)).encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    with api.lock:
+                        api.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("x-ratelimit-requests-remaining", str(remaining))
+                self.send_header("x-ratelimit-requests-reset", f"{reset:.0f}")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                parts = urlparse(self.path).path.strip("/").split("/")
+                if len(parts) < 3 or parts[-3] != "groups" or parts[-1] != "messages":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if api.latency:
+                    time.sleep(api.latency)
+                with api.lock:
+                    api.requests += 1
+                    api.messages.append((parts[-2], payload.get("message", {})))
+
+                body = json.dumps({"response": {"message": payload.get("message", {})}}).encode("utf-8")
+                self.send_response(201)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self, host="127.0.0.1", port=0, certfile=None, keyfile=None):
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = "https"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    @property
+    def url(self):
+        return f"{self.base_url}/active-jb-7d"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,175 @@
+"""
+Benchmark suite: every pipeline stage on a synthetic corpus, results as JSON.
+
+Times get_internships_data against the local stub API, parsing records into
+Jobs, dedup, classify_data and each subgroup's message builder on their own, at each corpus size.
+Results go to benchmarks/results/<commit>.json (or --out) together with the
+commit, Python version and corpus settings, so two commits can be compared:
+
+    python benchmarks/suite.py --sizes 1000,10000
+    python benchmarks/suite.py --compare benchmarks/results/abc1234.json
+
+With --compare, the run exits non-zero if any stage got slower than
+--threshold times its baseline median.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+# Measure the code, not the caches in front of it
+os.environ.setdefault("HTTP_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_PATH", "")
+os.environ.setdefault("PATTERN_CACHE_PATH", "")
+os.environ.setdefault("LABEL_CACHE_MAX_ENTRIES", "0")
+
+import groupme_internships as g  # noqa: E402
+from corpus import generate_jobs  # noqa: E402
+from dedup import dedupe_jobs  # noqa: E402
+from job import jobs_from_records  # noqa: E402
+from stub_server import StubAPI  # noqa: E402
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn, repeat):
+    """Run fn `repeat` times with its prints silenced. Returns (last result, [seconds])."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+    return result, times
+
+
+def record(results, stage, size, times):
+    median = statistics.median(times)
+    results.append({
+        "stage": stage,
+        "size": size,
+        "median_s": median,
+        "min_s": min(times),
+        "runs_s": times,
+        "per_job_us": median / size * 1e6 if size else None,
+    })
+    print(f"{stage:<28} {size:>7} jobs  median {median * 1e3:9.1f}ms  min {min(times) * 1e3:9.1f}ms")
+
+
+def fetch():
+    g.HTTP_CACHE.clear()
+    return g.get_internships_data()
+
+
+def run_suite(sizes, repeat, duplicate_rate, description_words, fetch_max, seed):
+    results = []
+    corpus = generate_jobs(max(sizes), duplicate_rate, description_words, seed)
+    g.FETCH_RATE = 1e6  # the stub has no quota
+    g.FETCH_CONCURRENCY = 8
+
+    for size in sizes:
+        records = corpus[:size]
+
+        if size <= fetch_max:
+            with StubAPI(jobs=records) as api:
+                g.RAPIDAPI_URL = api.url
+                g.MAX_PAGES = math.ceil(size / 10) + 1
+                _, times = measure(fetch, repeat)
+            record(results, "fetch (get_internships_data)", size, times)
+
+        jobs, times = measure(lambda: jobs_from_records(records), repeat)
+        record(results, "parse", size, times)
+
+        unique, times = measure(lambda: dedupe_jobs(jobs), repeat)
+        record(results, "dedup", size, times)
+
+        classified, times = measure(lambda: g.classify_data(unique), repeat)
+        record(results, "classify_data", size, times)
+
+        for category in g.CATEGORIES:
+            _, times = measure(lambda: g.topic_handler(category.name, classified), repeat)
+            record(results, f"render {category.name}", len(classified[category.key]), times)
+
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["stage"], r["size"]): r["median_s"] for r in baseline["results"]}
+
+    print(f"\nvs {baseline['commit']} ({baseline_path})")
+    regressions = 0
+    for r in results:
+        old = before.get((r["stage"], r["size"]))
+        if not old:
+            continue
+        ratio = r["median_s"] / old
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- slower"
+            regressions += 1
+        print(f"{r['stage']:<28} {r['size']:>7} jobs  {old * 1e3:9.1f}ms -> {r['median_s'] * 1e3:9.1f}ms  {ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated corpus sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--description-words", default="80,400", help="min,max words per description")
+    parser.add_argument("--fetch-max", type=int, default=10000, help="skip the fetch stage above this size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    low, high = (int(words) for words in args.description_words.split(","))
+    commit = git_commit()
+
+    results = run_suite(sizes, args.repeat, args.duplicate_rate, (low, high), args.fetch_max, args.seed)
+
+    out = args.out or os.path.join(HERE, "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {"sizes": sizes, "repeat": args.repeat, "duplicate_rate": args.duplicate_rate,
+                       "description_words": [low, high], "seed": args.seed},
+            "results": results,
+        }, f, indent=2)
+    print(f"\nwrote {out}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Category:
+    """One subgroup category and how its messages look"""
+    key: str            # what classify_job returns and classify_data is keyed by
+    name: str           # topic name used by topic_handler and the dashboard
+    emoji: str
+    heading: str        # "{emoji} New {heading} Related Internships"
+    banner_width: int   # "=" padding either side of the date range
+    subgroup_env: str   # env var holding the GroupMe subgroup id
+
+    @property
+    def title(self):
+        return f"{self.emoji} New {self.heading} Related Internships"
+
+    @property
+    def empty_message(self):
+        return f"No new {self.heading} Related internship opportunities available at the moment."
+
+    @property
+    def subgroup_id(self):
+        return os.environ.get(self.subgroup_env)
+
+
+CATEGORIES = [
+    Category("CS/IT", "CS/IT", "🖥️", "CS/IT", 8, "CS_ID"),
+    Category("Engineering", "Engineering", "🛠️", "Engineering", 11, "ENGINEERING_ID"),
+    Category("Health Sciences", "Health Sciences", "🩺", "Health Sciences/Med", 12, "MED_ID"),
+    Category("Social Sciences / Law", "Social Sciences/Law", "⚖️", "Social Sciences/Law", 12, "LAW_ID"),
+    Category("Business", "Business", "💼", "Business", 9, "BUSINESS_ID"),
+    Category("Humanities", "Humanities", "🎨", "Humanities", 10, "HUMANITIES_ID"),
+]
+
+
+def _fold(name):
+    # "Social Sciences/Law", "Social Sciences / Law" and "social sciences/law" are all the same category
+    return "".join(name.split()).lower()
+
+
+_BY_NAME = {}
+for _category in CATEGORIES:
+    _BY_NAME[_fold(_category.key)] = _category
+    _BY_NAME[_fold(_category.name)] = _category
+
+
+def get_category(name):
+    """Look a category up by its key or topic name, ignoring spacing and case. None if unknown."""
+    if isinstance(name, Category):
+        return name
+    return _BY_NAME.get(_fold(name or ""))
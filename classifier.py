@@ -0,0 +1,414 @@
+import re
+from array import array
+from bisect import bisect_right
+from functools import cached_property
+
+# Ends each text when several are matched as one string. Not a word
+# character or whitespace, so no rule can match across two texts.
+SEPARATOR = "\x00"
+
+
+class CompiledClassifier:
+    """
+    Compiled form of the CS/IT token lists and FILTERS.
+
+    Every rule list becomes a single alternation: the broad CS/IT filter,
+    all of CS_TOKENS, all of CS_BLOCKLIST, and each other FILTERS entry.
+    hits() returns every group that matches a text, and decide() applies
+    the classify_job priority rules to that set.
+
+    `filters` maps each category to its pattern source. Nothing is compiled
+    until the first match, and then through `compile` (re.compile, or a
+    PatternCache's compile to reuse a saved snapshot).
+    """
+
+    CS_FILTER = "cs_filter"
+    CS_ALLOW = "cs_allow"
+    CS_BLOCK = "cs_block"
+
+    def __init__(self, cs_tokens, cs_blocklist, filters, cs_category="CS/IT", flags=re.I, compile=re.compile):
+        self.cs_category = cs_category
+        self.flags = flags
+        self.compile = compile
+        self.categories = [field for field in filters if field != cs_category]
+
+        self.names = [self.CS_FILTER, self.CS_ALLOW, self.CS_BLOCK] + self.categories
+        self.sources = [
+            filters[cs_category],
+            _word_bounded(cs_tokens),
+            _word_bounded(cs_blocklist),
+        ] + [filters[field] for field in self.categories]
+
+        # The individual alternatives of each rule list, for ScoredClassifier
+        self.branches = [
+            _split_alternatives(filters[cs_category]),
+            [branch for p in cs_tokens for branch in _split_alternatives(p)],
+            [branch for p in cs_blocklist for branch in _split_alternatives(p)],
+        ] + [_split_alternatives(filters[field]) for field in self.categories]
+
+    @cached_property
+    def patterns(self):
+        return [self.compile(src, self.flags) for src in self.sources]
+
+    @cached_property
+    def folded(self):
+        """
+        Case-insensitive matching is the slow part of sre. For ASCII text,
+        lowercasing once and matching case-sensitively gives the same hits,
+        as long as the rule sources are lowercase themselves.
+        """
+        if self.flags & re.I and all(src == src.lower() for src in self.sources):
+            return [self.compile(src, self.flags & ~re.I) for src in self.sources]
+        return None
+
+    def hits(self, text):
+        """Return the set of rule group names that match anywhere in text"""
+        patterns = self.patterns
+        if self.folded and text.isascii():
+            text = text.lower()
+            patterns = self.folded
+        return {name for name, pattern in zip(self.names, patterns) if pattern.search(text)}
+
+    def decide(self, found):
+        """Apply the classify_job priority rules to a set of hits"""
+        if self.CS_FILTER in found and self.CS_ALLOW in found and self.CS_BLOCK not in found:
+            return self.cs_category
+        for field in self.categories:
+            if field in found:
+                return field
+        return "Other"
+
+    def classify_text(self, text):
+        return self.decide(self.hits(text))
+
+    @property
+    def ruleset(self):
+        """Everything that decides a label, for cache fingerprints"""
+        return (self.cs_category, self.names, self.sources)
+
+    @property
+    def labels(self):
+        """Every label decide() can return; classify_table() ids index into this"""
+        return [self.cs_category] + self.categories + ["Other"]
+
+    @staticmethod
+    def _matching_rows(pattern, text, starts, candidates=None):
+        """
+        Rows of a joined column with at least one match, skipping to the
+        next row after each hit. With `candidates` (sorted row numbers),
+        only runs of those rows are searched.
+        """
+        if candidates is None:
+            runs = [(0, len(starts) - 1)]
+        else:
+            runs = []
+            for row in candidates:
+                if runs and runs[-1][1] == row:
+                    runs[-1][1] = row + 1
+                else:
+                    runs.append([row, row + 1])
+
+        rows = []
+        search = pattern.search
+        for first, last in runs:
+            pos, end = starts[first], starts[last]
+            while pos < end:
+                match = search(text, pos, end)
+                if match is None:
+                    break
+                row = bisect_right(starts, match.start()) - 1
+                rows.append(row)
+                pos = starts[row + 1]
+        return rows
+
+    def classify_table(self, table):
+        """
+        Label every row of a JobTable at once, with the same answers as
+        classify_text(). Each rule list is searched over the joined title +
+        description column, only over rows that its answer could still
+        change, and the priority rules are applied to the matching row
+        sets. Fills table.category with indices into self.labels and
+        returns {label: [row, ...]} for every label.
+        """
+        text, starts = table.joined(SEPARATOR, "title", "description")
+        patterns = dict(zip(self.names, self.patterns))
+        if self.folded and text.isascii():
+            text = text.lower()
+            patterns = dict(zip(self.names, self.folded))
+
+        labels = self.labels
+        other = len(labels) - 1
+        ids = array("B", [other]) * len(table)
+
+        # CS/IT needs the broad filter, then a strict token, then no blocklist hit
+        rows = self._matching_rows(patterns[self.CS_FILTER], text, starts)
+        rows = self._matching_rows(patterns[self.CS_ALLOW], text, starts, rows)
+        blocked = set(self._matching_rows(patterns[self.CS_BLOCK], text, starts, rows))
+        for row in rows:
+            if row not in blocked:
+                ids[row] = 0
+
+        # Then each category in priority order, over the rows nothing has claimed yet
+        for label_id, field in enumerate(self.categories, 1):
+            undecided = [row for row, label in enumerate(ids) if label == other]
+            if not undecided:
+                break
+            for row in self._matching_rows(patterns[field], text, starts, undecided):
+                ids[row] = label_id
+        table.category = ids
+
+        rows = {label: [] for label in labels}
+        for row, label_id in enumerate(ids):
+            rows[labels[label_id]].append(row)
+        return rows
+
+
+def _word_bounded(tokens):
+    """
+    One pattern matching wherever any rf"\b{token}\b" would, as the old
+    wb() helper wrapped them. A token like "custodian|janitor" keeps its
+    original precedence: only its first alternative needs a boundary in
+    front and only its last one behind. The boundaries are hoisted out of
+    the alternation, which sre scans far faster than one \b per token.
+    """
+    both, left, right, neither = [], [], [], []
+    for token in tokens:
+        alternatives = _split_alternatives(token, unwrap=False)
+        if len(alternatives) == 1:
+            both.append(token)
+        else:
+            left.append(alternatives[0])
+            neither.extend(alternatives[1:-1])
+            right.append(alternatives[-1])
+    parts = []
+    if both:
+        parts.append(rf"\b(?:{'|'.join(both)})\b")
+    if left:
+        parts.append(rf"\b(?:{'|'.join(left)})")
+    if right:
+        parts.append(rf"(?:{'|'.join(right)})\b")
+    if neither:
+        parts.append(f"(?:{'|'.join(neither)})")
+    return "|".join(parts)
+
+
+def _split_alternatives(source, unwrap=True):
+    """Split a pattern into its top-level | alternatives, unwrapping one enclosing group"""
+    def split(src):
+        parts, depth, start, i = [], 0, 0, 0
+        while i < len(src):
+            ch = src[i]
+            if ch == "\\":
+                i += 1
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif ch == "|" and depth == 0:
+                parts.append(src[start:i])
+                start = i + 1
+            i += 1
+        parts.append(src[start:])
+        return parts
+
+    if unwrap and source.startswith("(") and len(split(source)) == 1 and source.endswith(")"):
+        inner = source[3:-1] if source.startswith("(?:") else source[1:-1]
+        return split(inner)
+    return split(source)
+
+
+def _non_capturing(source):
+    """Turn every capturing group in a pattern into a non-capturing one"""
+    return re.sub(r"(?<!\\)\((?!\?)", "(?:", source)
+
+
+class ScoredClassifier:
+    """
+    Multi-label alternative to CompiledClassifier.decide().
+
+    Instead of stopping at the first category that matches, every category
+    gets a score: each distinct rule token it hits counts once, weighted by
+    `token_weights` (default 1) and by where it was found, title hits
+    counting `title_weight` and description-only hits `description_weight`.
+    CS/IT keeps the classify_job gate: it only scores when the broad filter
+    and a strict CS token hit and nothing on the blocklist does. Every
+    category at or above its threshold and within `relative_cutoff` of the
+    best score is returned, best first, so a job can go to several
+    subgroups, but a stray description word doesn't add a label next to a
+    strong title match.
+
+    Scoring patterns only match whole words, give or take a common ending,
+    so "consult" still counts in "consulting" but a short filter token like
+    "pa" or "hr" isn't counted inside "paralegal" or "three". Like the
+    CompiledClassifier's, they're compiled on first use, with its `compile`.
+    """
+
+    SUFFIXES = r"s|es|ed|ing|ings|er|ers|or|ors|al|ant|ants|ist|ists|ics|ian|ians"
+
+    def __init__(self, compiled, thresholds=None, default_threshold=3.0, title_weight=3.0,
+                 description_weight=1.0, token_weights=None, max_labels=None, relative_cutoff=0.5):
+        self.compiled = compiled
+        self.thresholds = dict(thresholds or {})
+        self.default_threshold = default_threshold
+        self.title_weight = title_weight
+        self.description_weight = description_weight
+        self.token_weights = {token.lower(): weight for token, weight in (token_weights or {}).items()}
+        self.max_labels = max_labels
+        self.relative_cutoff = relative_cutoff
+        self.order = [compiled.cs_category] + compiled.categories
+
+        # Plain single-word alternatives are looked up in each text's set of
+        # words, with every allowed ending spelled out. Phrases and real
+        # regexes from every list share one flat alternation so each text is
+        # scanned once; a matched token is mapped back to its lists afterwards.
+        self.names = compiled.names
+        self.words = []
+        self.rest_sources = []
+        phrases = set()
+        for branches in compiled.branches:
+            words = {}
+            rest = []
+            for branch in branches:
+                if re.fullmatch(r"\w+", branch):
+                    for ending in [""] + self.SUFFIXES.split("|"):
+                        words.setdefault(branch.lower() + ending, branch.lower())
+                else:
+                    rest.append(_non_capturing(branch))
+            self.words.append(words)
+            self.rest_sources.append(rf"(?:{'|'.join(rest)})(?:{self.SUFFIXES})?" if rest else None)
+            phrases.update(rest)
+
+        # Longest first, so a longer phrase wins over a shorter one at the same
+        # spot, then alphabetical so the source is the same in every process.
+        # Phrases are grouped by their first character, so at each word sre
+        # tries the one group that can match instead of every phrase in turn.
+        groups = {}
+        for phrase in sorted(phrases, key=lambda phrase: (-len(phrase), phrase)):
+            lead = phrase[0] if phrase[0].isalnum() and phrase[1:2] not in ("?", "*", "+", "{") else ""
+            groups.setdefault(lead, []).append(phrase[len(lead):])
+        alternatives = [f"{lead}(?:{'|'.join(rests)})" for lead, rests in sorted(groups.items())]
+        self.source = rf"\b(?:{'|'.join(alternatives)})(?:{self.SUFFIXES})?\b" if phrases else r"(?!)"
+        self.token_lists = {}  # matched phrase -> names of the lists it belongs to
+        self.word_pattern = re.compile(r"\w+")
+        # Everything that isn't a word character becomes a space, so ASCII
+        # text splits into the same words \w+ would find
+        self.word_breaks = {code: " " for code in range(128)
+                            if not (chr(code).isalnum() or chr(code) == "_") and chr(code) != SEPARATOR}
+
+    @cached_property
+    def rest(self):
+        return [self.compiled.compile(src, re.I) if src else None for src in self.rest_sources]
+
+    @cached_property
+    def pattern(self):
+        return self.compiled.compile(self.source, re.I)
+
+    @cached_property
+    def folded(self):
+        return self.compiled.compile(self.source)
+
+    def _lists_for(self, token):
+        names = self.token_lists.get(token)
+        if names is None:
+            names = self.token_lists[token] = [
+                name for name, pattern in zip(self.names, self.rest) if pattern and pattern.fullmatch(token)
+            ]
+        return names
+
+    def _scan(self, segments):
+        """
+        Match every rule list against all segments joined together.
+        Returns, per segment, {rule name: set of matched tokens}.
+        """
+        text = SEPARATOR.join(segments)
+        lowered = text.lower()
+        if text.isascii():
+            words = [set(chunk.split()) for chunk in lowered.translate(self.word_breaks).split(SEPARATOR)]
+            text, pattern = lowered, self.folded
+        else:
+            words = [set(self.word_pattern.findall(chunk)) for chunk in lowered.split(SEPARATOR)]
+            pattern = self.pattern
+
+        found = [{} for _ in segments]
+        for name, vocab in zip(self.names, self.words):
+            for hits, seen in zip(found, words):
+                matched = seen & vocab.keys()
+                if matched:
+                    hits[name] = {vocab[word] for word in matched}
+
+        starts = []
+        offset = 0
+        for segment in segments:
+            starts.append(offset)
+            offset += len(segment) + 1
+        for match in pattern.finditer(text):
+            hits = found[bisect_right(starts, match.start()) - 1]
+            token = match.group().lower()
+            for name in self._lists_for(token):
+                hits.setdefault(name, set()).add(token)
+        return found
+
+    def _score(self, title_hits, description_hits):
+        weights = self.token_weights
+        scores = {}
+        for name in title_hits.keys() | description_hits.keys():
+            in_title = title_hits.get(name, set())
+            in_description = description_hits.get(name, set()) - in_title
+            if weights:
+                scores[name] = (sum(weights.get(token, 1.0) for token in in_title) * self.title_weight
+                                + sum(weights.get(token, 1.0) for token in in_description) * self.description_weight)
+            else:
+                scores[name] = len(in_title) * self.title_weight + len(in_description) * self.description_weight
+
+        compiled = self.compiled
+        cs = 0.0
+        if compiled.CS_FILTER in scores and compiled.CS_ALLOW in scores and compiled.CS_BLOCK not in scores:
+            cs = scores[compiled.CS_ALLOW] + scores.get(compiled.CS_FILTER, 0.0)
+        result = {compiled.cs_category: cs}
+        for field in compiled.categories:
+            result[field] = scores.get(field, 0.0)
+        return result
+
+    @property
+    def settings(self):
+        """Everything besides the compiled rules that decides a label"""
+        return (sorted(self.thresholds.items()), self.default_threshold, self.title_weight, self.description_weight,
+                sorted(self.token_weights.items()), self.max_labels, self.relative_cutoff, self.SUFFIXES)
+
+    @property
+    def ruleset(self):
+        """Everything that decides a label, for cache fingerprints"""
+        return ("scored", self.compiled.ruleset, *self.settings)
+
+    def rank(self, scores):
+        """Categories at or above their threshold and near the best score as (category, score), best first"""
+        labels = [
+            (field, scores[field]) for field in self.order
+            if scores[field] > 0 and scores[field] >= self.thresholds.get(field, self.default_threshold)
+        ]
+        labels.sort(key=lambda label: -label[1])  # stable, so ties keep FILTERS order
+        if labels and self.relative_cutoff:
+            floor = labels[0][1] * self.relative_cutoff
+            labels = [label for label in labels if label[1] >= floor]
+        return labels[:self.max_labels] if self.max_labels else labels
+
+    def score_batch(self, jobs):
+        """
+        Score a whole page of jobs in one pass per rule list. Returns a score
+        dict per job. This saves the per-call setup, which matters for short
+        descriptions; on long ones nearly all the time goes into reading the
+        text, so it is about as fast as scoring each job alone.
+        """
+        segments = []
+        for job in jobs:
+            segments.append(job.title)
+            segments.append(job.description)
+        found = self._scan(segments)
+        return [self._score(found[i], found[i + 1]) for i in range(0, len(found), 2)]
+
+    def classify_batch(self, jobs):
+        """Ranked (category, score) labels for every job in jobs"""
+        return [self.rank(scores) for scores in self.score_batch(jobs)]
+
+    def classify(self, job):
+        return self.classify_batch([job])[0]
@@ -0,0 +1,113 @@
+import re
+from collections import defaultdict
+
+# Words that don't make two postings different
+NOISE_WORDS = re.compile(r'\b(intern|internship|summer|2024|2025|2026|student|position|role|opportunity)\b')
+SPACES = re.compile(r'\s+')
+
+
+def normalize_title(title):
+    """Lowercase and strip the noise words, same cleaning the old dedup loop used"""
+    title = NOISE_WORDS.sub('', (title or '').lower().strip())
+    return SPACES.sub(' ', title).strip()
+
+
+def job_key(organization, title):
+    """(organization, cleaned title) similarity key, computed once per Job"""
+    return (organization or '').lower().strip(), normalize_title(title)
+
+
+def overlap_similarity(common, size_a, size_b):
+    """Shared words over the larger title, the original 70% rule"""
+    return common / max(size_a, size_b)
+
+
+def jaccard_similarity(common, size_a, size_b):
+    return common / (size_a + size_b - common)
+
+
+SIMILARITY = {
+    "overlap": overlap_similarity,
+    "jaccard": jaccard_similarity,
+}
+
+
+class _OrgIndex:
+    """Titles seen for one organization, with an inverted word -> title index"""
+
+    __slots__ = ("titles", "sizes", "postings")
+
+    def __init__(self):
+        self.titles = set()                 # exact cleaned titles
+        self.sizes = []                     # word count per indexed title
+        self.postings = defaultdict(list)   # word -> ids of titles containing it
+
+
+class DedupIndex:
+    """
+    Near-duplicate detector for job postings.
+
+    A job is a duplicate when an earlier job at the same organization has the
+    same cleaned title, or shares more than `threshold` of its title words.
+    Each title is tokenized once, and candidates come from an inverted word
+    index per organization, so only titles sharing at least one word are
+    ever compared. With similarity="overlap" and threshold=0.7 the answers
+    match the old pairwise loop exactly.
+
+    add() also drops a Job whose key (LinkedIn job ID, else URL) was added
+    before, which is how the same posting shows up in overlapping fetch
+    shards even if its title was edited in between.
+    """
+
+    def __init__(self, threshold=0.7, similarity="overlap"):
+        if similarity not in SIMILARITY:
+            raise ValueError(f"Unknown similarity {similarity!r}, expected one of {sorted(SIMILARITY)}")
+        self.threshold = threshold
+        self.similarity = SIMILARITY[similarity]
+        self.orgs = defaultdict(_OrgIndex)
+        self.keys = set()  # Job.key of every job add() kept
+
+    def _is_similar(self, org, words):
+        size = len(words)
+        counts = defaultdict(int)
+        for word in words:
+            for title_id in org.postings.get(word, ()):
+                counts[title_id] += 1
+        for title_id, common in counts.items():
+            if self.similarity(common, size, org.sizes[title_id]) > self.threshold:
+                return True
+        return False
+
+    def add_key(self, company, title):
+        """Record a (company, cleaned title) key. Returns False if it's a duplicate."""
+        org = self.orgs[company]
+        if title in org.titles:
+            return False
+
+        words = set(title.split())
+        if words and self._is_similar(org, words):
+            return False
+
+        org.titles.add(title)
+        if words:
+            title_id = len(org.sizes)
+            org.sizes.append(len(words))
+            for word in words:
+                org.postings[word].append(title_id)
+        return True
+
+    def add(self, job):
+        """Record a Job. Returns False if it duplicates one already added."""
+        if job.key in self.keys or not self.add_key(*job.dedup_key):
+            return False
+        self.keys.add(job.key)
+        return True
+
+    def __len__(self):
+        return sum(len(org.titles) for org in self.orgs.values())
+
+
+def dedupe_jobs(jobs, threshold=0.7, similarity="overlap"):
+    """Return the jobs that aren't near-duplicates of an earlier one, in order"""
+    index = DedupIndex(threshold=threshold, similarity=similarity)
+    return [job for job in jobs if index.add(job)]
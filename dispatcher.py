@@ -0,0 +1,187 @@
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from ratelimit import TokenBucket, backoff_delay
+
+# GroupMe doesn't publish exact numbers; in practice a group starts answering
+# 429 somewhere past one message a second with small bursts tolerated.
+GROUPME_POSTS_PER_SEC = 1.0
+GROUPME_BURST = 3
+
+
+@dataclass
+class PostResult:
+    """Outcome of one queued message"""
+    subgroup_id: str
+    index: int           # position within its subgroup's queue
+    total: int           # messages queued for that subgroup so far
+    ok: bool
+    label: str = ""
+    elapsed: float = 0.0
+    error: str = ""
+    attempts: int = 0
+    source_guid: str = ""
+    meta: dict = field(default_factory=dict)
+
+
+class PostDispatcher:
+    """
+    Posts messages to several subgroups at once.
+
+    Each subgroup gets its own FIFO queue, its own worker thread and its own
+    token bucket (`rate`/`burst`, or its entry in `limits`: a (rate, burst)
+    pair, or a TokenBucket it shares with other subgroups), so one slow or
+    throttled subgroup doesn't hold up the others and messages within a
+    subgroup still go out in order. Workers start on a subgroup's first
+    message, so posting can begin while later messages are still being
+    produced.
+
+    A failed post is retried with jittered exponential backoff under the
+    same source_guid. With halt_on_failure, a message that runs out of
+    attempts holds back the rest of its subgroup's queue (reported with
+    attempts=0) so they can be resumed in order later.
+
+    With a Metrics instance it counts posts by subgroup and result (sent,
+    failed, held), retries, and the time workers spent asleep on the rate
+    limit or in backoff, and records each message's latency.
+    """
+
+    def __init__(self, post, rate=GROUPME_POSTS_PER_SEC, burst=GROUPME_BURST,
+                 max_attempts=3, backoff=1.0, max_backoff=30.0, halt_on_failure=False, sleep=time.sleep, metrics=None,
+                 limits=None):
+        self.post = post  # post(text, subgroup_id, source_guid) -> bool
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})  # subgroup_id -> (rate, burst) or shared TokenBucket, for subgroups with their own
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.halt_on_failure = halt_on_failure
+        self.sleep = sleep
+        self.metrics = metrics
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.queues = {}       # subgroup_id -> queue.Queue of pending messages
+        self.counts = {}       # subgroup_id -> messages enqueued so far
+        self.workers = []
+        self.results = queue.Queue()
+        self.outstanding = 0   # results not handed out yet
+
+    def enqueue(self, subgroup_id, text, label="", source_guid=None, **meta):
+        """Queue a message behind the subgroup's earlier ones. Returns its source_guid."""
+        source_guid = source_guid or str(uuid.uuid4())
+        with self.lock:
+            messages = self.queues.get(subgroup_id)
+            if messages is None:
+                messages = self.queues[subgroup_id] = queue.Queue()
+                worker = threading.Thread(target=self._drain, args=(subgroup_id, messages), daemon=True)
+                self.workers.append(worker)
+                worker.start()
+            index = self.counts.get(subgroup_id, 0)
+            self.counts[subgroup_id] = index + 1
+            self.outstanding += 1
+        messages.put((index, text, label, source_guid, meta))
+        return source_guid
+
+    def __len__(self):
+        with self.lock:
+            return sum(self.counts.values())
+
+    def _send(self, limiter, text, subgroup_id, source_guid):
+        """Try one message until it lands or runs out of attempts. Returns (ok, attempts, error)."""
+        error = ""
+        for attempt in range(1, self.max_attempts + 1):
+            self._timed_sleep("post_rate_limit", limiter.acquire)
+            try:
+                if self.post(text, subgroup_id, source_guid):
+                    return True, attempt, ""
+                error = "post failed"
+            except Exception as e:
+                error = str(e)
+            if attempt < self.max_attempts:
+                self._timed_sleep("post_backoff", self.sleep, backoff_delay(attempt, self.backoff, self.max_backoff))
+        return False, self.max_attempts, error
+
+    def _timed_sleep(self, reason, fn, *args):
+        if self.metrics is None:
+            return fn(*args)
+        start = time.perf_counter()
+        fn(*args)
+        self.metrics.inc("sleep_seconds_total", time.perf_counter() - start, reason=reason)
+
+    def _record(self, result):
+        if self.metrics is None:
+            return
+        outcome = "sent" if result.ok else ("failed" if result.attempts else "held")
+        self.metrics.inc("posts_total", subgroup=result.label or result.subgroup_id, result=outcome)
+        if result.attempts > 1:
+            self.metrics.inc("post_retries_total", result.attempts - 1, subgroup=result.label or result.subgroup_id)
+        if result.attempts:
+            self.metrics.observe("post_seconds", result.elapsed, subgroup=result.label or result.subgroup_id)
+
+    def _drain(self, subgroup_id, messages):
+        limiter = self.limits.get(subgroup_id, (self.rate, self.burst))
+        if not isinstance(limiter, TokenBucket):
+            limiter = TokenBucket(rate=limiter[0], capacity=limiter[1])
+        halted = False
+        while True:
+            item = messages.get()
+            if item is None:
+                return
+            index, text, label, source_guid, meta = item
+            if halted:
+                result = PostResult(subgroup_id, index, 0, False, label,
+                                    error="held back behind a failed message",
+                                    source_guid=source_guid, meta=meta)
+            else:
+                start = time.monotonic()
+                ok, attempts, error = self._send(limiter, text, subgroup_id, source_guid)
+                result = PostResult(subgroup_id, index, 0, ok, label,
+                                    time.monotonic() - start, error, attempts, source_guid, meta)
+                halted = not ok and self.halt_on_failure
+            with self.lock:
+                result.total = self.counts[subgroup_id]
+            self._record(result)
+            self.results.put(result)
+
+    def poll_results(self):
+        """Yield whatever results are ready right now without waiting"""
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            with self.lock:
+                self.outstanding -= 1
+            yield result
+
+    def iter_results(self):
+        """
+        Stop taking messages, then yield a PostResult for each one not yet
+        handed out as it finishes. The dispatcher can be reused afterwards.
+        """
+        with self.lock:
+            queues, workers = list(self.queues.values()), self.workers
+            outstanding = self.outstanding
+        for messages in queues:
+            messages.put(None)
+        for _ in range(outstanding):
+            yield self.results.get()
+        for worker in workers:
+            worker.join()
+        with self.lock:
+            self._reset()
+
+    def run(self, on_result=None):
+        """Post everything queued and return the results in completion order"""
+        collected = []
+        for result in self.iter_results():
+            if on_result:
+                on_result(result)
+            collected.append(result)
+        return collected
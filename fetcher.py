@@ -0,0 +1,259 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import parse_qsl
+
+from ratelimit import TokenBucket, parse_retry_after
+
+RAPIDAPI_HOST = "internships-api.p.rapidapi.com"
+RAPIDAPI_URL = f"https://{RAPIDAPI_HOST}/active-jb-7d"
+PAGE_SIZE = 10
+
+
+def parse_shards(value):
+    """
+    Query shards from "location_filter=United States;location_filter=Canada&title_filter=software":
+    the extra query parameters of each ";"-separated shard, as a dict.
+    """
+    return [dict(parse_qsl(shard.strip())) for shard in (value or "").split(";") if shard.strip()]
+
+
+def shard_name(params):
+    return "&".join(f"{name}={value}" for name, value in params.items()) or "(no filter)"
+
+
+class PageFetcher:
+    """
+    Fetch offset-paginated pages with a bounded number of requests in flight.
+
+    Requests go out as fast as the token bucket allows, so the total time
+    depends on the API quota rather than on how many pages we ask for.
+    A page shorter than page_size means the result set is exhausted and no
+    further offsets get scheduled. If `known` is given, a page made up only of
+    jobs it recognises stops paging too, since everything older was fetched
+    on a previous run. With an HTTPCache, pages still fresh in the cache
+    don't use a token or touch the network at all.
+
+    With a Metrics instance it counts pages by source (network or cache),
+    429 retries and failed pages, and how long requests waited on the
+    token bucket.
+    """
+
+    def __init__(self, headers, base_url=RAPIDAPI_URL, params=None, page_size=PAGE_SIZE,
+                 concurrency=4, limiter=None, max_retries=3, timeout=None, get=None, known=None, cache=None, metrics=None, parse=None):
+        self.headers = headers
+        self.base_url = base_url
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency)
+        self.limiter = limiter or TokenBucket(rate=5)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        if get is None:
+            import requests
+            get = requests.get
+        self.get = get  # usually Transport.get, for pooled connections
+        self.known = known
+        self.cache = cache
+        self.metrics = metrics
+        self.parse = parse  # turns a page's raw JSON body into what callers get, e.g. jobs_from_json
+        self.lock = threading.Lock()
+        self.stop_page = None  # first page index we know holds nothing useful
+
+    def _should_skip(self, page):
+        with self.lock:
+            return self.stop_page is not None and page >= self.stop_page
+
+    def _mark_stop(self, page):
+        with self.lock:
+            if self.stop_page is None or page < self.stop_page:
+                self.stop_page = page
+
+    def _count(self, name, **labels):
+        if self.metrics is not None:
+            self.metrics.inc(name, **labels)
+
+    def _parse(self, response):
+        """The page's jobs: records from response.json(), or whatever `parse` makes of the body"""
+        return self.parse(response.content) if self.parse else (response.json() or [])
+
+    def _acquire(self):
+        if self.metrics is None:
+            self.limiter.acquire()
+            return
+        start = time.perf_counter()
+        self.limiter.acquire()
+        self.metrics.inc("sleep_seconds_total", time.perf_counter() - start, reason="fetch_rate_limit")
+
+    def fetch_page(self, page):
+        """Fetch one page, retrying on 429. Returns a list of jobs or None on error."""
+        params = dict(self.params, offset=page * self.page_size)
+        for _ in range(self.max_retries + 1):
+            if self._should_skip(page):
+                return []
+            if self.cache:
+                cached = self.cache.fresh(self.base_url, params)
+                if cached is not None:
+                    self._count("pages_fetched_total", source="cache")
+                    return self._parse(cached)
+
+            # Leave the timeout to the transport unless one was asked for
+            kwargs = {"timeout": self.timeout} if self.timeout is not None else {}
+            self._acquire()
+            if self.cache:
+                response = self.cache.fetch(self.get, self.base_url, headers=self.headers, params=params, **kwargs)
+            else:
+                response = self.get(self.base_url, headers=self.headers, params=params, **kwargs)
+            if not getattr(response, "from_cache", False):
+                self.limiter.update_from_headers(response.headers)
+
+            if response.status_code == 429:
+                self.limiter.on_throttled(parse_retry_after(response.headers.get("retry-after")))
+                print(f"Rate limited on page {page + 1}, backing off...")
+                self._count("fetch_retries_total", reason="429")
+                continue
+            if response.status_code != 200:
+                print(f"Error fetching page {page + 1}: {response.status_code} - {response.text}")
+                self._count("fetch_errors_total", reason=str(response.status_code))
+                return None
+
+            self.limiter.on_success()
+            self._count("pages_fetched_total", source="cache" if getattr(response, "from_cache", False) else "network")
+            return self._parse(response)
+
+        print(f"Giving up on page {page + 1} after {self.max_retries} retries")
+        self._count("fetch_errors_total", reason="retries_exhausted")
+        return None
+
+    def _landed(self, page, future):
+        """
+        Take a finished page into account for where paging stops. Returns its
+        jobs, or None if it failed or falls past the stop point.
+        """
+        try:
+            jobs = future.result()
+        except Exception as e:
+            print(f"Error fetching page {page + 1}: {e}")
+            self._count("fetch_errors_total", reason="exception")
+            jobs = None
+
+        if jobs is None:
+            # Hard error: keep what came before it, like the serial loop did
+            self._mark_stop(page)
+            return None
+        if len(jobs) < self.page_size:
+            self._mark_stop(page + 1)
+        elif self.known and all(self.known(job) for job in jobs):
+            print(f"Page {page + 1} only has jobs we've already seen, stopping...")
+            self._mark_stop(page + 1)
+        return None if self._should_skip(page) else jobs
+
+    def iter_pages(self, max_pages):
+        """Yield (page, jobs) as pages complete, in completion order"""
+        for _, page, jobs in FetchPlanner([self], self.concurrency).iter_pages(max_pages):
+            yield page, jobs
+
+    def iter_pages_in_order(self, max_pages):
+        """
+        Yield (page, jobs) in offset order as soon as each page and every
+        page before it have arrived. Only the few pages that finish early
+        are held back, so memory doesn't grow with max_pages.
+        """
+        for _, page, jobs in FetchPlanner([self], self.concurrency).iter_pages_in_order(max_pages):
+            yield page, jobs
+
+    def fetch_all(self, max_pages, on_page=None):
+        """
+        Fetch up to max_pages pages and return the jobs in offset order.
+        on_page(pages done, max_pages) is called as each one lands.
+        """
+        all_jobs = []
+        for page, jobs in self.iter_pages_in_order(max_pages):
+            all_jobs.extend(jobs)
+            print(f"Fetched page {page + 1}/{max_pages}: {len(jobs)} jobs (Total: {len(all_jobs)})")
+            if on_page:
+                on_page(page + 1, max_pages)
+        return all_jobs
+
+
+class FetchPlanner:
+    """
+    Several PageFetchers, one per query shard (a location, a title filter,
+    a date window...), run as one fetch.
+
+    A single pool keeps `concurrency` page requests in flight across all
+    shards, taking the next page from each unfinished shard in turn, and
+    the shards are meant to share one token bucket, so adding shards adds
+    coverage without adding requests in flight or quota. Each shard still
+    stops on its own: at a short page, an error, or a page of known jobs.
+    A shard that runs out early hands its share of the pool to the rest,
+    so a handful of small regional feeds cost little more wall-clock time
+    than the largest one.
+    """
+
+    def __init__(self, fetchers, concurrency=4):
+        self.fetchers = list(fetchers)
+        self.concurrency = max(1, concurrency)
+
+    def iter_pages(self, max_pages):
+        """Yield (shard, page, jobs) as pages complete, in completion order. max_pages is per shard."""
+        next_pages = [0] * len(self.fetchers)
+        turn = 0
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                # Round-robin over the shards that still have pages to ask for
+                while len(in_flight) < self.concurrency:
+                    open_shards = [
+                        shard for shard, fetcher in enumerate(self.fetchers)
+                        if next_pages[shard] < max_pages and not fetcher._should_skip(next_pages[shard])
+                    ]
+                    if not open_shards:
+                        break
+                    shard = min(open_shards, key=lambda s: (s - turn) % len(self.fetchers))
+                    turn = shard + 1
+                    page = next_pages[shard]
+                    in_flight[pool.submit(self.fetchers[shard].fetch_page, page)] = (shard, page)
+                    next_pages[shard] += 1
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard, page = in_flight.pop(future)
+                    jobs = self.fetchers[shard]._landed(page, future)
+                    if jobs is not None:
+                        yield shard, page, jobs
+
+    def iter_pages_in_order(self, max_pages):
+        """
+        Yield (shard, page, jobs) with each shard's pages in offset order,
+        as soon as a page and every page before it in its shard have
+        arrived. Shards are interleaved as their pages land.
+        """
+        waiting = [{} for _ in self.fetchers]
+        next_pages = [0] * len(self.fetchers)
+        for shard, page, jobs in self.iter_pages(max_pages):
+            fetcher = self.fetchers[shard]
+            waiting[shard][page] = jobs
+            while next_pages[shard] in waiting[shard] and not fetcher._should_skip(next_pages[shard]):
+                yield shard, next_pages[shard], waiting[shard].pop(next_pages[shard])
+                next_pages[shard] += 1
+
+    def fetch_all(self, max_pages, on_page=None):
+        """
+        Fetch up to max_pages pages of every shard and return the jobs,
+        shard by shard in offset order. on_page(pages done, pages planned)
+        is called as each one lands.
+        """
+        pages = {}
+        planned = max_pages * len(self.fetchers)
+        fetched = 0
+        for shard, page, jobs in self.iter_pages_in_order(max_pages):
+            pages[shard, page] = jobs
+            fetched += len(jobs)
+            where = f"shard {shard + 1}/{len(self.fetchers)} " if len(self.fetchers) > 1 else ""
+            print(f"Fetched {where}page {page + 1}/{max_pages}: {len(jobs)} jobs (Total: {fetched})")
+            if on_page:
+                on_page(len(pages), planned)
+        return [job for key in sorted(pages) for job in pages[key]]
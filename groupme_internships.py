@@ -1,19 +1,40 @@
 import os
-import json
-import urllib.request
-import ssl
+import signal
+import tempfile
 import time
 import uuid
+from collections import Counter
 from dotenv import load_dotenv
-import re
-import requests
-from datetime import date, timedelta
+from categories import CATEGORIES, get_category
+from classifier import CompiledClassifier, ScoredClassifier
+from dedup import DedupIndex, dedupe_jobs
+from dispatcher import PostDispatcher, GROUPME_POSTS_PER_SEC, GROUPME_BURST
+from fetcher import PAGE_SIZE, FetchPlanner, PageFetcher, RAPIDAPI_HOST, RAPIDAPI_URL as DEFAULT_RAPIDAPI_URL, parse_shards, shard_name
+from http_cache import HTTPCache
+from job import Job, jobs_from_json
+from job_store import JobStore
+from job_table import JobTable
+from label_cache import LabelCache, content_hash, ruleset_fingerprint
+from metrics import Metrics
+from outbox import Outbox
+from pattern_cache import PatternCache
+from ratelimit import TokenBucket
+from reclassify import format_report, reclassify, ruleset
+from render import MessageStream, pack_messages, render_messages
+from scheduler import Scheduler
+from tenants import default_subgroups, load_tenants, unconfigured_categories
+from transport import Transport
+
+# Helpers that used to be defined here, still importable from this module
+from job import extract_fixed_link  # noqa: F401
+from render import chunk_jobs, get_week_date_range  # noqa: F401
 
 # POST TO GROUPME LOGIC
 load_dotenv()
 ACCESS_TOKEN = os.environ.get("ACCESS_TOKEN")
 GROUP_ID = os.environ.get("GROUP_ID")
 API_URL = "https://api.groupme.com/v3/bots/post"
+GROUPME_API_BASE = "https://api.groupme.com/v3"
 RAPIDAPI_KEY = os.environ.get("RAPIDAPI_KEY")
 CS_ID = os.environ.get("CS_ID")
 ENGINEERING_ID = os.environ.get("ENGINEERING_ID")
@@ -21,31 +42,101 @@ MED_ID = os.environ.get("MED_ID")
 LAW_ID = os.environ.get("LAW_ID")
 BUSINESS_ID = os.environ.get("BUSINESS_ID")
 HUMANITIES_ID = os.environ.get("HUMANITIES_ID")
-
-def get_week_date_range():
-    """Get the 7-day date range ending with today in MM/DD - MM/DD format"""
-    today = date.today()
-    # Start date is 7 days ago, end date is today
-    start_date = today - timedelta(days=7)
+TENANTS_PATH = os.environ.get("TENANTS_PATH", "")  # JSON groups/subgroups to post to; without it, one per category from CS_ID ... HUMANITIES_ID
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", "jobs.db")
+
+# FETCH SETTINGS
+RAPIDAPI_URL = os.environ.get("RAPIDAPI_URL", DEFAULT_RAPIDAPI_URL)
+MAX_PAGES = int(os.environ.get("MAX_PAGES", 40))  # per shard
+# Queries fetched together within FETCH_RATE and deduped as one feed, ";"-separated,
+# e.g. "location_filter=United States;location_filter=Canada;title_filter=software&location_filter=United Kingdom"
+FETCH_SHARDS = parse_shards(os.environ.get("FETCH_SHARDS") or "location_filter=United States")
+FETCH_CONCURRENCY = int(os.environ.get("FETCH_CONCURRENCY", 4))  # offset requests in flight
+FETCH_RATE = float(os.environ.get("FETCH_RATE", 5))  # requests per second allowed by our RapidAPI plan
+DESCRIPTION_MAX_CHARS = int(os.environ.get("DESCRIPTION_MAX_CHARS", 0))  # keep this much of each description (0 = all)
+
+# POST SETTINGS
+POST_RATE = float(os.environ.get("POST_RATE", GROUPME_POSTS_PER_SEC))  # messages per second, per subgroup
+POST_BURST = int(os.environ.get("POST_BURST", GROUPME_BURST))
+POST_MAX_ATTEMPTS = int(os.environ.get("POST_MAX_ATTEMPTS", 3))  # tries per message within one run
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 10))  # tries across runs before giving up
+DRY_RUN = os.environ.get("DRY_RUN", "").lower() in ("1", "true", "yes")  # log messages instead of posting them
+
+# METRICS SETTINGS
+METRICS_REPORT_PATH = os.environ.get("METRICS_REPORT_PATH", "metrics.json")  # JSON run report, read by the dashboard
+METRICS_PROM_PATH = os.environ.get("METRICS_PROM_PATH", "")  # Prometheus text file, e.g. for node_exporter's textfile collector
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 0))  # serve /metrics and /report (and /health with --daemon) while running
+
+# DAEMON SETTINGS (--daemon)
+FETCH_INTERVAL = float(os.environ.get("FETCH_INTERVAL", 60 * 60))  # seconds between fetch cycles
+POST_INTERVAL = float(os.environ.get("POST_INTERVAL", FETCH_INTERVAL))  # seconds between a subgroup's post cycles
+POST_SCHEDULE = os.environ.get("POST_SCHEDULE")  # per-subgroup POST_INTERVAL overrides, e.g. "CS/IT=1800,Humanities=86400"
+SCHEDULE_JITTER = float(os.environ.get("SCHEDULE_JITTER", 0.1))  # each interval varies by up to this fraction
+
+# Stage timers, counters and HTTP latency histograms for the current run
+METRICS = Metrics()
+
+# RECORD/REPLAY SETTINGS
+HTTP_RECORD_PATH = os.environ.get("HTTP_RECORD_PATH", "")  # save every RapidAPI/GroupMe exchange to this .jsonl.gz
+HTTP_REPLAY_PATH = os.environ.get("HTTP_REPLAY_PATH", "")  # answer from a recording instead of the network
+REPLAY_LATENCY = os.environ.get("REPLAY_LATENCY", "0")  # seconds per request, or "recorded"
+REPLAY_ERRORS = os.environ.get("REPLAY_ERRORS")  # e.g. "429=0.05,5xx=0.02,timeout=0.01,connect=0.01"
+REPLAY_SEED = os.environ.get("REPLAY_SEED")
+
+# One pooled keep-alive session per host, shared by the fetch and post paths
+TRANSPORT_SETTINGS = dict(
+    pool_size=int(os.environ.get("HTTP_POOL_SIZE", 10)),
+    timeout=(float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5)), float(os.environ.get("HTTP_READ_TIMEOUT", 30))),
+    retries=int(os.environ.get("HTTP_RETRIES", 3)),
+    backoff=float(os.environ.get("HTTP_BACKOFF", 0.5)),
+    verify=os.environ.get("TLS_CA_BUNDLE") or True,
+    metrics=METRICS,
+)
+# replay (and Transport, on its first request) pull in requests, which takes
+# longer to import than everything else here, so they're loaded when needed
+if HTTP_REPLAY_PATH:
+    from replay import ReplayTransport, parse_error_rates
+    TRANSPORT = ReplayTransport(
+        HTTP_REPLAY_PATH,
+        latency=REPLAY_LATENCY if REPLAY_LATENCY == "recorded" else float(REPLAY_LATENCY),
+        errors=parse_error_rates(REPLAY_ERRORS),
+        seed=int(REPLAY_SEED) if REPLAY_SEED else None,
+        **TRANSPORT_SETTINGS,
+    )
+elif HTTP_RECORD_PATH:
+    from replay import RecordingTransport
+    TRANSPORT = RecordingTransport(HTTP_RECORD_PATH, **TRANSPORT_SETTINGS)
+else:
+    TRANSPORT = Transport(**TRANSPORT_SETTINGS)
+
+# Cache of RapidAPI pages so repeat fetches within the TTL don't spend quota
+HTTP_CACHE = HTTPCache(
+    path=os.environ.get("HTTP_CACHE_PATH", "http_cache.db") or None,
+    ttl=float(os.environ.get("HTTP_CACHE_TTL", 6 * 60 * 60)),
+    max_entries=int(os.environ.get("HTTP_CACHE_MAX_ENTRIES", 512)),
+)
+
+def post_to_subgroup(text: str, subgroup_id: str, source_guid: str = None):
+    """
+    Post a message directly to a subgroup using the GroupMe API. Returns True on success.
+    Pass the same source_guid when retrying a message so GroupMe can drop the duplicate.
+    """
+    if DRY_RUN:
+        print(f"[dry run] {len(text)} chars to subgroup {subgroup_id}: {text.splitlines()[0] if text else ''}")
+        return True
     
-    return f"{start_date.strftime('%m/%d')} - {today.strftime('%m/%d')}"
-
-def chunk_jobs(jobs, chunk_size=10):
-    """Split jobs into chunks of specified size"""
-    for i in range(0, len(jobs), chunk_size):
-        yield jobs[i:i + chunk_size]
-
-def post_to_subgroup(text: str, subgroup_id: str):
-    """Post a message directly to a subgroup using the GroupMe API"""
-    if not ACCESS_TOKEN:
-        print("Error: ACCESS_TOKEN must be set in .env file")
-        return
+    # A tenant's subgroups post with its own token
+    token_env = TOKEN_ENVS.get(subgroup_id)
+    token = os.environ.get(token_env) if token_env else ACCESS_TOKEN
+    if not token:
+        print(f"Error: {token_env or 'ACCESS_TOKEN'} must be set in .env file")
+        return False
     
     # Use the direct messages API for subgroups
-    subgroup_api_url = f"https://api.groupme.com/v3/groups/{subgroup_id}/messages"
+    subgroup_api_url = f"{GROUPME_API_BASE}/groups/{subgroup_id}/messages"
     
-    # Generate a unique source_guid for each message to avoid conflicts
-    unique_guid = str(uuid.uuid4())
+    # Generate a unique source_guid for each new message to avoid conflicts
+    unique_guid = source_guid or str(uuid.uuid4())
     
     payload = {
         "message": {
@@ -54,31 +145,25 @@ def post_to_subgroup(text: str, subgroup_id: str):
         }
     }
     
-    payload_json = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        f"{subgroup_api_url}?token={ACCESS_TOKEN}",
-        data=payload_json,
-        headers={"Content-Type": "application/json"}
-    )
-    
-    # Create SSL context to handle certificate verification issues
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    
     try:
-        with urllib.request.urlopen(req, context=ssl_context) as resp:
-            if resp.status == 201:
-                print(f"Message posted successfully to subgroup {subgroup_id}!")
-            else:
-                print(f"Subgroup post error: {resp.status} - {resp.read().decode()}")
+        # Pooled session: reuses the TLS connection to api.groupme.com and verifies certificates
+        resp = TRANSPORT.post(subgroup_api_url, params={"token": token}, json=payload)
+        if resp.status_code == 201:
+            print(f"Message posted successfully to subgroup {subgroup_id}!")
+            return True
+        if resp.status_code == 409:
+            # Same source_guid inside GroupMe's dedup window: an earlier attempt already landed
+            print(f"Message already posted to subgroup {subgroup_id}, skipping duplicate")
+            return True
+        print(f"Subgroup post error: {resp.status_code} - {resp.text}")
     except Exception as e:
         print(f"Error posting to subgroup: {e}")
+    return False
 
 # INTERNSHIP LOGIC
-def get_internship_info():
+def get_internship_info(on_page=None):
 
-    data = get_internships_data()
+    data = get_internships_data(on_page=on_page)
     if not data:
         return "No internship data available at the moment."
     data = classify_data(data)
@@ -86,22 +171,12 @@ def get_internship_info():
     return data
 
 def topic_handler(category: str, data):
-    # Placeholder function to get internship information
-    match category:
-        case "CS/IT":
-            return cs_opportunities(data)
-        case "Engineering":
-            return engineering_opportunities(data)
-        case "Health Sciences":
-            return health_sciences_opportunities(data)
-        case "Social Sciences/Law":
-            return social_sciences_opportunities(data)
-        case "Business":
-            return business_opportunities(data)
-        case "Humanities":
-            return humanities_opportunities(data)
-        case _:
-            return None
+    """Messages for one category of classify_data output; accepts its key or topic name"""
+    spec = get_category(category)
+    if spec is None:
+        return None
+    with METRICS.stage("render"):
+        return render_messages(spec, data.get(spec.key))
 
 # Positive signals (strict)
 CS_TOKENS = [
@@ -129,428 +204,659 @@ CS_BLOCKLIST = [
     r"networking (?:event|mixer)",  # social networking, not networks
 ]
 
-# Helper to compile with word boundaries
-def wb(patterns):
-    return [re.compile(rf"\b{p}\b", re.I) for p in patterns]
-
-CS_ALLOWED = wb(CS_TOKENS)
-CS_BLOCK   = wb(CS_BLOCKLIST)
-
-
+# Pattern sources, matched case-insensitively
 FILTERS = {
-    "CS/IT": re.compile(
+    "CS/IT": (
         r"(software|developer|programmer|coder|swe|"
         r"computer|information technology|it support|systems|sysadmin|"
         r"network|cyber|security|infosec|cloud|aws|azure|gcp|"
         r"devops|sre|full[-\s]?stack|backend|frontend|mobile|ios|android|"
         r"data|analytics|machine learning|ml|artificial intelligence|ai|"
-        r"nlp|vision|robotics|blockchain|crypto)", re.I),
+        r"nlp|vision|robotics|blockchain|crypto)"),
 
-    "Engineering": re.compile(
+    "Engineering": (
         r"(mechanical|civil|structural|electrical|electronics|embedded|"
         r"biomedical|chemical|materials|aerospace|nuclear|industrial|"
-        r"manufacturing|systems engineering|automotive|energy|petroleum|mining)", re.I),
+        r"manufacturing|systems engineering|automotive|energy|petroleum|mining)"),
 
-    "Business": re.compile(
+    "Business": (
         r"(finance|financial|accounting|audit|tax|assurance|investment|banking|"
         r"consult|advisory|strategy|ops|operations|supply chain|logistics|"
         r"management|human resources|hr|people|talent|marketing|brand|"
         r"advertising|sales|business analyst|product manager|pm|"
-        r"entrepreneurship|economics|e\-?commerce)", re.I),
+        r"entrepreneurship|economics|e\-?commerce)"),
 
-    "Humanities": re.compile(
+    "Humanities": (
         r"(english|literature|writing|editor|publishing|communications|comm|media|"
         r"film|theater|theatre|drama|music|visual arts|fine arts|design|graphic|ux|ui|"
         r"museum|curator|history|philosophy|religion|languages|linguistics|anthropology|"
-        r"cultural studies|gender studies|ethnic studies|art history)", re.I),
+        r"cultural studies|gender studies|ethnic studies|art history)"),
 
-    "Social Sciences / Law": re.compile(
+    "Social Sciences / Law": (
         r"(policy|public policy|government|politics|political science|international relations|"
         r"law|legal|paralegal|justice|criminology|public admin|sociology|psychology|"
-        r"social work|economics|demography|urban studies|education policy)", re.I),
+        r"social work|economics|demography|urban studies|education policy)"),
 
-    "Health Sciences": re.compile(
+    "Health Sciences": (
         r"(lab|laboratory|clinical|pre[-\s]?med|medicine|medical|nursing|pharmacy|pharmacology|"
         r"public health|epidemiology|biostatistics|healthcare|dental|dentistry|veterinary|vet|"
         r"physician assistant|pa|allied health|occupational therapy|ot|physical therapy|pt|"
         r"nutrition|dietetic|kinesiology|neuroscience|immunology|oncology|pathology|"
-        r"biotech|pharma|biopharma|biomedical research)", re.I),
+        r"biotech|pharma|biopharma|biomedical research)"),
 }
 
+# Compiled rule patterns saved between runs, rebuilt whenever the rules above change
+PATTERN_CACHE = PatternCache(
+    ruleset_fingerprint(CS_TOKENS, CS_BLOCKLIST, FILTERS, ScoredClassifier.SUFFIXES),
+    path=os.environ.get("PATTERN_CACHE_PATH", "pattern_cache.bin") or None,
+)
+
+# All of the above as one alternation per rule list, compiled on first use
+CLASSIFIER = CompiledClassifier(CS_TOKENS, CS_BLOCKLIST, FILTERS, compile=PATTERN_CACHE.compile)
+
+def parse_category_values(value, setting="score threshold"):
+    """Per-category numbers (score thresholds, post intervals) from "CS/IT=4,Social Sciences/Law=1.5" """
+    values = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        name, _, number = item.rpartition("=")
+        category = get_category(name)
+        if category is None:
+            print(f"Ignoring {setting} for unknown category {name!r}")
+            continue
+        values[category.key] = float(number)
+    return values
+
+# CLASSIFY SETTINGS
+# "first": one category per job, first match wins (classify_job)
+# "scored": every category scoring over its threshold, so a job can go to several subgroups
+CLASSIFY_MODE = os.environ.get("CLASSIFY_MODE", "first")
+SCORER = ScoredClassifier(
+    CLASSIFIER,
+    thresholds=parse_category_values(os.environ.get("SCORE_THRESHOLDS")),
+    default_threshold=float(os.environ.get("SCORE_THRESHOLD", 3.0)),
+    title_weight=float(os.environ.get("SCORE_TITLE_WEIGHT", 3.0)),
+    max_labels=int(os.environ.get("SCORE_MAX_LABELS", 3)) or None,
+    relative_cutoff=float(os.environ.get("SCORE_RELATIVE_CUTOFF", 0.5)),
+)
+
+# Labels for text we've classified before, dropped automatically when the rules above change
+LABEL_CACHE = LabelCache(
+    ruleset_fingerprint(CLASSIFY_MODE, (SCORER if CLASSIFY_MODE == "scored" else CLASSIFIER).ruleset),
+    path=os.environ.get("LABEL_CACHE_PATH", "label_cache.db") or None,
+    max_entries=int(os.environ.get("LABEL_CACHE_MAX_ENTRIES", 10000)),
+)
+
+# What the stored labels depend on. After an edit, reclassify_stored() relabels just the jobs it could move.
+RULESET = ruleset(CS_TOKENS, CS_BLOCKLIST, FILTERS, settings=ruleset_fingerprint(
+    CLASSIFY_MODE, SCORER.settings if CLASSIFY_MODE == "scored" else None).hex())
+
+def classify_uncached(jobs):
+    """Category list for each job, straight from the classifier"""
+    if CLASSIFY_MODE == "scored":
+        labels = SCORER.classify_batch(jobs)
+        PATTERN_CACHE.save()
+        return [[field for field, _ in ranked] for ranked in labels]
+    
+    # First-match mode runs column-wise over the whole batch
+    table = JobTable.from_jobs(jobs)
+    CLASSIFIER.classify_table(table)
+    labels = CLASSIFIER.labels
+    PATTERN_CACHE.save()
+    return [[labels[label_id]] if labels[label_id] != "Other" else [] for label_id in table.category]
+
+def classify_jobs(jobs):
+    """
+    Category list for each job: just the first match, or ranked labels in
+    scored mode. Text classified before is served from LABEL_CACHE.
+    """
+    with METRICS.stage("classify"):
+        keys = [content_hash(job) for job in jobs]
+        labels = LABEL_CACHE.get_many(keys)
+        missing = [i for i, found in enumerate(labels) if found is None]
+        if missing:
+            fresh = classify_uncached([jobs[i] for i in missing])
+            LABEL_CACHE.put_many(zip([keys[i] for i in missing], fresh))
+            for i, fields in zip(missing, fresh):
+                labels[i] = fields
+    
+    per_category = Counter(field for fields in labels for field in (fields or ["Other"]))
+    for category, count in per_category.items():
+        METRICS.inc("jobs_classified_total", count, category=category)
+    return [list(fields) for fields in labels]
+
 def classify_data(jobs):
-    classified_jobs = {
-        "CS/IT": [],
-        "Engineering": [],
-        "Business": [],
-        "Humanities": [],
-        "Social Sciences / Law": [],
-        "Health Sciences": [],
-        # Removed "Other" category - jobs that don't fit will be skipped
-    }
+    # Jobs that don't fit any category ("Other") are skipped
+    classified_jobs = {category.key: [] for category in CATEGORIES}
     
-    for job in jobs:
-        field = classify_job(job)
-        
-        # Skip jobs that don't fit into any specific category
-        if field == "Other":
-            continue
-            
-        company = job.get('organization', 'Unknown Company')  # Changed from 'company' to 'organization'
-        title = job.get('title', 'Unknown Title')
-        broken_link = job.get('url', 'No Link Provided')
-        application_link = extract_fixed_link(broken_link)
-        classified_jobs[field].append((company, title, application_link))
+    for job, fields in zip(jobs, classify_jobs(jobs)):
+        for field in fields:
+            classified_jobs[field].append(job)
     
     return classified_jobs
 
 def classify_job(job):
-    text = f"{job['title']} {job.get('description','')}"
+    text = f"{job.title} {job.description}"
     
-    # Special handling for CS/IT with stricter filtering
-    if FILTERS["CS/IT"].search(text):
-        # Check if any CS_ALLOWED patterns match
-        has_cs_signal = any(pattern.search(text) for pattern in CS_ALLOWED)
-        
-        # Check if any CS_BLOCK patterns match (false positives)
-        has_block_signal = any(pattern.search(text) for pattern in CS_BLOCK)
-        
-        # Only classify as CS/IT if we have positive signals AND no blocking signals
-        if has_cs_signal and not has_block_signal:
-            return "CS/IT"
-        # If it matches the general CS filter but fails the strict check, 
-        # continue to check other categories
-    
-    # Check other categories with existing filters
-    for field, pat in FILTERS.items():
-        if field != "CS/IT" and pat.search(text):  # Skip CS/IT since we handled it above
-            return field
-            
-    return "Other"
+    # CS/IT wins when the broad CS filter and a strict CS token both match and
+    # nothing on the blocklist does; otherwise the first other FILTERS hit wins
+    return CLASSIFIER.classify_text(text)
+
+def parse_page(body):
+    """A RapidAPI page's JSON body as Jobs, descriptions cut to DESCRIPTION_MAX_CHARS"""
+    return jobs_from_json(body, DESCRIPTION_MAX_CHARS)
 
-def extract_fixed_link(broken_link):
+def make_page_fetcher(known=None, parse=parse_page, params=None, limiter=None):
     """
-    Fix LinkedIn job URLs to use clean format with just the job ID.
-    Convert from: https://www.linkedin.com/jobs/view/equipment-engineering-trainee-at-vestas-4302691296
-    To: https://www.linkedin.com/jobs/view/4302691296
+    PageFetcher for one query of the active-jb-7d feed (the first of
+    FETCH_SHARDS unless `params` says otherwise), on the shared transport
+    and cache. Pages come back as Jobs unless `parse` says otherwise.
     """
-    if not broken_link or broken_link == 'No Link Provided':
-        return 'No Link Provided'
-    
-    # Check if it's a LinkedIn job URL
-    if 'linkedin.com/jobs/view/' in broken_link:
-        # Extract the last 10 digits (job ID) from the URL
-        # Use regex to find the job ID at the end of the URL
-        import re
-        job_id_match = re.search(r'(\d{10})$', broken_link)
-        
-        if job_id_match:
-            job_id = job_id_match.group(1)
-            return f"https://www.linkedin.com/jobs/view/{job_id}"
-    
-    # If it's not a LinkedIn URL or we can't extract the ID, return original
-    return broken_link
-
-def get_internships_data():
-    """Fetch internship data from the RapidAPI internships API - get ~300 jobs"""
-    all_internships = []
-    
     headers = {
         "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "internships-api.p.rapidapi.com"
+        "x-rapidapi-host": RAPIDAPI_HOST
     }
     
+    # Keep a few offsets in flight at once; the token bucket paces them to the API quota
+    return PageFetcher(
+        headers,
+        base_url=RAPIDAPI_URL,
+        params=FETCH_SHARDS[0] if params is None else params,
+        concurrency=FETCH_CONCURRENCY,
+        limiter=limiter or TokenBucket(rate=FETCH_RATE),
+        get=TRANSPORT.get,
+        known=known,
+        cache=HTTP_CACHE,
+        metrics=METRICS,
+        parse=parse,
+    )
+
+def make_fetch_planner(known=None, parse=parse_page):
+    """
+    One PageFetcher per FETCH_SHARDS query, all drawing on a single token
+    bucket so together they stay within FETCH_RATE
+    """
+    limiter = TokenBucket(rate=FETCH_RATE)
+    fetchers = [make_page_fetcher(known, parse, params, limiter) for params in FETCH_SHARDS]
+    return FetchPlanner(fetchers, concurrency=FETCH_CONCURRENCY)
+
+def get_internships_data(known=None, on_page=None):
+    """
+    Fetch internship data from the RapidAPI internships API - ~300 jobs per
+    shard, merged and deduped. `known(job)` lets the caller stop paging a
+    shard once a page has nothing new; `on_page(pages done, pages planned)`
+    follows the fetch as it goes.
+    """
+    all_internships = []
+    
     try:
-        # Make 40 requests to get approximately 400 jobs (40 * 10 = 400)
-        for page in range(40):
-            # Add pagination using offset parameter and location filter for United States
-            url = f"https://internships-api.p.rapidapi.com/active-jb-7d?offset={page * 10}&location_filter=United States"
-            
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                internships = response.json()
-                
-                if internships:
-                    all_internships.extend(internships)
-                    print(f"Fetched page {page + 1}/40: {len(internships)} jobs (Total: {len(all_internships)})")
-                else:
-                    print(f"No data returned for page {page + 1}, stopping...")
-                    break
-            else:
-                print(f"Error fetching page {page + 1}: {response.status_code} - {response.text}")
-                break
-            
-            # Add delay between requests to be respectful to the API
-            time.sleep(0.5)  # 500ms delay between requests
+        with METRICS.stage("fetch"):
+            all_internships = make_fetch_planner(known).fetch_all(MAX_PAGES, on_page)
             
         # Remove duplicates based on similarity, not just exact matches
-        unique_jobs = []
-        seen = set()
-        
-        for job in all_internships:
-            # Create a more comprehensive similarity key
-            company = job.get('organization', '').lower().strip()  # Changed from 'company' to 'organization'
-            title = job.get('title', '').lower().strip()
-            
-            # Remove common words that don't add uniqueness
-            title_cleaned = re.sub(r'\b(intern|internship|summer|2024|2025|2026|student|position|role|opportunity)\b', '', title)
-            title_cleaned = re.sub(r'\s+', ' ', title_cleaned).strip()  # Remove extra spaces
-            
-            # Create similarity key with cleaned data
-            job_key = (company, title_cleaned)
-            
-            # Also check for very similar titles at the same company
-            is_duplicate = False
-            for existing_key in seen:
-                existing_company, existing_title = existing_key
-                
-                # Same company check
-                if company == existing_company:
-                    # Check if titles are very similar (using basic similarity)
-                    title_words = set(title_cleaned.split())
-                    existing_words = set(existing_title.split())
-                    
-                    # If they share most words, consider it a duplicate
-                    if title_words and existing_words:
-                        common_words = title_words.intersection(existing_words)
-                        similarity = len(common_words) / max(len(title_words), len(existing_words))
-                        
-                        if similarity > 0.7:  # 70% similarity threshold
-                            is_duplicate = True
-                            break
-            
-            if not is_duplicate and job_key not in seen:
-                seen.add(job_key)
-                unique_jobs.append(job)
+        with METRICS.stage("dedup"):
+            unique_jobs = dedupe_jobs(all_internships)
+        METRICS.inc("jobs_fetched_total", len(all_internships))
+        METRICS.inc("duplicates_removed_total", len(all_internships) - len(unique_jobs))
         
         print(f"Total unique jobs fetched: {len(unique_jobs)} (removed {len(all_internships) - len(unique_jobs)} duplicates)")
+        cache_stats = HTTP_CACHE.stats()
+        print(f"HTTP cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} misses")
         return unique_jobs
     
     except Exception as e:
         print(f"Error fetching internship data: {e}")
         return all_internships  # Return whatever we got before the error
 
-# CS LOGIC
-def cs_opportunities(data):
-    data = data["CS/IT"]
-    if not data:
-        return ["No new CS/IT Related internship opportunities available at the moment."]
-
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
+def iter_internship_pages(known=None):
+    """
+    Streaming version of get_internships_data: yields each page's new unique
+    jobs as soon as the page arrives, each shard in offset order. Only the
+    dedup index lives across pages (and shards), so memory doesn't grow
+    with the page count.
+    """
+    index = DedupIndex()
+    names = [shard_name(params) for params in FETCH_SHARDS]
+    per_shard = [[0, 0] for _ in names]  # fetched, unique
     
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"🖥️ New CS/IT Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"======== ({week_range}) ========\n\n"
-        else:
-            message = "🖥️ New CS/IT Related Internships:\n"
-            message += f"======== ({week_range}) ========\n\n"
-        
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
-        
-        messages.append(message)
+    try:
+        # Only the time spent waiting for the next page counts as fetching
+        for shard, page, jobs in METRICS.timed_iter("fetch", make_fetch_planner(known).iter_pages_in_order(MAX_PAGES)):
+            with METRICS.stage("dedup"):
+                fresh = [job for job in jobs if index.add(job)]
+            per_shard[shard][0] += len(jobs)
+            per_shard[shard][1] += len(fresh)
+            METRICS.inc("jobs_fetched_total", len(jobs))
+            METRICS.inc("duplicates_removed_total", len(jobs) - len(fresh))
+            where = f"{names[shard]} " if len(names) > 1 else ""
+            print(f"Fetched {where}page {page + 1}/{MAX_PAGES}: {len(jobs)} jobs (Total: {per_shard[shard][0]})")
+            yield fresh
+    except Exception as e:
+        print(f"Error fetching internship data: {e}")
     
-    return messages
-
-# ENGINEERING LOGIC
-def engineering_opportunities(data):
-    data = data["Engineering"]
-    if not data:
-        return ["No new Engineering Related internship opportunities available at the moment."]
+    fetched = sum(counts[0] for counts in per_shard)
+    unique = sum(counts[1] for counts in per_shard)
+    print(f"Total unique jobs fetched: {unique} (removed {fetched - unique} duplicates)")
+    if len(names) > 1:
+        for name, (shard_fetched, shard_unique) in zip(names, per_shard):
+            print(f"  {name}: {shard_fetched} jobs, {shard_unique} new")
+
+# Every subgroup we post to, for every tenant. One fetch and classify cycle fans out to all of them.
+SUBGROUPS = load_tenants(TENANTS_PATH) if TENANTS_PATH else default_subgroups()
+TOKEN_ENVS = {subgroup.subgroup_id: subgroup.token_env for subgroup in SUBGROUPS if subgroup.token_env}
+WARNED_UNCONFIGURED = set()  # category keys already warned about this process
+
+def warn_unconfigured():
+    """Before posting, say (once per process) which categories are skipped because their subgroup id isn't set"""
+    if TENANTS_PATH:
+        return
+    for category in unconfigured_categories():
+        if category.key not in WARNED_UNCONFIGURED:
+            WARNED_UNCONFIGURED.add(category.key)
+            print(f"Warning: {category.subgroup_env} is not set, not posting {category.name} jobs")
 
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
+def post_limits():
+    """
+    Token buckets for the subgroups whose tenant sets its own post rate, for
+    PostDispatcher: one per rate_group, so a tenant's subgroups share its limit
+    """
+    buckets = {}
+    limits = {}
+    for subgroup in SUBGROUPS:
+        if subgroup.rate is None and subgroup.burst is None:
+            continue
+        key = subgroup.rate_group or subgroup.subgroup_id
+        if key not in buckets:
+            buckets[key] = TokenBucket(rate=subgroup.rate if subgroup.rate is not None else POST_RATE,
+                                       capacity=subgroup.burst if subgroup.burst is not None else POST_BURST)
+        limits[subgroup.subgroup_id] = buckets[key]
+    return limits
+
+def classify_stored(store):
+    """Classify any stored jobs a previous run saved but didn't get to"""
+    rows = store.unclassified()
+    jobs = [Job.from_record(row) for row in rows]
+    store.set_labels(zip([row['job_id'] for row in rows], classify_jobs(jobs)))
+
+def reclassify_stored(store, full=False):
+    """Relabel the stored jobs the rule edits since the last run could move (every one with `full`) and report it"""
+    report = reclassify(store, RULESET, classify_jobs, full=full)
+    if report:
+        print(format_report(report))
+        METRICS.inc("jobs_reclassified_total", report["checked"])
+        METRICS.inc("jobs_relabelled_total", report["moved"])
+    return report
+
+def queue_new_posts(store, outbox, subgroups=None):
+    """Render every subgroup's (or just `subgroups`') stored but unposted jobs into the outbox"""
+    week_ago = time.time() - 7 * 24 * 60 * 60
     
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"🛠️ New Engineering Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"=========== ({week_range}) ===========\n\n"
-        else:
-            message = "🛠️ New Engineering Related Internships:\n"
-            message += f"=========== ({week_range}) ===========\n\n"
+    for subgroup in subgroups or SUBGROUPS:
+        # In category order: a job queued under one is marked posted, so the next one skips it
+        for category in subgroup.categories:
+            # Only jobs from the current window that this subgroup hasn't been sent yet
+            rows, jobs = [], []
+            for row in store.unposted(category, subgroup.subgroup_id, since=week_ago):
+                job = Job.from_record(row)
+                if subgroup.wants(job):
+                    rows.append(row)
+                    jobs.append(job)
+            if not rows:
+                continue
+            print(f"Queueing {len(rows)} unposted {subgroup.name} jobs")
+            
+            # Each message is handed to the outbox together with the jobs it lists
+            with METRICS.stage("render"):
+                messages = pack_messages(category, jobs)
+            start = 0
+            for message, count in messages:
+                chunk = rows[start:start + count]
+                start += count
+                outbox.enqueue(subgroup.subgroup_id, message, label=subgroup.name, job_ids=[row['job_id'] for row in chunk])
+
+def iter_new_jobs(store):
+    """
+    Fetch, dedup, store and classify one page at a time. Yields each page's
+    jobs that weren't in the store before, as (job_id, Job, categories).
+    """
+    # Only jobs from earlier runs count as known: one shard's jobs stored a moment
+    # ago mustn't stop an overlapping shard from paging on to jobs of its own
+    run_start = time.time()
+    for jobs in iter_internship_pages(known=lambda job: store.has_job(job.key, before=run_start)):
+        keyed = {job.key: job for job in jobs}
+        with METRICS.stage("store"):
+            new_ids = store.upsert_jobs(keyed.items())
         
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
+        # Only jobs we've never seen need classifying, a page at a time
+        labels = list(zip(new_ids, classify_jobs([keyed[job_id] for job_id in new_ids])))
+        with METRICS.stage("store"):
+            store.set_labels(labels)
+        yield [(job_id, keyed[job_id], fields) for job_id, fields in labels]
+
+def stream_new_posts(store, outbox, dispatcher):
+    """
+    Fetch, dedup, store, classify, render and post one page at a time. A
+    subgroup's first message is queued as soon as it has a full chunk, while
+    later pages are still being fetched. Each job only visits the subgroups
+    that take one of its labels, so the work here grows with what gets
+    posted rather than with the number of tenants. A subgroup with an older
+    message still backing off in the outbox only gets its new ones written
+    there, to follow it in order on a later run.
+    """
+    streams = [MessageStream() for _ in SUBGROUPS]
+    interested = {}  # category key -> indexes of the SUBGROUPS that take it
+    for index, subgroup in enumerate(SUBGROUPS):
+        for category in subgroup.categories:
+            interested.setdefault(category, []).append(index)
+    
+    held = outbox.backing_off()
+    for subgroup in SUBGROUPS:
+        if subgroup.subgroup_id in held:
+            print(f"{subgroup.name} has a message backing off, new ones wait behind it in the outbox")
+    
+    def send(subgroup, text, job_ids):
+        source_guid = outbox.enqueue(subgroup.subgroup_id, text, label=subgroup.name, job_ids=job_ids)
+        if subgroup.subgroup_id not in held:
+            dispatcher.enqueue(subgroup.subgroup_id, text, label=subgroup.name, source_guid=source_guid)
+    
+    new_jobs = 0
+    for page in iter_new_jobs(store):
+        new_jobs += len(page)
+        with METRICS.stage("render"):
+            for job_id, job, fields in page:
+                for index in sorted({index for category in fields for index in interested.get(category, ())}):
+                    category = SUBGROUPS[index].file_under(job, fields)
+                    if category is None:
+                        continue
+                    for _, text, job_ids in streams[index].add(category, job, job_id):
+                        send(SUBGROUPS[index], text, job_ids)
         
-        messages.append(message)
+        for result in dispatcher.poll_results():
+            outbox.record(result)
     
-    return messages
-
-# HEALTH SCIENCES LOGIC
-def health_sciences_opportunities(data):
-    data = data["Health Sciences"]
-    if not data:
-        return ["No new Health Sciences/Med Related internship opportunities available at the moment."]
+    with METRICS.stage("render"):
+        for subgroup, stream in zip(SUBGROUPS, streams):
+            for _, text, job_ids in stream.flush():
+                send(subgroup, text, job_ids)
+    METRICS.inc("jobs_new_total", new_jobs)
+    print(f"{new_jobs} new jobs since the last run")
 
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
-    
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"🩺 New Health Sciences/Med Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"============ ({week_range}) ============\n\n"
-        else:
-            message = "🩺 New Health Sciences/Med Related Internships:\n"
-            message += f"============ ({week_range}) ============\n\n"
+def post_last_week_internships():
+    warn_unconfigured()
+    with JobStore(JOB_STORE_PATH) as store:
+        outbox = Outbox(store=store, max_attempts=OUTBOX_MAX_ATTEMPTS)
+        dispatcher = PostDispatcher(post_to_subgroup, rate=POST_RATE, burst=POST_BURST, limits=post_limits(),
+                                    max_attempts=POST_MAX_ATTEMPTS, halt_on_failure=True, metrics=METRICS)
         
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
+        # Anything a previous run left behind goes out first, labelled by the current rules...
+        reclassify_stored(store)
+        classify_stored(store)
+        queue_new_posts(store, outbox)
+        outbox.submit_due(dispatcher)
         
-        messages.append(message)
+        # ...then new jobs stream straight from the fetch into the subgroup queues
+        stream_new_posts(store, outbox, dispatcher)
+        
+        # Whatever the workers haven't finished by now is time spent waiting on GroupMe
+        drain_posts(outbox, dispatcher)
+    label_stats = LABEL_CACHE.stats()
+    print(f"Label cache: {label_stats['hits'] + label_stats['disk_hits']} hits, {label_stats['misses']} misses")
+    write_metrics()
+
+def drain_posts(outbox, dispatcher):
+    """Wait for every queued post, record the outcomes in the outbox and report its counts"""
+    for result in METRICS.timed_iter("post", dispatcher.iter_results()):
+        outbox.record(result)
+        if not result.ok and result.attempts:
+            print(f"Failed to post {result.label} message {result.index + 1}/{result.total}, will retry next run")
+    outbox_counts = outbox.counts()
+    print(f"Outbox: {outbox_counts}")
+    for status, count in outbox_counts.items():
+        METRICS.set("outbox_messages", count, status=status)
+
+def fetch_new_jobs(store):
+    """Daemon fetch cycle: store and classify new jobs, leaving posting to each subgroup's schedule"""
+    classify_stored(store)
+    new_jobs = sum(len(page) for page in iter_new_jobs(store))
+    METRICS.inc("jobs_new_total", new_jobs)
+    print(f"{new_jobs} new jobs since the last fetch")
+
+def post_subgroup(store, outbox, dispatcher, subgroup):
+    """Daemon post cycle for one SUBGROUPS entry: render its unposted jobs, then send whatever it has due"""
+    queue_new_posts(store, outbox, [subgroup])
+    outbox.submit_due(dispatcher, subgroup.subgroup_id)
+    drain_posts(outbox, dispatcher)
+
+def run_daemon(scheduler=None, until=None):
+    """
+    Stay resident: fetch every FETCH_INTERVAL seconds and post to each
+    subgroup on its own schedule (its tenant's post_interval, its first
+    category's POST_SCHEDULE entry, or POST_INTERVAL), all with
+    SCHEDULE_JITTER. The compiled classifier, HTTP
+    connection pools, caches and job store stay warm between cycles; the
+    HTTP cache TTL is capped below FETCH_INTERVAL so each fetch sees new pages.
     
-    return messages
-
-# SOCIAL SCIENCES/LAW LOGIC
-def social_sciences_opportunities(data):
-    data = data["Social Sciences / Law"]
-    if not data:
-        return ["No new Social Sciences/Law Related internship opportunities available at the moment."]
-
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
+    With METRICS_PORT, /health answers 200 with the scheduler's state, or
+    503 while stopping or when a cycle is overdue. After scheduler.stop()
+    (SIGTERM/SIGINT from main) the cycle in progress finishes, anything due
+    in the outbox is posted, and the metrics are written.
+    """
+    warn_unconfigured()
+    scheduler = scheduler or Scheduler()
+    intervals = parse_category_values(POST_SCHEDULE, "post interval")
+    server = None
+    if METRICS_PORT:
+        server = METRICS.serve(METRICS_PORT, routes={"/health": lambda: health(scheduler)})
     
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"⚖️ New Social Sciences/Law Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"============ ({week_range}) ============\n\n"
-        else:
-            message = "⚖️ New Social Sciences/Law Related Internships:\n"
-            message += f"============ ({week_range}) ============\n\n"
+    def cycle(fn, *args):
+        def run():
+            try:
+                fn(*args)
+            finally:
+                write_metrics()
+        return run
+    
+    with JobStore(JOB_STORE_PATH) as store:
+        outbox = Outbox(store=store, max_attempts=OUTBOX_MAX_ATTEMPTS)
+        dispatcher = PostDispatcher(post_to_subgroup, rate=POST_RATE, burst=POST_BURST, limits=post_limits(),
+                                    max_attempts=POST_MAX_ATTEMPTS, halt_on_failure=True, metrics=METRICS)
+        
+        reclassify_stored(store)
         
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
+        # A page cached by one fetch cycle has to be stale by the next (even one that comes early by the
+        # jitter), or the daemon would keep re-reading it instead of picking up new postings
+        HTTP_CACHE.ttl = min(HTTP_CACHE.ttl, FETCH_INTERVAL * (1 - SCHEDULE_JITTER) / 2)
         
-        messages.append(message)
+        # Fetch first, so the first round of posts has this cycle's jobs
+        scheduler.every("fetch", FETCH_INTERVAL, cycle(fetch_new_jobs, store), jitter=SCHEDULE_JITTER)
+        for subgroup in SUBGROUPS:
+            interval = subgroup.interval or intervals.get(subgroup.categories[0], POST_INTERVAL)
+            scheduler.every(f"post {subgroup.name}", interval,
+                            cycle(post_subgroup, store, outbox, dispatcher, subgroup), jitter=SCHEDULE_JITTER)
+        print(f"Daemon started: fetching every {FETCH_INTERVAL:.0f}s, "
+              + ", ".join(f"{task.name} every {task.interval:.0f}s" for task in scheduler.tasks[1:]))
+        scheduler.run(until)
+        
+        print("Shutting down: posting whatever is still due in the outbox")
+        outbox.submit_due(dispatcher)
+        drain_posts(outbox, dispatcher)
+    write_metrics()
+    if server:
+        server.shutdown()
+    return scheduler
+
+def health(scheduler):
+    status = scheduler.status()
+    return (200 if status["ok"] else 503), status
+
+def write_metrics():
+    """Add cache stats to METRICS and write the run report (and Prometheus file, if configured)"""
+    for prefix, stats in (("http_cache", HTTP_CACHE.stats()), ("label_cache", LABEL_CACHE.stats())):
+        for name, value in stats.items():
+            METRICS.set(f"{prefix}_{name}", value)
     
-    return messages
-
-# BUSINESS LOGIC
-def business_opportunities(data):
-    data = data["Business"]
-    if not data:
-        return ["No new Business Related internship opportunities available at the moment."]
+    report = METRICS.report()
+    stages = ", ".join(f"{name} {stage['seconds']:.2f}s" for name, stage in report["stages"].items())
+    print(f"Run took {report['duration_s']:.2f}s ({stages})")
+    
+    for path, write in ((METRICS_REPORT_PATH, METRICS.write_report), (METRICS_PROM_PATH, METRICS.write_prometheus)):
+        if not path:
+            continue
+        try:
+            write(path)
+        except OSError as e:
+            print(f"Couldn't write metrics to {path}: {e}")
 
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
+def post_all_internships(data=None, subgroups=None, on_result=None):
+    """
+    The batch flow: fetch and classify everything (or take `data`, already
+    classify_data output), store it, then render every subgroup's (or just
+    `subgroups`') unposted jobs into the outbox and post them. The dashboard
+    posts this way too, so what it posts is marked posted for the scheduled
+    runs and survives a crash. on_result(result) follows each post as it
+    lands. Returns the PostResults.
+    """
+    warn_unconfigured()
+    fetched = data is None
+    if fetched:
+        data = get_internship_info()
+        if not isinstance(data, dict):
+            print(data)
+            return []
     
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"💼 New Business Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"========= ({week_range}) =========\n\n"
-        else:
-            message = "💼 New Business Related Internships:\n"
-            message += f"========= ({week_range}) =========\n\n"
-        
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
+    jobs, labels = {}, {}
+    for category, category_jobs in data.items():
+        for job in category_jobs:
+            jobs[job.key] = job
+            labels.setdefault(job.key, []).append(category)
+    
+    results = []
+    with JobStore(JOB_STORE_PATH) as store:
+        outbox = Outbox(store=store, max_attempts=OUTBOX_MAX_ATTEMPTS)
+        dispatcher = PostDispatcher(post_to_subgroup, rate=POST_RATE, burst=POST_BURST, limits=post_limits(),
+                                    max_attempts=POST_MAX_ATTEMPTS, halt_on_failure=True, metrics=METRICS)
+        # Jobs a scheduled run already stored keep the labels it gave them
+        new_ids = set(store.upsert_jobs(jobs.items()))
+        store.set_labels((job_id, categories) for job_id, categories in labels.items() if job_id in new_ids)
         
-        messages.append(message)
+        subgroups = SUBGROUPS if subgroups is None else subgroups
+        queue_new_posts(store, outbox, subgroups)
+        for subgroup in subgroups:
+            outbox.submit_due(dispatcher, subgroup.subgroup_id)
+        for result in METRICS.timed_iter("post", dispatcher.iter_results()):
+            outbox.record(result)
+            if not result.ok and result.attempts:
+                print(f"Failed to post {result.label} message {result.index + 1}/{result.total}, will retry next run")
+            if on_result:
+                on_result(result)
+            results.append(result)
+    if fetched:
+        write_metrics()
+    return results
+
+def record_fixtures(path):
+    """Fetch the feed once (raw pages, before dedup) and save it for --profile"""
+    from profiling import save_fixture
+    jobs = make_fetch_planner(parse=None).fetch_all(MAX_PAGES)
+    save_fixture(path, jobs)
+    print(f"Saved {len(jobs)} jobs to {path}")
+
+def profile_run(fixtures, out_dir="profile", mode="sample", pipeline="stream"):
+    """
+    Run the whole bot against recorded jobs and profile each stage.
     
-    return messages
-
-# HUMANITIES LOGIC
-def humanities_opportunities(data):
-    data = data["Humanities"]
-    if not data:
-        return ["No new Humanities Related internship opportunities available at the moment."]
-
-    # Split jobs into chunks of 10
-    job_chunks = list(chunk_jobs(data, 10))
-    messages = []
-    week_range = get_week_date_range()
+    Fetches are answered from the fixture file, posts are dry-run, and the
+    job store and caches start empty in memory or a temp dir, so every run
+    does the same work and nothing real is touched. Rate limits are lifted
+    since there's no quota to protect. Profiles, tracemalloc diffs and the
+    metrics report go to out_dir.
+    """
+    global TRANSPORT, HTTP_CACHE, LABEL_CACHE, JOB_STORE_PATH, DRY_RUN, MAX_PAGES
+    global FETCH_RATE, POST_RATE, POST_BURST, METRICS_REPORT_PATH, METRICS_PROM_PATH, SUBGROUPS, FETCH_SHARDS
+    from profiling import FixtureAPI, StageProfiler, load_fixture
     
-    for chunk_num, chunk in enumerate(job_chunks, 1):
-        if len(job_chunks) > 1:
-            message = f"🎨 New Humanities Related Internships (Part {chunk_num}/{len(job_chunks)}):\n"
-            message += f"========== ({week_range}) ==========\n\n"
+    jobs = load_fixture(fixtures)
+    TRANSPORT = FixtureAPI(jobs)
+    HTTP_CACHE = HTTPCache(path=None)
+    LABEL_CACHE = LabelCache(LABEL_CACHE.fingerprint)
+    PATTERN_CACHE.path = None  # compile the rules from scratch, leaving the snapshot alone
+    JOB_STORE_PATH = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    DRY_RUN = True
+    MAX_PAGES = -(-len(jobs) // PAGE_SIZE) + 1
+    FETCH_SHARDS = FETCH_SHARDS[:1]  # the fixture already holds every shard's jobs, merged
+    FETCH_RATE = POST_RATE = POST_BURST = 1_000_000
+    METRICS_REPORT_PATH = os.path.join(out_dir, "metrics.json")
+    METRICS_PROM_PATH = ""
+    # Subgroup ids only label the dry-run output, so they needn't be configured
+    if not TENANTS_PATH:
+        SUBGROUPS = default_subgroups(placeholder="dry-run-{}")
+    
+    profiler = StageProfiler(out_dir, mode=mode)
+    METRICS.reset()
+    METRICS.listeners.append(profiler)
+    profiler.start()
+    try:
+        if pipeline == "batch":
+            post_all_internships()
         else:
-            message = "🎨 New Humanities Related Internships:\n"
-            message += f"========== ({week_range}) ==========\n\n"
+            post_last_week_internships()
+    finally:
+        METRICS.listeners.remove(profiler)
+        summary = profiler.stop(METRICS.report())
+    
+    print(f"\nProfiled {len(jobs)} fixture jobs ({pipeline}, {mode}) in {summary['seconds']:.2f}s")
+    for name, stage in summary["stages"].items():
+        memory = summary["memory"].get(name, {})
+        print(f"  {name:<10} {stage['seconds']:8.3f}s  {stage['calls']:>5} calls  peak {memory.get('peak_bytes', 0) / 2**20:7.2f} MiB")
+    for path in summary["files"]:
+        print(f"Wrote {path}")
+
+def main(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Post the last week's internships to the GroupMe subgroups")
+    parser.add_argument("--profile", metavar="FIXTURES",
+                        help="profile a dry run against recorded jobs (.json or .json.gz) instead of the live APIs")
+    parser.add_argument("--profiler", choices=("sample", "cprofile"), default="sample",
+                        help="sampling profiler with folded stacks for flame graphs, or per-stage cProfile")
+    parser.add_argument("--profile-out", default="profile", help="directory for profiling output")
+    parser.add_argument("--pipeline", choices=("stream", "batch"), default="stream",
+                        help="profile the scheduled streaming run or the dashboard's batch flow")
+    parser.add_argument("--record-fixtures", metavar="PATH", help="fetch the live feed once and save it for --profile")
+    parser.add_argument("--reclassify", action="store_true",
+                        help="after editing CS_TOKENS, CS_BLOCKLIST or FILTERS, relabel the stored jobs the edit could move, report the moves and exit")
+    parser.add_argument("--reclassify-all", action="store_true", help="like --reclassify, but relabel every stored job")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay running and fetch/post on the FETCH_INTERVAL/POST_SCHEDULE cadence instead of once")
+    args = parser.parse_args(argv)
+    
+    if args.record_fixtures:
+        record_fixtures(args.record_fixtures)
+        return
+    if args.reclassify or args.reclassify_all:
+        with JobStore(JOB_STORE_PATH) as store:
+            if not reclassify_stored(store, full=args.reclassify_all):
+                print("Stored labels already match the current rules")
+        return
+    if args.profile:
+        profile_run(args.profile, args.profile_out, args.profiler, args.pipeline)
+        return
+    if args.daemon:
+        scheduler = Scheduler()
         
-        start_num = (chunk_num - 1) * 10 + 1
-        for i, job in enumerate(chunk, start_num):
-            company, job_title, application_link = job
-            message += f"{i}. {company}\n"
-            message += f"   Position: {job_title}\n"
-            message += f"   Apply: {application_link}\n\n"
+        def stop(signum, frame):
+            if scheduler.stop_event.is_set():
+                raise KeyboardInterrupt  # second signal: don't wait any longer
+            print("Stopping after the current cycle (signal again to quit now)")
+            scheduler.stop()
         
-        messages.append(message)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, stop)
+        run_daemon(scheduler)
+        return
     
-    return messages
-
-def post_last_week_internships():
-    data = get_internship_info()
-    if not data:
-        print("No internship data available at the moment.")
-        exit(0)
-    
-    # CS/IT Opportunities
-    cs_messages = topic_handler("CS/IT", data)
-    for message in cs_messages:
-        post_to_subgroup(message, CS_ID)
-        time.sleep(1)
-
-    # Engineering Opportunities
-    eng_messages = topic_handler("Engineering", data)
-    for message in eng_messages:
-        post_to_subgroup(message, ENGINEERING_ID)
-        time.sleep(1)
-
-    # Health Sciences Opportunities
-    health_messages = topic_handler("Health Sciences", data)
-    for message in health_messages:
-        post_to_subgroup(message, MED_ID)
-        time.sleep(1)
-
-    # Social Sciences/Law Opportunities
-    social_messages = topic_handler("Social Sciences/Law", data)
-    for message in social_messages:
-        post_to_subgroup(message, LAW_ID)
-        time.sleep(1)
-
-    # Business Opportunities
-    business_messages = topic_handler("Business", data)
-    for message in business_messages:
-        post_to_subgroup(message, BUSINESS_ID)
-        time.sleep(1)
-
-    # Humanities Opportunties
-    humanities_messages = topic_handler("Humanities", data)
-    for message in humanities_messages:
-        post_to_subgroup(message, HUMANITIES_ID)
-        time.sleep(1)
+    if METRICS_PORT:
+        METRICS.serve(METRICS_PORT)
+    post_last_week_internships()
 
 if __name__ == "__main__":
-    post_last_week_internships()
+    main()
@@ -0,0 +1,207 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    stored_at     REAL NOT NULL,
+    last_used     REAL NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+class CachedResponse:
+    """Just enough of requests.Response for the fetch code"""
+
+    from_cache = True
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _Entry:
+    __slots__ = ("stored_at", "status", "headers", "body")
+
+    def __init__(self, stored_at, status, headers, body):
+        self.stored_at = stored_at
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def response(self):
+        return CachedResponse(self.status, self.headers, self.body)
+
+
+def cache_key(url, params=None):
+    """URL plus query params in a stable order. Auth headers are deliberately left out."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class HTTPCache:
+    """
+    GET response cache: an in-memory LRU in front of an optional SQLite file.
+
+    Entries younger than `ttl` seconds are served without touching the
+    network. Older entries that carried an ETag or Last-Modified are
+    revalidated with a conditional request, and a 304 refreshes them.
+    Both tiers are capped at `max_entries`, evicting the least recently used.
+    The SQLite file isn't opened (or created) until the cache is first used.
+    """
+
+    def __init__(self, path=None, ttl=6 * 60 * 60, max_entries=512, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.conn = None
+
+    # Storage
+
+    def _connection(self):
+        """The SQLite file (None without a path), opened on first use so importing the bot creates no files"""
+        if self.conn is None and self.path:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+        return self.conn
+
+    def _load(self, key):
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            return entry
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT stored_at, status, headers, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = _Entry(row[0], row[1], json.loads(row[2]), row[3])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _store(self, key, entry):
+        self._remember(key, entry)
+        conn = self._connection()
+        if conn is None:
+            return
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, last_used, status, headers, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.stored_at, entry.stored_at, entry.status, json.dumps(entry.headers), entry.body),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def _touch(self, key, stored_at=None):
+        conn = self._connection()
+        if conn is None:
+            return
+        with conn:
+            if stored_at is None:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (self.clock(), key))
+            else:
+                conn.execute("UPDATE responses SET last_used = ?, stored_at = ? WHERE key = ?",
+                                  (self.clock(), stored_at, key))
+
+    # Lookups
+
+    def fresh(self, url, params=None):
+        """Return a cached response younger than the TTL, or None"""
+        key = cache_key(url, params)
+        with self.lock:
+            entry = self._load(key)
+            if entry is None or self.clock() - entry.stored_at >= self.ttl:
+                return None
+            self.hits += 1
+            self._touch(key)
+            return entry.response()
+
+    def fetch(self, get, url, headers=None, params=None, **kwargs):
+        """
+        GET through the cache. Stale entries are revalidated when the server
+        gave us validators; otherwise it's a plain request. Only 200s are stored.
+        """
+        key = cache_key(url, params)
+        fresh = self.fresh(url, params)
+        if fresh is not None:
+            return fresh
+
+        with self.lock:
+            entry = self._load(key)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.headers.get("etag"):
+                request_headers["If-None-Match"] = entry.headers["etag"]
+            if entry.headers.get("last-modified"):
+                request_headers["If-Modified-Since"] = entry.headers["last-modified"]
+
+        response = get(url, headers=request_headers, params=params, **kwargs)
+
+        with self.lock:
+            if response.status_code == 304 and entry is not None:
+                self.revalidated += 1
+                entry.stored_at = self.clock()
+                self._remember(key, entry)
+                self._touch(key, entry.stored_at)
+                return entry.response()
+
+            self.misses += 1
+            if response.status_code == 200:
+                stored_headers = {k.lower(): v for k, v in response.headers.items()}
+                self._store(key, _Entry(self.clock(), 200, stored_headers, response.content))
+        return response
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+                "requests_saved": self.hits,
+                "entries": len(self.memory),
+            }
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM responses")
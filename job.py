@@ -0,0 +1,158 @@
+import io
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+
+from dedup import job_key
+
+try:
+    # Optional: ijson's C backend parses a page event by event and never
+    # builds the fields we'd throw away, for a lower peak than the fallback
+    # below at some extra CPU. Its pure-Python backends are far slower, so
+    # they aren't used.
+    import ijson
+    ijson = ijson.get_backend("yajl2_c")
+except ImportError:
+    ijson = None
+
+LINKEDIN_JOB_ID = re.compile(r'(\d{10})$')
+
+# ijson prefix -> the record field a Job keeps
+ITEM_FIELDS = {f"item.{name}": name for name in ("title", "organization", "url", "description")}
+
+# Whitespace and commas between the records of a JSON array
+SEPARATORS = re.compile(r'[\s,]*')
+DECODER = json.JSONDecoder()
+
+
+def extract_job_id(broken_link):
+    """Return the 10-digit LinkedIn job ID at the end of a /jobs/view/ URL, or None"""
+    if not broken_link or 'linkedin.com/jobs/view/' not in broken_link:
+        return None
+    job_id_match = LINKEDIN_JOB_ID.search(broken_link)
+    return job_id_match.group(1) if job_id_match else None
+
+
+def extract_fixed_link(broken_link):
+    """
+    Fix LinkedIn job URLs to use clean format with just the job ID.
+    Convert from: https://www.linkedin.com/jobs/view/equipment-engineering-trainee-at-vestas-4302691296
+    To: https://www.linkedin.com/jobs/view/4302691296
+    """
+    if not broken_link or broken_link == 'No Link Provided':
+        return 'No Link Provided'
+
+    # Check if it's a LinkedIn job URL and pull the job ID off the end
+    job_id = extract_job_id(broken_link)
+    if job_id:
+        return f"https://www.linkedin.com/jobs/view/{job_id}"
+
+    # If it's not a LinkedIn URL or we can't extract the ID, return original
+    return broken_link
+
+
+@dataclass(slots=True)
+class Job:
+    """
+    One internship posting, with only the fields the bot reads.
+
+    A RapidAPI record carries every field the API has; a Job keeps title,
+    organization, url and description (missing values become ""), plus
+    two things every consumer used to work out again for itself: the
+    (organization, cleaned title) key dedup compares, and the LinkedIn job
+    id at the end of the URL.
+    """
+    title: str = ""
+    organization: str = ""
+    url: str = ""
+    description: str = ""
+    linkedin_id: str = field(init=False, default=None, repr=False)
+    dedup_key: tuple = field(init=False, default=("", ""), repr=False)
+
+    def __post_init__(self):
+        self.linkedin_id = extract_job_id(self.url)
+        self.dedup_key = job_key(self.organization, self.title)
+
+    @classmethod
+    def from_record(cls, record, description_chars=None):
+        """A Job from a RapidAPI record or a JobStore row, optionally cutting the description short"""
+        description = record.get('description') or ""
+        if description_chars and len(description) > description_chars:
+            description = description[:description_chars]
+        return cls(
+            record.get('title') or "",
+            # The same few hundred companies repeat across pages; share one string each
+            sys.intern(record.get('organization') or ""),
+            record.get('url') or "",
+            description,
+        )
+
+    @property
+    def key(self):
+        """JobStore key: the LinkedIn ID, falling back to the URL or company + title"""
+        return self.linkedin_id or self.url or f"{self.organization}|{self.title}"
+
+    @property
+    def company(self):
+        return self.organization or "Unknown Company"
+
+    @property
+    def position(self):
+        return self.title or "Unknown Title"
+
+    @property
+    def link(self):
+        """Clean /jobs/view/<id> link for messages"""
+        if self.linkedin_id:
+            return f"https://www.linkedin.com/jobs/view/{self.linkedin_id}"
+        return self.url or "No Link Provided"
+
+
+def jobs_from_records(records, description_chars=None):
+    """Parse a page of RapidAPI records into Jobs"""
+    return [Job.from_record(record, description_chars) for record in records]
+
+
+def jobs_from_json(body, description_chars=None, use_ijson=True):
+    """
+    Parse a RapidAPI page (the raw JSON body, bytes or str) into Jobs one
+    record at a time, so the whole page never exists as Python dicts.
+    Anything but a JSON array (an error object, null) gives no jobs.
+    """
+    records = _ijson_records(body) if ijson and use_ijson else _decoded_records(body)
+    return [Job.from_record(record, description_chars) for record in records]
+
+
+def _ijson_records(body):
+    """Just the Job fields of each record, straight from the parser's events"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    record = None
+    for prefix, event, value in ijson.parse(io.BytesIO(body)):
+        name = ITEM_FIELDS.get(prefix)
+        if name is not None:
+            if event == "string" and record is not None:
+                record[name] = value
+        elif prefix == "item":
+            if event == "start_map":
+                record = {}
+            elif event == "end_map":
+                yield record
+                record = None
+
+
+def _decoded_records(body):
+    """Each record of a JSON array, decoded one at a time with raw_decode"""
+    text = body.decode("utf-8") if isinstance(body, bytes) else body
+    index = SEPARATORS.match(text).end()
+    if not text.startswith("[", index):
+        return
+    index += 1
+    while True:
+        index = SEPARATORS.match(text, index).end()
+        if index >= len(text) or text[index] == "]":
+            return
+        record, index = DECODER.raw_decode(text, index)
+        if isinstance(record, dict):
+            yield record
@@ -0,0 +1,227 @@
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id       TEXT PRIMARY KEY,
+    organization TEXT,
+    title        TEXT,
+    url          TEXT,
+    description  TEXT,
+    category     TEXT,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_category ON jobs (category, first_seen);
+
+-- Every subgroup category a job was labelled with, when a classifier gives more than one
+CREATE TABLE IF NOT EXISTS job_labels (
+    job_id   TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (job_id, category)
+);
+CREATE INDEX IF NOT EXISTS job_labels_category ON job_labels (category);
+
+CREATE TABLE IF NOT EXISTS posts (
+    job_id      TEXT NOT NULL,
+    subgroup_id TEXT NOT NULL,
+    posted_at   REAL NOT NULL,
+    PRIMARY KEY (job_id, subgroup_id)
+);
+
+-- Inverted index for reclassify.py: the stored jobs with each lowercase word in their title or description
+CREATE TABLE IF NOT EXISTS job_tokens (
+    token  TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    PRIMARY KEY (token, job_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tokens (token TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS indexed_jobs (job_id TEXT PRIMARY KEY) WITHOUT ROWID;
+
+-- Small values kept between runs, like the rules the stored labels came from
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Keeps IN (...) lists under SQLite's host parameter limit
+CHUNK = 500
+
+
+class JobStore:
+    """
+    SQLite store of every job we've fetched, keyed by LinkedIn job id.
+
+    Tracks which category each job was classified into and which subgroups
+    it has already been posted to, so reruns only touch new jobs.
+    """
+
+    def __init__(self, path="jobs.db"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_job(self, job_id, before=None):
+        """Whether job_id is stored (and was first stored before `before`, if given)"""
+        query, params = "SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)
+        if before is not None:
+            query, params = query + " AND first_seen < ?", (job_id, before)
+        with self.lock:
+            row = self.conn.execute(query, params).fetchone()
+        return row is not None
+
+    def upsert_jobs(self, keyed_jobs):
+        """
+        Insert or refresh (job_id, job) pairs.
+        Returns the ids that weren't in the store before.
+        """
+        now = time.time()
+        new_ids = []
+        with self.lock, self.conn:
+            for job_id, job in keyed_jobs:
+                exists = self.conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if exists:
+                    self.conn.execute("UPDATE jobs SET last_seen = ? WHERE job_id = ?", (now, job_id))
+                    continue
+                self.conn.execute(
+                    "INSERT INTO jobs (job_id, organization, title, url, description, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, job.organization, job.title, job.url, job.description, now, now),
+                )
+                new_ids.append(job_id)
+        return new_ids
+
+    def unclassified(self):
+        """Jobs that haven't been through classify_job yet"""
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(
+                "SELECT * FROM jobs WHERE category IS NULL ORDER BY first_seen, rowid")]
+
+    def set_categories(self, labels):
+        """Store (job_id, category) pairs"""
+        with self.lock, self.conn:
+            self.conn.executemany("UPDATE jobs SET category = ? WHERE job_id = ?",
+                                  [(category, job_id) for job_id, category in labels])
+
+    def set_labels(self, labels):
+        """
+        Store (job_id, [category, ...]) pairs from a multi-label classifier.
+        The first category becomes the job's main one ("Other" if there are none).
+        """
+        with self.lock, self.conn:
+            for job_id, categories in labels:
+                self.conn.execute("UPDATE jobs SET category = ? WHERE job_id = ?",
+                                  (categories[0] if categories else "Other", job_id))
+                self.conn.execute("DELETE FROM job_labels WHERE job_id = ?", (job_id,))
+                self.conn.executemany("INSERT OR IGNORE INTO job_labels (job_id, category) VALUES (?, ?)",
+                                      [(job_id, category) for category in categories])
+
+    def unposted(self, category, subgroup_id, since=None):
+        """Jobs in a category (main or extra label) not yet posted to subgroup_id, oldest first"""
+        query = ("SELECT * FROM jobs WHERE (category = ? OR job_id IN "
+                 "(SELECT job_id FROM job_labels WHERE category = ?)) AND job_id NOT IN "
+                 "(SELECT job_id FROM posts WHERE subgroup_id = ?)")
+        params = [category, category, subgroup_id]
+        if since is not None:
+            query += " AND last_seen >= ?"
+            params.append(since)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query + " ORDER BY first_seen, rowid", params)]
+
+    def mark_posted(self, job_ids, subgroup_id):
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO posts (job_id, subgroup_id, posted_at) VALUES (?, ?, ?)",
+                [(job_id, subgroup_id, now) for job_id in job_ids],
+            )
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def iter_labelled(self, job_ids=None, batch=CHUNK):
+        """
+        Classified jobs (all, or just job_ids) in batches of (row, labels)
+        pairs, labels being the main category first, then any extra ones.
+        """
+        with self.lock:
+            if job_ids is None:
+                job_ids = [row[0] for row in self.conn.execute(
+                    "SELECT job_id FROM jobs WHERE category IS NOT NULL ORDER BY rowid")]
+            else:
+                job_ids = list(job_ids)
+        for start in range(0, len(job_ids), batch):
+            chunk = job_ids[start:start + batch]
+            marks = ",".join("?" * len(chunk))
+            with self.lock:
+                rows = [dict(row) for row in self.conn.execute(
+                    f"SELECT * FROM jobs WHERE category IS NOT NULL AND job_id IN ({marks}) ORDER BY rowid", chunk)]
+                extra = {}
+                for job_id, category in self.conn.execute(
+                        f"SELECT job_id, category FROM job_labels WHERE job_id IN ({marks})", chunk):
+                    extra.setdefault(job_id, set()).add(category)
+            labelled = []
+            for row in rows:
+                main = row['category']
+                labels = [main] if main != "Other" else []
+                labels += sorted(extra.get(row['job_id'], set()) - {main})
+                labelled.append((row, labels))
+            yield labelled
+
+    def count_classified(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE category IS NOT NULL").fetchone()[0]
+
+    def unindexed(self, limit=CHUNK):
+        """Up to `limit` stored jobs not yet in the token index"""
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(
+                "SELECT job_id, title, description FROM jobs WHERE job_id NOT IN "
+                "(SELECT job_id FROM indexed_jobs) ORDER BY rowid LIMIT ?", (limit,))]
+
+    def index_tokens(self, job_tokens):
+        """Add (job_id, {token, ...}) pairs to the token index"""
+        job_tokens = list(job_tokens)
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO job_tokens (token, job_id) VALUES (?, ?)",
+                                  [(token, job_id) for job_id, tokens in job_tokens for token in tokens])
+            self.conn.executemany("INSERT OR IGNORE INTO tokens (token) VALUES (?)",
+                                  [(token,) for token in set().union(*(tokens for _, tokens in job_tokens))])
+            self.conn.executemany("INSERT OR IGNORE INTO indexed_jobs (job_id) VALUES (?)",
+                                  [(job_id,) for job_id, _ in job_tokens])
+
+    def vocabulary(self):
+        """Every token in the index"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT token FROM tokens")]
+
+    def jobs_with_tokens(self, tokens):
+        """Ids of the indexed jobs containing any of tokens"""
+        tokens = list(tokens)
+        job_ids = set()
+        for start in range(0, len(tokens), CHUNK):
+            chunk = tokens[start:start + CHUNK]
+            with self.lock:
+                job_ids.update(row[0] for row in self.conn.execute(
+                    f"SELECT job_id FROM job_tokens WHERE token IN ({','.join('?' * len(chunk))})", chunk))
+        return job_ids
@@ -0,0 +1,61 @@
+from array import array
+from itertools import accumulate, chain, repeat
+
+from job import Job
+
+COLUMNS = ("title", "description", "organization", "url")
+
+
+class JobTable:
+    """
+    Fetched jobs stored column by column instead of as a list of Jobs.
+
+    Each column is a plain list of strings (missing values become ""), so a
+    whole column can be joined and matched in one go. `category` is filled
+    in by CompiledClassifier.classify_table() as an array of label ids.
+    """
+
+    def __init__(self, title=(), description=(), organization=(), url=()):
+        self.title = list(title)
+        self.description = list(description)
+        self.organization = list(organization)
+        self.url = list(url)
+        self.category = array("B")
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        table = cls()
+        table.extend(jobs)
+        return table
+
+    def extend(self, jobs):
+        for job in jobs:
+            self.title.append(job.title)
+            self.description.append(job.description)
+            self.organization.append(job.organization)
+            self.url.append(job.url)
+
+    def __len__(self):
+        return len(self.title)
+
+    def row(self, index):
+        """One row back as a Job"""
+        return Job(**{column: getattr(self, column)[index] for column in COLUMNS})
+
+    def joined(self, separator, *columns):
+        """
+        The given columns of every row as one string: a row's columns are
+        separated by spaces and each row ends with `separator`. Also returns
+        the offset each row starts at, plus one past the last row.
+        """
+        columns = [getattr(self, name) for name in columns]
+        # t0 " " d0 SEP t1 " " d1 SEP ... without building a string per row
+        parts = []
+        for column in columns[:-1]:
+            parts += [column, repeat(" ")]
+        parts += [columns[-1], repeat(separator)]
+        text = "".join(chain.from_iterable(zip(*parts)))
+
+        padding = len(columns) - 1 + len(separator)
+        widths = map(sum, zip(*(map(len, column) for column in columns), repeat(padding)))
+        return text, array("Q", accumulate(widths, initial=0))
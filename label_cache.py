@@ -0,0 +1,135 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Compact rows: 16-byte content hash, 8-byte ruleset fingerprint, labels as text
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS labels (
+    hash    BLOB PRIMARY KEY,
+    ruleset BLOB NOT NULL,
+    labels  TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def content_hash(job):
+    """16-byte digest of a job's title and description, the only fields classification reads"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(job.title.encode("utf-8", "surrogatepass"))
+    digest.update(b"\x00")
+    digest.update(job.description.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+def ruleset_fingerprint(*parts):
+    """8-byte digest of everything that decides a label (patterns, thresholds, ...)"""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.digest()
+
+
+class LabelCache:
+    """
+    Classification results keyed by content hash: an in-memory LRU in front
+    of an optional SQLite file.
+
+    Every entry carries the fingerprint of the ruleset that produced it.
+    An entry from a different ruleset counts as a miss and is replaced, and
+    stale entries are dropped from disk when the file is opened (on first
+    use, not at construction), so editing CS_TOKENS, CS_BLOCKLIST or
+    FILTERS invalidates everything on its own.
+    Labels are stored as a list of category names.
+    """
+
+    def __init__(self, fingerprint, path=None, max_entries=10000):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.max_entries = max_entries
+        self.memory = OrderedDict()  # hash -> tuple of labels
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.conn = None
+
+    def _connection(self):
+        """The SQLite file (None without a path), opened and pruned on first use so importing the bot touches nothing"""
+        if self.conn is None and self.path:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+                self.conn.execute("DELETE FROM labels WHERE ruleset != ?", (self.fingerprint,))
+        return self.conn
+
+    def _remember(self, key, labels):
+        self.memory[key] = labels
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Cached labels for each key, or None where there's nothing for this ruleset"""
+        found = []
+        missing = []
+        with self.lock:
+            for i, key in enumerate(keys):
+                labels = self.memory.get(key)
+                if labels is not None:
+                    self.memory.move_to_end(key)
+                    self.hits += 1
+                else:
+                    missing.append(i)
+                found.append(labels)
+
+            conn = self._connection() if missing else None
+            if conn is not None:
+                # SQLite caps bound parameters, so look up in slices
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT hash, labels FROM labels WHERE ruleset = ? AND hash IN ({','.join('?' * len(batch))})",
+                        [self.fingerprint] + [keys[i] for i in batch]).fetchall()
+                    stored = {key: tuple(filter(None, labels.split("\t"))) for key, labels in rows}
+                    for i in batch:
+                        labels = stored.get(keys[i])
+                        if labels is not None:
+                            found[i] = labels
+                            self._remember(keys[i], labels)
+                            self.disk_hits += 1
+            self.misses += sum(labels is None for labels in found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, [label, ...]) pairs"""
+        items = [(key, tuple(labels)) for key, labels in items]
+        with self.lock:
+            for key, labels in items:
+                self._remember(key, labels)
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO labels (hash, ruleset, labels) VALUES (?, ?, ?)",
+                        [(key, self.fingerprint, "\t".join(labels)) for key, labels in items])
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self.memory),
+            }
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM labels")
@@ -0,0 +1,300 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+# Seconds: from a cached page or a local SQLite write up to a post stuck in backoff
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, cheap enough to update on every request"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (max for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Stage timers, counters, gauges and latency histograms for one run.
+
+    Stages are wall-clock time on the calling thread, accumulated per name
+    ("fetch", "dedup", "classify", ...), so a streaming run that alternates
+    between them still adds up. Counters and histograms take labels as
+    keyword arguments. Everything is thread-safe, since the fetch and post
+    paths record from worker threads.
+
+    report() is the JSON run report, prometheus() the same numbers in
+    Prometheus text format for a textfile collector or serve().
+
+    Objects in `listeners` get enter_stage(name) / exit_stage(name) calls
+    around every stage, which is how the profiler attributes its samples.
+    """
+
+    def __init__(self, namespace="internship_bot", buckets=DEFAULT_BUCKETS, clock=time.perf_counter):
+        self.namespace = namespace
+        self.buckets = buckets
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.started = self.clock()
+            self.stages = {}      # name -> [seconds, calls, longest call]
+            self.counters = {}    # (name, labels) -> value
+            self.gauges = {}
+            self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def add_stage(self, name, seconds, calls=1):
+        with self.lock:
+            stage = self.stages.setdefault(name, [0.0, 0, 0.0])
+            stage[0] += seconds
+            stage[1] += calls
+            stage[2] = max(stage[2], seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the block under stage `name`"""
+        for listener in self.listeners:
+            listener.enter_stage(name)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add_stage(name, self.clock() - start)
+            for listener in reversed(self.listeners):
+                listener.exit_stage(name)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the block into histogram `name`"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - start, **labels)
+
+    def timed(self, name):
+        """Decorator: time every call of the function under stage `name`"""
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def timed_iter(self, name, iterable):
+        """Yield from iterable, counting only the time spent waiting on it as stage `name`"""
+        iterator = iter(iterable)
+        done = object()
+        while True:
+            with self.stage(name):
+                item = next(iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def report(self):
+        """The run so far as a JSON-ready dict"""
+        def grouped(items, value):
+            out = {}
+            for (name, labels), item in sorted(items):
+                out.setdefault(name, []).append({"labels": dict(labels), **value(item)})
+            return out
+
+        with self.lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec="seconds"),
+                "duration_s": self.clock() - self.started,
+                "stages": {name: {"seconds": seconds, "calls": calls, "max_s": longest}
+                           for name, (seconds, calls, longest) in self.stages.items()},
+                "counters": grouped(self.counters.items(), lambda v: {"value": v}),
+                "gauges": grouped(self.gauges.items(), lambda v: {"value": v}),
+                "histograms": grouped(self.histograms.items(), Histogram.summary),
+            }
+
+    def prometheus(self):
+        """Prometheus text exposition format"""
+        prefix = f"{self.namespace}_" if self.namespace else ""
+        lines = []
+
+        def family(name, kind, samples):
+            lines.append(f"# TYPE {prefix}{name} {kind}")
+            lines.extend(samples)
+
+        with self.lock:
+            family("run_duration_seconds", "gauge", [f"{prefix}run_duration_seconds {_number(self.clock() - self.started)}"])
+            stages = sorted(self.stages.items())
+            family("stage_seconds_total", "counter",
+                   [f"{prefix}stage_seconds_total{_format_labels([('stage', name)])} {_number(seconds)}"
+                    for name, (seconds, _, _) in stages])
+            family("stage_calls_total", "counter",
+                   [f"{prefix}stage_calls_total{_format_labels([('stage', name)])} {calls}"
+                    for name, (_, calls, _) in stages])
+
+            for kind, items in (("counter", self.counters), ("gauge", self.gauges)):
+                by_name = {}
+                for (name, labels), value in sorted(items.items()):
+                    by_name.setdefault(name, []).append(f"{prefix}{name}{_format_labels(labels)} {_number(value)}")
+                for name, samples in by_name.items():
+                    family(name, kind, samples)
+
+            by_name = {}
+            for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                samples = by_name.setdefault(name, [])
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    samples.append(f"{prefix}{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+                samples.append(f"{prefix}{name}_sum{_format_labels(labels)} {_number(histogram.sum)}")
+                samples.append(f"{prefix}{name}_count{_format_labels(labels)} {histogram.count}")
+            for name, samples in by_name.items():
+                family(name, "histogram", samples)
+
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path):
+        _write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus())
+
+    def serve(self, port, host="0.0.0.0", routes=None):
+        """
+        Serve /metrics (Prometheus) and /report (JSON) from a daemon thread,
+        plus any extra `routes`: path -> fn() returning (status code, JSON-ready
+        body). Returns the server; call shutdown() on it to stop.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # only needed with METRICS_PORT
+
+        metrics = self
+        routes = dict(routes or {})
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status = 200
+                path = self.path.split("?")[0]
+                if path in routes:
+                    status, body = routes[path]()
+                    body, content_type = json.dumps(body), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, content_type = metrics.prometheus(), "text/plain; version=0.0.4"
+                elif self.path.startswith("/report"):
+                    body, content_type = json.dumps(metrics.report()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _write_atomic(path, text):
+    # Readers (node_exporter, the dashboard) never see a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def load_report(path):
+    """A report written by Metrics.write_report, or None if there isn't one yet"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def counter_total(report, name, **labels):
+    """Sum of a counter in a report over every series matching `labels`"""
+    return sum(series["value"] for series in report.get("counters", {}).get(name, [])
+               if all(series["labels"].get(k) == str(v) for k, v in labels.items()))
@@ -0,0 +1,161 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from ratelimit import backoff_delay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    subgroup_id     TEXT NOT NULL,
+    source_guid     TEXT NOT NULL UNIQUE,
+    text            TEXT NOT NULL,
+    label           TEXT NOT NULL DEFAULT '',
+    meta            TEXT NOT NULL DEFAULT '{}',
+    status          TEXT NOT NULL DEFAULT 'pending',  -- pending | sent | dead
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error      TEXT NOT NULL DEFAULT '',
+    created_at      REAL NOT NULL,
+    sent_at         REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt_at);
+"""
+
+
+class Outbox:
+    """
+    Persistent queue of rendered GroupMe messages.
+
+    A message is written here with its source_guid before any attempt to
+    post it, and only marked sent after GroupMe answers 201. Anything left
+    pending by a crash or a failed post is picked up by the next run, still
+    with the same source_guid, so GroupMe can tell it's a retry. Messages
+    that keep failing are retried with backoff across runs until
+    `max_attempts`, then parked as dead.
+
+    Pass a JobStore to share its connection; then enqueue(job_ids=...)
+    records the jobs as posted in the same transaction, so a job is handed
+    to the outbox exactly once.
+    """
+
+    def __init__(self, path="jobs.db", store=None, max_attempts=10, clock=time.time):
+        if store is not None:
+            self.conn, self.lock = store.conn, store.lock
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.lock = threading.RLock()
+        self.max_attempts = max_attempts
+        self.clock = clock
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def enqueue(self, subgroup_id, text, label="", meta=None, source_guid=None, job_ids=None):
+        """Add a message. Returns its source_guid."""
+        source_guid = source_guid or str(uuid.uuid4())
+        now = self.clock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO outbox (subgroup_id, source_guid, text, label, meta, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (subgroup_id, source_guid, text, label, json.dumps(meta or {}), now),
+            )
+            if job_ids:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO posts (job_id, subgroup_id, posted_at) VALUES (?, ?, ?)",
+                    [(job_id, subgroup_id, now) for job_id in job_ids],
+                )
+        return source_guid
+
+    def due(self, subgroup_id=None):
+        """
+        Pending messages ready to send (for one subgroup, or all), oldest
+        first. A subgroup's messages stop at its first one still waiting out
+        a backoff, so they can't overtake it.
+        """
+        now = self.clock()
+        query, args = "SELECT * FROM outbox WHERE status = 'pending'", ()
+        if subgroup_id is not None:
+            query, args = query + " AND subgroup_id = ?", (subgroup_id,)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY id", args).fetchall()
+        blocked = set()
+        ready = []
+        for row in rows:
+            if row['subgroup_id'] in blocked:
+                continue
+            if row['next_attempt_at'] > now:
+                blocked.add(row['subgroup_id'])
+                continue
+            ready.append(dict(row))
+        return ready
+
+    def backing_off(self):
+        """Ids of the subgroups with a pending message still waiting out a backoff"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT subgroup_id FROM outbox WHERE status = 'pending' AND next_attempt_at > ?",
+                (self.clock(),)).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_sent(self, source_guid, attempts=1):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = 'sent', attempts = attempts + ?, sent_at = ?, last_error = '' "
+                "WHERE source_guid = ?", (attempts, self.clock(), source_guid))
+
+    def mark_failed(self, source_guid, error="", attempts=1):
+        """Record failed attempts and push the next try back, or give up"""
+        if not attempts:
+            return  # never tried, e.g. held back behind an earlier failure
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT attempts FROM outbox WHERE source_guid = ?", (source_guid,)).fetchone()
+            if row is None:
+                return
+            total = row[0] + attempts
+            if total >= self.max_attempts:
+                self.conn.execute(
+                    "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ? WHERE source_guid = ?",
+                    (total, error, source_guid))
+            else:
+                self.conn.execute(
+                    "UPDATE outbox SET attempts = ?, last_error = ?, next_attempt_at = ? WHERE source_guid = ?",
+                    (total, error, self.clock() + backoff_delay(total), source_guid))
+
+    def counts(self):
+        """Number of messages per status"""
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def record(self, result):
+        """Store the outcome of a PostResult for one of our messages"""
+        if result.ok:
+            self.mark_sent(result.source_guid, result.attempts)
+        else:
+            self.mark_failed(result.source_guid, result.error, result.attempts)
+
+    def submit_due(self, dispatcher, subgroup_id=None):
+        """Queue every due message (or one subgroup's) on a PostDispatcher. Returns how many were queued."""
+        rows = self.due(subgroup_id)
+        for row in rows:
+            dispatcher.enqueue(row['subgroup_id'], row['text'], label=row['label'],
+                               source_guid=row['source_guid'], **json.loads(row['meta']))
+        return len(rows)
+
+    def deliver(self, dispatcher, on_result=None):
+        """
+        Hand every due message to a PostDispatcher and record the outcome.
+        Returns the PostResults in completion order.
+        """
+        self.submit_due(dispatcher)
+        results = []
+        for result in dispatcher.iter_results():
+            self.record(result)
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
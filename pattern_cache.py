@@ -0,0 +1,101 @@
+import marshal
+import os
+import re
+import sys
+import threading
+
+try:
+    import _sre
+    from re import _compiler, _parser
+except ImportError:  # not CPython 3.11+: plain re.compile, nothing saved
+    _sre = None
+
+
+def _precompile(source, flags):
+    """The arguments re.compile() hands _sre.compile() for source, as plain data"""
+    parsed = _parser.parse(source, flags)
+    code = _compiler._code(parsed, flags)
+    groupindex = dict(parsed.state.groupdict)
+    indexgroup = [None] * parsed.state.groups
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    return (source, flags | parsed.state.flags, [int(op) for op in code],
+            parsed.state.groups - 1, groupindex, tuple(indexgroup))
+
+
+class PatternCache:
+    """
+    re.compile() that keeps the compiled form of every pattern in a
+    snapshot file, so the next process can skip sre's parser and compiler.
+
+    Parsing and compiling the classifier's long alternations is most of
+    what building it costs; making a pattern from saved opcodes is almost
+    free. The snapshot is keyed by a hash of the ruleset plus the Python
+    version (sre's opcodes change between releases), so editing a rule or
+    upgrading Python just means it's rebuilt. It's written by save(), and
+    only if something new was compiled. Without a path, on an interpreter
+    without _sre, or for a pattern the snapshot path can't handle, this is
+    plain re.compile.
+    """
+
+    def __init__(self, ruleset=b"", path=None):
+        self.key = repr((ruleset, sys.version, getattr(_sre, "MAGIC", None)))
+        self.path = path
+        self.entries = None  # (source, flags) -> _sre.compile arguments, read on first compile
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _load(self):
+        self.entries = {}
+        if not self.path:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                key, entries = marshal.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Ignoring unreadable pattern snapshot {self.path}: {e}")
+            return
+        if key == self.key:
+            self.entries = entries
+
+    def compile(self, source, flags=0):
+        flags = int(flags)
+        if _sre is None or not self.path:
+            return re.compile(source, flags)
+        with self.lock:
+            if self.entries is None:
+                self._load()
+            args = self.entries.get((source, flags))
+        if args is not None:
+            try:
+                pattern = _sre.compile(*args)
+                self.hits += 1
+                return pattern
+            except Exception as e:
+                print(f"Recompiling a pattern from the snapshot: {e}")
+        self.misses += 1
+        # _precompile leans on sre internals; if they've moved, or the pattern is bad, re.compile decides
+        try:
+            args = _precompile(source, flags)
+            pattern = _sre.compile(*args)
+        except Exception:
+            return re.compile(source, flags)
+        with self.lock:
+            self.entries[(source, flags)] = args
+            self.dirty = True
+        return pattern
+
+    def save(self):
+        """Write the snapshot if anything was compiled since it was read"""
+        with self.lock:
+            if not (self.path and self.dirty):
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "wb") as f:
+                marshal.dump((self.key, self.entries), f)
+            os.replace(tmp, self.path)
+            self.dirty = False
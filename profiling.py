@@ -0,0 +1,256 @@
+import cProfile
+import gzip
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import parse_qs, urlparse
+
+from fetcher import PAGE_SIZE
+
+
+def load_fixture(path):
+    """Jobs saved by save_fixture (plain or gzipped JSON list)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(path, jobs):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(jobs, f)
+
+
+class FixtureResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.headers = {}
+        self.data = data
+        self.text = json.dumps(data)
+        self.content = self.text.encode("utf-8")
+
+    def json(self):
+        return self.data
+
+
+class FixtureAPI:
+    """
+    Stands in for the Transport in profiling runs: GETs are answered with
+    offset pages of a recorded job list, POSTs with a GroupMe-style 201.
+    Nothing touches the network.
+    """
+
+    def __init__(self, jobs, page_size=PAGE_SIZE):
+        self.jobs = jobs
+        self.page_size = page_size
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        with self.lock:
+            self.requests += 1
+        query = dict(params or {})
+        for key, values in parse_qs(urlparse(url).query).items():
+            query.setdefault(key, values[0])
+        offset = int(query.get("offset", 0))
+        return FixtureResponse(200, self.jobs[offset:offset + self.page_size])
+
+    def post(self, url, **kwargs):
+        with self.lock:
+            self.requests += 1
+        return FixtureResponse(201, {})
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """
+    Sampling profiler: every `interval` seconds, record every thread's
+    stack. Main-thread stacks are rooted at the current stage, worker
+    threads at their (de-numbered) thread name, and write_folded() writes
+    them as folded stacks for flamegraph.pl, speedscope or inferno.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = {}  # folded stack -> samples
+        self.stage = "(no stage)"
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.main_id = threading.main_thread().ident
+        self.thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if ident == self.main_id:
+                    root = self.stage
+                else:
+                    root = "thread " + re.sub(r"[-_]?\d+", "", names.get(ident, "?"))
+                folded = ";".join([root] + stack[::-1])
+                self.stacks[folded] = self.stacks.get(folded, 0) + 1
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """
+    Per-stage profiling, driven by Metrics stage enter/exit calls.
+
+    mode="cprofile" keeps one cProfile.Profile per stage and switches
+    between them at stage boundaries (cProfile only sees the main thread,
+    where every stage runs). mode="sample" runs a Sampler over all threads
+    instead. Either way tracemalloc tracks each stage's net and peak
+    allocations. The first `snapshot_calls` calls of every stage are also
+    bracketed by a pair of snapshots, and the top differences of the call
+    with the highest peak are written out.
+    """
+
+    def __init__(self, out_dir, mode="sample", interval=0.005, top=25, snapshot_calls=3):
+        self.out_dir = out_dir
+        self.mode = mode
+        self.top = top
+        self.snapshot_calls = snapshot_calls
+        self.stack = []          # (stage, traced bytes at entry, snapshot or None)
+        self.memory = {}         # stage -> {"calls", "net_bytes", "peak_bytes"}
+        self.snapshots = {}      # stage -> (peak, [StatisticDiff, ...]) of its heaviest snapshotted call
+        self.profiles = {}
+        self.sampler = Sampler(interval) if mode == "sample" else None
+
+    def _profile(self, name):
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        return profile
+
+    def start(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.thread_id = threading.get_ident()
+        tracemalloc.start()
+        self.started = time.perf_counter()
+        if self.sampler:
+            self.sampler.start()
+        else:
+            self._profile("(no stage)").enable()
+
+    def enter_stage(self, name):
+        if threading.get_ident() != self.thread_id:
+            return
+        outer = self.stack[-1][0] if self.stack else "(no stage)"
+        if self.sampler:
+            self.sampler.stage = name
+        else:
+            self._profile(outer).disable()
+        # Snapshots are slow, so only a stage's first few calls get a pair
+        calls = self.memory.get(name, {}).get("calls", 0)
+        snapshot = tracemalloc.take_snapshot() if calls < self.snapshot_calls else None
+        tracemalloc.reset_peak()
+        self.stack.append((name, tracemalloc.get_traced_memory()[0], snapshot))
+        if not self.sampler:
+            self._profile(name).enable()
+
+    def exit_stage(self, name):
+        if threading.get_ident() != self.thread_id:
+            return
+        stage, before, snapshot = self.stack.pop()
+        if not self.sampler:
+            self._profile(stage).disable()
+        current, peak = tracemalloc.get_traced_memory()
+        memory = self.memory.setdefault(stage, {"calls": 0, "net_bytes": 0, "peak_bytes": 0})
+        memory["calls"] += 1
+        memory["net_bytes"] += current - before
+        memory["peak_bytes"] = max(memory["peak_bytes"], peak - before)
+        if snapshot is not None and peak - before >= self.snapshots.get(stage, (-1, None))[0]:
+            diff = _own_allocations(tracemalloc.take_snapshot()).compare_to(_own_allocations(snapshot), "lineno")
+            self.snapshots[stage] = (peak - before, diff[:self.top])
+
+        outer = self.stack[-1][0] if self.stack else "(no stage)"
+        if self.sampler:
+            self.sampler.stage = outer
+        else:
+            self._profile(outer).enable()
+
+    def stop(self, report=None):
+        """Stop profiling and write everything to out_dir. Returns the summary dict."""
+        elapsed = time.perf_counter() - self.started
+        if self.sampler:
+            self.sampler.stop()
+        else:
+            for profile in self.profiles.values():
+                profile.disable()
+        tracemalloc.stop()
+
+        written = []
+        if self.sampler:
+            path = os.path.join(self.out_dir, "stacks.folded")
+            self.sampler.write_folded(path)
+            written.append(path)
+        else:
+            text = io.StringIO()
+            for stage, profile in sorted(self.profiles.items()):
+                path = os.path.join(self.out_dir, f"{_filename(stage)}.prof")
+                profile.dump_stats(path)
+                written.append(path)
+                text.write(f"==== {stage} ====\n")
+                pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(self.top)
+            path = os.path.join(self.out_dir, "profile.txt")
+            with open(path, "w") as f:
+                f.write(text.getvalue())
+            written.append(path)
+
+        path = os.path.join(self.out_dir, "memory.txt")
+        with open(path, "w") as f:
+            for stage, (peak, diffs) in self.snapshots.items():
+                f.write(f"==== {stage} (peak {peak / 1024:.0f} KiB above its start) ====\n")
+                for diff in diffs:
+                    f.write(f"{diff}\n")
+                f.write("\n")
+        written.append(path)
+
+        summary = {"seconds": elapsed, "mode": self.mode, "memory": self.memory, "files": written}
+        if report is not None:
+            summary["stages"] = report["stages"]
+        path = os.path.join(self.out_dir, "summary.json")
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+        summary["files"].append(path)
+        return summary
+
+
+def _own_allocations(snapshot):
+    """Leave out what the profiler and tracemalloc allocate themselves"""
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+def _filename(stage):
+    return re.sub(r"[^\w.-]+", "_", stage).strip("_") or "stage"
@@ -0,0 +1,95 @@
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket that adapts to 429s and pauses when the quota runs out"""
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = 0.2, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)          # tokens added per second
+        self.max_rate = float(rate)      # ceiling we recover back towards after a 429
+        self.min_rate = min(float(min_rate), self.rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.last = clock()
+
+    def _refill(self, now):
+        elapsed = now - self.last
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last = now
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = self.clock()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+    def on_success(self):
+        """Additive recovery towards the configured rate after a good response"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def on_throttled(self, retry_after: float = None):
+        """Back off after a 429: pause the bucket and halve the rate"""
+        with self.lock:
+            now = self.clock()
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.paused_until = max(self.paused_until, now + pause)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self.last = now
+
+    def update_from_headers(self, headers, max_pause=60.0):
+        """
+        Pause once the API says the quota is used up. RapidAPI sends
+        x-ratelimit-requests-remaining / x-ratelimit-requests-reset, but
+        they describe the plan's quota for the whole billing period (reset
+        is seconds until it renews, often weeks), not a per-second rate,
+        so nothing else is read from them. The pause is capped at
+        `max_pause`; the 429s that follow take it from there.
+        """
+        if not headers:
+            return
+        remaining = headers.get("x-ratelimit-requests-remaining")
+        reset = headers.get("x-ratelimit-requests-reset")
+        try:
+            remaining = int(remaining) if remaining is not None else None
+            reset = float(reset) if reset is not None else None
+        except ValueError:
+            return
+        if remaining is None or remaining > 0:
+            return
+
+        with self.lock:
+            now = self.clock()
+            self.paused_until = max(self.paused_until, now + min(reset or 1.0, max_pause))
+            self.tokens = 0.0
+            self.last = now
+
+
+def parse_retry_after(value):
+    """Retry-After in seconds (we don't bother with the HTTP-date form)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter for the given 1-based attempt"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
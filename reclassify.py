@@ -0,0 +1,240 @@
+import json
+import re
+import time
+from collections import Counter
+
+from classifier import CompiledClassifier, _split_alternatives
+from job import Job
+
+try:
+    from re import _constants, _parser
+except ImportError:  # Python < 3.11
+    import sre_constants as _constants
+    import sre_parse as _parser
+
+TOKEN = re.compile(r"\w+")
+WORD_CHAR = re.compile(r"\w")
+
+# Where each CompiledClassifier rule list comes from, for the report
+LIST_NAMES = {
+    CompiledClassifier.CS_FILTER: 'FILTERS["CS/IT"]',
+    CompiledClassifier.CS_ALLOW: "CS_TOKENS",
+    CompiledClassifier.CS_BLOCK: "CS_BLOCKLIST",
+}
+
+# The word-bounded lists, diffed entry by entry (see diff_rules)
+ENTRY_LISTS = {
+    CompiledClassifier.CS_ALLOW: "cs_tokens",
+    CompiledClassifier.CS_BLOCK: "cs_blocklist",
+}
+
+
+def ruleset(cs_tokens, cs_blocklist, filters, settings=""):
+    """
+    Everything the stored labels depend on, as JSON-ready data. `settings`
+    stands for whatever else decides a label (classify mode, thresholds,
+    weights): when it changes, every job is reclassified.
+    """
+    return {"cs_tokens": list(cs_tokens), "cs_blocklist": list(cs_blocklist), "filters": dict(filters),
+            "settings": settings}
+
+
+def tokenize(*texts):
+    """The set of lowercase words in texts, as the token index stores them"""
+    return {token for text in texts for token in TOKEN.findall(text.lower())}
+
+
+def _required(parsed):
+    """
+    Sets of words that every match of a parsed pattern has one word from
+    each of ([] if it needn't have any): runs of literal word characters
+    in sequence, and for a branch, one set from each alternative together.
+    """
+    required = []
+    run = []
+    for op, av in list(parsed) + [(None, None)]:
+        if op is _constants.LITERAL and WORD_CHAR.match(chr(av)):
+            run.append(chr(av).lower())
+            continue
+        if run:
+            required.append({"".join(run)})
+            run = []
+        if op is _constants.SUBPATTERN:
+            required += _required(av[-1])
+        elif op in (_constants.MAX_REPEAT, _constants.MIN_REPEAT) and av[0] >= 1:
+            required += _required(av[2])
+        elif op is _constants.BRANCH:
+            branches = [_required(branch) for branch in av[1]]
+            if all(branches):
+                # The longest words from each branch are the likeliest to narrow things down
+                required.append(set().union(*(max(words, key=lambda option: min(map(len, option)))
+                                              for words in branches)))
+    return required
+
+
+def required_words(source):
+    """
+    Sets of words (lowercase, made of word characters) such that any text
+    the pattern matches has a word containing one from every set; None when
+    it could match without any particular word, like r"\\d+".
+    """
+    try:
+        return _required(_parser.parse(source, re.I)) or None
+    except re.error:
+        return None
+
+
+def diff_rules(old, new):
+    """
+    The alternatives added to and removed from each rule list between two
+    ruleset() dicts, as {list name: {"added": [...], "removed": [...]}}.
+    None when the difference isn't just alternatives coming and going
+    (categories added, removed or reordered, or other settings changed).
+
+    CS_TOKENS and CS_BLOCKLIST entries only get word boundaries at their
+    outer ends, so editing one alternative of "retail|...|host|cook" can
+    change how its neighbours match. An edited entry counts as removed and
+    added whole, every one of its alternatives with it.
+    """
+    if old["settings"] != new["settings"]:
+        return None
+    before = CompiledClassifier(old["cs_tokens"], old["cs_blocklist"], old["filters"])
+    after = CompiledClassifier(new["cs_tokens"], new["cs_blocklist"], new["filters"])
+    if before.names != after.names:
+        return None
+    changes = {}
+    for name, old_branches, new_branches in zip(after.names, before.branches, after.branches):
+        if name in ENTRY_LISTS:
+            old_entries, new_entries = set(old[ENTRY_LISTS[name]]), set(new[ENTRY_LISTS[name]])
+            added = sorted({branch for entry in new_entries - old_entries for branch in _split_alternatives(entry)})
+            removed = sorted({branch for entry in old_entries - new_entries for branch in _split_alternatives(entry)})
+        else:
+            added = sorted(set(new_branches) - set(old_branches))
+            removed = sorted(set(old_branches) - set(new_branches))
+        if added or removed:
+            changes[LIST_NAMES.get(name, f'FILTERS["{name}"]')] = {"added": added, "removed": removed}
+    return changes
+
+
+def index_jobs(store, batch=500):
+    """Add every stored job not yet in the token index. Returns how many were added."""
+    count = 0
+    while True:
+        rows = store.unindexed(batch)
+        if not rows:
+            return count
+        store.index_tokens((row['job_id'], tokenize(row['title'] or "", row['description'] or "")) for row in rows)
+        count += len(rows)
+
+
+def affected_jobs(store, changes):
+    """
+    Ids of the stored jobs whose labels the changes could move: those that
+    have the words some added or removed alternative needs. A job that no
+    changed alternative can match hits exactly the same rules as before,
+    so its labels can't change. None when an alternative needs no
+    particular word, and only checking everything is safe.
+    """
+    alternatives = [alternative for change in changes.values() for alternative in change["added"] + change["removed"]]
+    required = [required_words(alternative) for alternative in alternatives]
+    if None in required:
+        return None
+    vocabulary = store.vocabulary() if required else []
+    postings = {}
+
+    def having(words):
+        # Substrings, not whole tokens: FILTERS patterns match inside words ("ai" in "maintain")
+        if words not in postings:
+            postings[words] = store.jobs_with_tokens(token for token in vocabulary if any(word in token for word in words))
+        return postings[words]
+
+    job_ids = set()
+    for sets in required:
+        # Longest words first; one or two letters match inside too many tokens to be worth looking up after that
+        sets = sorted(map(frozenset, sets), key=lambda words: -min(map(len, words)))
+        matching = having(sets[0])
+        for words in sets[1:]:
+            if min(map(len, words)) < 3:
+                break
+            matching = matching & having(words)
+        job_ids |= matching
+    return job_ids
+
+
+def reclassify(store, rules, classify, full=False):
+    """
+    Bring stored labels up to date with `rules` (a ruleset() dict).
+
+    The store remembers the rules its labels were made with. When they
+    differ, the rule lists are diffed alternative by alternative, the
+    token index finds the jobs that could be affected, and only those are
+    run through classify(jobs) -> [[category, ...], ...] again. Anything
+    the diff can't narrow down, or `full`, reclassifies every stored job.
+    A store with no rules recorded yet just records these ones.
+
+    Returns a report of what moved (see format_report), or None if the
+    rules hadn't changed.
+    """
+    start = time.perf_counter()
+    current = json.loads(json.dumps(rules))
+    recorded = store.get_meta("ruleset")
+    if recorded is None and not full:
+        store.set_meta("ruleset", json.dumps(current))
+        return None
+    recorded = json.loads(recorded) if recorded else None
+    if recorded == current and not full:
+        return None
+
+    changes = None if full or recorded is None else diff_rules(recorded, current)
+    job_ids = None
+    if changes is not None:
+        index_jobs(store)
+        job_ids = affected_jobs(store, changes)
+
+    checked = 0
+    gained, lost, moves = Counter(), Counter(), Counter()
+    for batch in store.iter_labelled(job_ids):
+        checked += len(batch)
+        fresh = classify([Job.from_record(row) for row, _ in batch])
+        changed = []
+        for (row, old), new in zip(batch, fresh):
+            if set(old) == set(new) and old[:1] == new[:1]:
+                continue
+            changed.append((row['job_id'], new))
+            before, after = set(old) or {"Other"}, set(new) or {"Other"}
+            gained.update(after - before)
+            lost.update(before - after)
+            moves[(old[0] if old else "Other", new[0] if new else "Other")] += 1
+        store.set_labels(changed)
+    store.set_meta("ruleset", json.dumps(current))
+
+    return {
+        "changes": changes,
+        "stored": store.count_classified(),
+        "checked": checked,
+        "moved": sum(moves.values()),
+        "categories": {category: {"gained": gained[category], "lost": lost[category]}
+                       for category in sorted(gained.keys() | lost.keys())},
+        "moves": {f"{old} -> {new}": count for (old, new), count in moves.most_common() if old != new},
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def format_report(report):
+    """The report from reclassify() as printable lines"""
+    if report["changes"] is None:
+        lines = ["Full pass (asked for, or categories or settings changed)"]
+    else:
+        lines = ["Rule changes: " + (", ".join(
+            f"{name} +{len(change['added'])} -{len(change['removed'])}" for name, change in report["changes"].items())
+            or "alternatives reordered only")]
+    share = report["checked"] / report["stored"] if report["stored"] else 0
+    lines.append(f"Checked {report['checked']} of {report['stored']} stored jobs ({share:.1%}) "
+                 f"in {report['seconds']:.2f}s: {report['moved']} jobs changed labels")
+    if report["categories"]:
+        lines.append(f"  {'category':<24} {'gained':>7} {'lost':>7}")
+        for category, counts in report["categories"].items():
+            lines.append(f"  {category:<24} {counts['gained']:>7} {counts['lost']:>7}")
+    for move, count in report["moves"].items():
+        lines.append(f"  {move}: {count}")
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+import threading
+import time
+
+
+class Refresher:
+    """
+    One shared copy of a slow result (the dashboard's classified jobs),
+    refreshed on a background thread.
+
+    `load(report)` does the work and may call report(text, fraction) as it
+    goes; snapshot() hands that progress to whoever is watching. Only one
+    load runs at a time, so any number of dashboard sessions asking for a
+    refresh cost one fetch. With `interval`, the worker also reloads once
+    the last attempt is that many seconds old, starting with an immediate
+    load if there's no data yet.
+
+    A load that raises keeps the previous data and records the error.
+    """
+
+    def __init__(self, load, interval=None, clock=time.time):
+        self.load = load
+        self.interval = interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.data = None
+        self.error = None
+        self.fetched_at = None    # clock() when data was last replaced
+        self.attempted_at = None  # clock() when the last load finished, ok or not
+        self.started_at = None    # clock() when the running load began, None when idle
+        self.status = ("", 0.0)   # latest report(text, fraction) from the running load
+        self.requested = False
+        self.loads = 0
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="refresher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def request(self):
+        """Ask for a load now (asks before it starts share it). Returns False if one is already under way."""
+        with self.lock:
+            if self.started_at is not None:
+                return False
+            self.requested = True
+        self.wake.set()
+        return True
+
+    def snapshot(self):
+        """Everything the UI shows, read together"""
+        with self.lock:
+            return {
+                "data": self.data,
+                "error": self.error,
+                "fetched_at": self.fetched_at,
+                "running": self.started_at is not None or self.requested,
+                "elapsed": self.clock() - self.started_at if self.started_at is not None else None,
+                "status": self.status,
+                "loads": self.loads,
+            }
+
+    def _wait(self):
+        """Seconds until the next load is due: 0 for now, None for only when asked"""
+        if self.requested:
+            return 0
+        if not self.interval:
+            return None
+        if self.attempted_at is None:
+            return 0
+        return max(0, self.attempted_at + self.interval - self.clock())
+
+    def _report(self, text, fraction):
+        with self.lock:
+            self.status = (text, fraction)
+
+    def _run(self):
+        while not self.stopped:
+            with self.lock:
+                wait = self._wait()
+            if wait != 0:
+                self.wake.wait(wait)
+                self.wake.clear()
+                continue
+            self._load()
+
+    def _load(self):
+        with self.lock:
+            self.requested = False
+            self.started_at = self.clock()
+            self.status = ("Starting", 0.0)
+        data = error = None
+        try:
+            data = self.load(self._report)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            print(f"Refresh failed: {error}")
+        with self.lock:
+            now = self.clock()
+            if error is None:
+                self.data = data
+                self.fetched_at = now
+            self.error = error
+            self.attempted_at = now
+            self.started_at = None
+            self.loads += 1
@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+
+from categories import get_category
+
+# GroupMe rejects message text longer than this
+GROUPME_MAX_CHARS = 1000
+
+# An entry over budget keeps at least this much of its company and title, dropping the link if need be
+MIN_FIELD_CHARS = 20
+NO_LINK = "No Link Provided"
+
+
+def get_week_date_range():
+    """Get the 7-day date range ending with today in MM/DD - MM/DD format"""
+    today = date.today()
+    # Start date is 7 days ago, end date is today
+    start_date = today - timedelta(days=7)
+
+    return f"{start_date.strftime('%m/%d')} - {today.strftime('%m/%d')}"
+
+
+def chunk_jobs(jobs, chunk_size=10):
+    """Split jobs into chunks of specified size"""
+    for i in range(0, len(jobs), chunk_size):
+        yield jobs[i:i + chunk_size]
+
+
+def render_header(category, week_range, part=None, parts=None):
+    """Title line, date banner and blank line that start every message"""
+    if part is None:
+        title = f"{category.title}:"
+    elif parts is None:
+        title = f"{category.title} (Part {part}):"
+    else:
+        title = f"{category.title} (Part {part}/{parts}):"
+    banner = "=" * category.banner_width
+    return f"{title}\n{banner} ({week_range}) {banner}\n\n"
+
+
+def _format_entry(num, company, job_title, application_link):
+    return f"{num}. {company}\n   Position: {job_title}\n   Apply: {application_link}\n\n"
+
+
+def _cut(text, width):
+    """text in at most `width` chars, ending in … if it had to be cut"""
+    if len(text) <= width:
+        return text
+    return text[:width - 1] + "…" if width > 0 else ""
+
+
+def render_entry(num, job, budget=None):
+    """
+    One numbered Job, in at most `budget` chars. One that's too long on its
+    own has its company and title cut short, and a link that wouldn't leave
+    room for at least MIN_FIELD_CHARS of each is replaced with NO_LINK.
+    """
+    company, job_title, application_link = job.company, job.position, job.link
+    entry = _format_entry(num, company, job_title, application_link)
+    if budget is None or len(entry) <= budget:
+        return entry
+
+    fixed = len(_format_entry(num, "", "", ""))
+    if fixed + len(application_link) + 2 * MIN_FIELD_CHARS > budget:
+        application_link = NO_LINK
+    room = max(0, budget - fixed - len(application_link))
+    # The title gets what the company doesn't need, but the company keeps at least a third
+    company_room = min(len(company), max(room // 3, room - len(job_title)))
+    entry = _format_entry(num, _cut(company, company_room), _cut(job_title, room - company_room), application_link)
+    return entry[:budget]  # only when budget can't even hold the labels
+
+
+def pack_messages(category, jobs, week_range=None, limit=GROUPME_MAX_CHARS):
+    """
+    Render a category's Jobs into as few messages as
+    fit under `limit` characters each, numbered continuously across parts.
+    Returns a list of (text, job count) pairs, in order.
+    """
+    category = get_category(category)
+    week_range = week_range or get_week_date_range()
+    if not jobs:
+        return []
+
+    # Size against the longest header a part could get so every message fits once labelled
+    budget = limit - len(render_header(category, week_range, len(jobs), len(jobs)))
+    chunks = []
+    chunk, used = [], 0
+    for num, job in enumerate(jobs, 1):
+        entry = render_entry(num, job, budget)
+        if chunk and used + len(entry) > budget:
+            chunks.append(chunk)
+            chunk, used = [], 0
+        chunk.append(entry)
+        used += len(entry)
+    chunks.append(chunk)
+
+    if len(chunks) == 1:
+        return [(render_header(category, week_range) + "".join(chunks[0]), len(chunks[0]))]
+    return [
+        (render_header(category, week_range, part, len(chunks)) + "".join(chunk), len(chunk))
+        for part, chunk in enumerate(chunks, 1)
+    ]
+
+
+def render_messages(category, jobs, week_range=None, limit=GROUPME_MAX_CHARS):
+    """Message texts for a category, or its 'no new opportunities' line when there are no jobs"""
+    category = get_category(category)
+    if not jobs:
+        return [category.empty_message]
+    return [text for text, _ in pack_messages(category, jobs, week_range, limit)]
+
+
+class MessageStream:
+    """
+    Renders jobs into subgroup messages as they arrive. A category's message
+    is emitted as soon as the next job wouldn't fit under `limit`, labelled
+    "Part 1", "Part 2"... since the final count isn't known yet; flush()
+    renders what's left.
+    """
+
+    def __init__(self, limit=GROUPME_MAX_CHARS):
+        self.limit = limit
+        self.week_range = get_week_date_range()
+        self.pending = {}  # category key -> ([entry text], [job_id], chars used)
+        self.parts = {}    # category key -> messages rendered so far
+        self.numbered = {}  # category key -> jobs numbered so far
+
+    def _budget(self, category):
+        return self.limit - len(render_header(category, self.week_range, part=999))
+
+    def _render(self, category, final):
+        entries, job_ids, _ = self.pending.pop(category.key)
+        part = self.parts.get(category.key, 0) + 1
+        self.parts[category.key] = part
+        label = None if final and part == 1 else part
+        text = render_header(category, self.week_range, part=label) + "".join(entries)
+        return category.key, text, job_ids
+
+    def add(self, category, job, job_id=None):
+        """Add a Job. Returns any (category key, text, job_ids) now complete."""
+        category = get_category(category)
+        budget = self._budget(category)
+        num = self.numbered.get(category.key, 0) + 1
+        self.numbered[category.key] = num
+        entry = render_entry(num, job, budget)
+
+        ready = []
+        pending = self.pending.get(category.key)
+        if pending and pending[2] + len(entry) > budget:
+            ready.append(self._render(category, final=False))
+            pending = None
+        if pending is None:
+            pending = self.pending[category.key] = ([], [], 0)
+        entries, job_ids, used = pending
+        entries.append(entry)
+        job_ids.append(job_id)
+        self.pending[category.key] = (entries, job_ids, used + len(entry))
+        return ready
+
+    def flush(self):
+        return [self._render(get_category(key), final=True) for key in list(self.pending)]
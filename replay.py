@@ -0,0 +1,236 @@
+import gzip
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ReadTimeoutError
+from urllib3.response import HTTPResponse
+
+from transport import Transport
+
+# Secrets (GroupMe's token rides in the query string) never reach a fixture or a match key
+REDACTED_PARAMS = {"token"}
+
+# The recorded body is stored decoded, so these would no longer be true on replay
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+ERROR_KINDS = ("429", "5xx", "timeout", "connect")
+
+
+def request_key(method, url, params=None):
+    """(METHOD, url without query, sorted query string) with redacted params removed"""
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query))
+    query.update({k: str(v) for k, v in (params or {}).items()})
+    for name in REDACTED_PARAMS:
+        query.pop(name, None)
+    return method.upper(), urlunparse(parsed._replace(query="", fragment="")), urlencode(sorted(query.items()))
+
+
+def load_recording(path):
+    """Exchanges from a fixture written by RecordingTransport"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def parse_error_rates(value):
+    """Injection rates from "429=0.05,5xx=0.02,timeout=0.01" """
+    rates = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        kind, _, rate = item.partition("=")
+        if kind not in ERROR_KINDS:
+            print(f"Ignoring unknown error kind {kind!r} (expected one of {', '.join(ERROR_KINDS)})")
+            continue
+        rates[kind] = float(rate)
+    return rates
+
+
+class RecordingTransport(Transport):
+    """
+    Live Transport that also appends every exchange to a gzipped JSON-lines
+    fixture: method, URL and query (tokens removed), the JSON body of a
+    POST, and the response's status, headers, body and elapsed time.
+
+    Request headers aren't kept, so the RapidAPI key never reaches the
+    file. Each exchange is written as its own gzip member as soon as it
+    completes, so an interrupted run still leaves a usable recording.
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.write_lock = threading.Lock()
+
+    def send(self, method, url, **kwargs):
+        start = time.perf_counter()
+        response = super().send(method, url, **kwargs)
+        method, base, query = request_key(method, url, kwargs.get("params"))
+        exchange = {
+            "method": method,
+            "url": base,
+            "query": query,
+            "request": kwargs.get("json"),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            "body": response.text,
+            "elapsed": time.perf_counter() - start,
+        }
+        line = json.dumps(exchange) + "\n"
+        with self.write_lock, gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(line)
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Transport that answers from a RecordingTransport fixture instead of the
+    network.
+
+    Requests match on method, URL and query. A request made more than once
+    (every post to one subgroup, a page fetched twice) gets the recorded
+    responses in order, then the last one again. With no exact match the
+    recordings for the same method and URL are used, and failing that a
+    404.
+
+    `latency` is added to every attempt: seconds, or "recorded" for each
+    exchange's original timing. `errors` injects failures per attempt at
+    the given rates ({"429": 0.05, "5xx": 0.02, "timeout": 0.01,
+    "connect": 0.01}). Injected failures go through the same urllib3 Retry
+    policy as live traffic, so GETs are retried on 5xx and timeouts with
+    backoff, POSTs only when the connection never opened, and 429s go
+    straight back to the caller (with their Retry-After) for its rate
+    limiter to handle. An injected timeout costs `latency`, not the full
+    read timeout.
+    """
+
+    def __init__(self, path, latency=0.0, errors=None, retry_after=1, seed=None, sleep=time.sleep, **kwargs):
+        super().__init__(**kwargs)
+        self.exchanges = load_recording(path)
+        self.by_key = {}
+        self.by_url = {}
+        for exchange in self.exchanges:
+            self.by_key.setdefault((exchange["method"], exchange["url"], exchange["query"]), []).append(exchange)
+            self.by_url.setdefault((exchange["method"], exchange["url"]), []).append(exchange)
+        self.latency = latency
+        self.mean_elapsed = sum(e["elapsed"] for e in self.exchanges) / len(self.exchanges) if self.exchanges else 0.0
+        self.errors = dict(errors or {})
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.served = {}     # request key -> responses handed out so far
+        self.injected = {}   # error kind -> count
+        self.unmatched = 0
+
+    def _roll(self):
+        """The error to inject on this attempt, if any"""
+        with self.lock:
+            roll = self.random.random()
+            for kind, rate in self.errors.items():
+                if roll < rate:
+                    self.injected[kind] = self.injected.get(kind, 0) + 1
+                    return kind
+                roll -= rate
+        return None
+
+    def _next(self, key):
+        with self.lock:
+            recorded = self.by_key.get(key) or self.by_url.get(key[:2])
+            if not recorded:
+                self.unmatched += 1
+                return None
+            served = self.served.get(key, 0)
+            self.served[key] = served + 1
+            return recorded[min(served, len(recorded) - 1)]
+
+    def _attempt(self, key):
+        """One try: an injected failure or the next recorded answer. Returns (status, headers, body)."""
+        method, url, _ = key
+        kind = self._roll()
+        # Injected failures happen before the server sees anything, so they don't use up a recording
+        exchange = self._next(key) if kind is None else None
+        if self.latency == "recorded":
+            delay = exchange["elapsed"] if exchange else self.mean_elapsed
+        else:
+            delay = self.latency
+        if delay:
+            self.sleep(delay)
+
+        if kind == "connect":
+            raise NewConnectionError(None, f"injected connection failure for {method} {url}")
+        if kind == "timeout":
+            raise ReadTimeoutError(None, url, "injected read timeout")
+        if kind == "429":
+            # Whole seconds: urllib3 rejects a fractional Retry-After
+            return 429, {"Retry-After": str(int(self.retry_after))}, json.dumps({"message": "Too many requests"})
+        if kind == "5xx":
+            return 503, {}, "Service Unavailable"
+        if exchange is None:
+            return 404, {}, json.dumps({"message": f"No recording for {method} {url}"})
+        return exchange["status"], exchange["headers"], exchange["body"]
+
+    def send(self, method, url, **kwargs):
+        key = request_key(method, url, kwargs.get("params"))
+        method, base, query = key
+        retry = self._retry()
+        while True:
+            try:
+                status, headers, body = self._attempt(key)
+            except (NewConnectionError, ReadTimeoutError) as e:
+                try:
+                    retry = retry.increment(method, base, error=e)
+                except MaxRetryError as exhausted:
+                    raise _requests_error(exhausted.reason) from exhausted
+                except (NewConnectionError, ReadTimeoutError) as not_retried:
+                    raise _requests_error(not_retried) from not_retried
+                self.sleep(retry.get_backoff_time())
+                continue
+
+            raw = HTTPResponse(body=b"", headers=headers, status=status, preload_content=False)
+            if retry.is_retry(method, status, has_retry_after="retry-after" in {k.lower() for k in headers}):
+                try:
+                    retry = retry.increment(method, base, response=raw)
+                except MaxRetryError:
+                    # Transport sets raise_on_status=False: the caller gets the last answer
+                    return _response(base, query, status, headers, body)
+                wait = retry.get_retry_after(raw) if retry.respect_retry_after_header else None
+                self.sleep(wait if wait is not None else retry.get_backoff_time())
+                continue
+            return _response(base, query, status, headers, body)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "recorded": len(self.exchanges),
+                "served": sum(self.served.values()),
+                "unmatched": self.unmatched,
+                "injected": dict(self.injected),
+            }
+
+
+def _requests_error(error):
+    """The exception requests itself would raise for this urllib3 error"""
+    if isinstance(error, NewConnectionError):
+        return requests.exceptions.ConnectionError(error)
+    if isinstance(error, ReadTimeoutError):
+        return requests.exceptions.ReadTimeout(error)
+    return requests.exceptions.RetryError(error)
+
+
+def _response(url, query, status, headers, body):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = f"{url}?{query}" if query else url
+    try:
+        response.reason = HTTPStatus(status).phrase
+    except ValueError:
+        response.reason = ""
+    return response
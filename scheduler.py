@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+
+
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def wait(self, event, timeout):
+        """Wait up to timeout seconds for event. Returns True if it was set."""
+        return event.wait(timeout)
+
+
+class FakeClock:
+    """
+    Clock for tests and simulations: waiting moves time forward instantly,
+    so a day of schedule runs in milliseconds. Tasks can call advance() to
+    pretend they took a while.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def wait(self, event, timeout):
+        if not event.is_set():
+            self.now += max(0.0, timeout)
+        return event.is_set()
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class Task:
+    def __init__(self, name, interval, fn, jitter):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.jitter = jitter
+        self.next_run = 0.0
+        self.last_run = None
+        self.last_seconds = None
+        self.last_error = None
+        self.runs = 0
+        self.failures = 0
+
+    def status(self):
+        return {
+            "interval_s": self.interval,
+            "next_run": self.next_run,
+            "last_run": self.last_run,
+            "last_seconds": self.last_seconds,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+
+
+class Scheduler:
+    """
+    Runs tasks on their own cadences, one at a time, on the thread that
+    calls run().
+
+    Each run of a task is followed by the next one `interval` seconds after
+    it was due, give or take `jitter` (a fraction of the interval), so
+    several daemons don't hit the API in lockstep. A task that overruns
+    its slot runs again straight away rather than trying to catch up on
+    the slots it missed. An exception is printed and recorded in status(),
+    and the task keeps its schedule.
+
+    stop() (safe from a signal handler or another thread) lets the task in
+    progress finish, then run() returns.
+    """
+
+    def __init__(self, clock=None, seed=None):
+        self.clock = clock or SystemClock()
+        self.random = random.Random(seed)
+        self.tasks = []
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self.current = None  # (task, started) while a task runs
+
+    def every(self, name, interval, fn, jitter=0.0, delay=0.0):
+        """Run fn() every `interval` seconds, the first time `delay` seconds after run() starts"""
+        task = Task(name, interval, fn, jitter)
+        task.next_run = delay
+        self.tasks.append(task)
+        return task
+
+    def _spread(self, task):
+        return task.interval * (1 + self.random.uniform(-task.jitter, task.jitter))
+
+    def run(self, until=None):
+        """Run tasks as they fall due until stop() is called or the clock passes `until`"""
+        self.started_at = self.clock.time()
+        for task in self.tasks:
+            task.next_run += self.started_at
+        while not self.stop_event.is_set() and self.tasks:
+            now = self.clock.time()
+            if until is not None and now >= until:
+                return
+            task = min(self.tasks, key=lambda t: t.next_run)
+            if task.next_run > now:
+                wake = task.next_run if until is None else min(task.next_run, until)
+                self.clock.wait(self.stop_event, wake - now)
+                continue
+            self._run_task(task)
+
+    def _run_task(self, task):
+        started = self.clock.time()
+        self.current = (task, started)
+        try:
+            task.fn()
+            task.last_error = None
+        except Exception as e:
+            task.failures += 1
+            task.last_error = str(e) or type(e).__name__
+            print(f"{task.name} failed: {task.last_error}")
+        finally:
+            self.current = None
+        finished = self.clock.time()
+        task.runs += 1
+        task.last_run = started
+        task.last_seconds = finished - started
+        task.next_run = max(task.next_run + self._spread(task), finished)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def status(self):
+        """Health and per-task state, for the /health endpoint"""
+        now = self.clock.time()
+        current = self.current
+        # A task that's been running, or waiting its turn, for a whole extra interval means we're stuck
+        overdue = [task.name for task in self.tasks if now - task.next_run > task.interval]
+        if current is not None and now - current[1] > current[0].interval and current[0].name not in overdue:
+            overdue.append(current[0].name)
+        return {
+            "ok": not self.stop_event.is_set() and not overdue,
+            "stopping": self.stop_event.is_set(),
+            "uptime_s": now - self.started_at if self.started_at is not None else 0.0,
+            "running": current[0].name if current else None,
+            "overdue": overdue,
+            "tasks": {task.name: task.status() for task in self.tasks},
+        }
@@ -2,10 +2,16 @@ import streamlit as st
 import os
 import time
 from datetime import datetime
+from categories import get_category
+from metrics import counter_total, load_report
+from refresher import Refresher
 from groupme_internships import (
     get_internship_info, 
-    topic_handler, 
-    post_to_subgroup,
+    post_all_internships,
+    HTTP_CACHE,
+    LABEL_CACHE,
+    METRICS_REPORT_PATH,
+    SUBGROUPS,
     CS_ID, ENGINEERING_ID, MED_ID, LAW_ID, BUSINESS_ID, HUMANITIES_ID
 )
 
@@ -25,34 +31,114 @@ if not all([CS_ID, ENGINEERING_ID, MED_ID, LAW_ID, BUSINESS_ID, HUMANITIES_ID]):
     st.error("⚠️ Missing environment variables! Please check your .env file.")
     st.stop()
 
-# Initialize session state
-if 'data' not in st.session_state:
-    st.session_state.data = None
-if 'last_fetch' not in st.session_state:
-    st.session_state.last_fetch = None
+# Seconds between background refreshes; fetching sooner than the response cache TTL would only hit the cache
+DASHBOARD_REFRESH = float(os.environ.get("DASHBOARD_REFRESH", HTTP_CACHE.ttl))
+
+def load_internships(report):
+    """Fetch and classify for the refresher, reporting page progress"""
+    data = get_internship_info(on_page=lambda page, total: report(f"Fetched page {page}/{total}", page / total))
+    if isinstance(data, str):
+        raise RuntimeError(data)
+    return data
+
+@st.cache_resource
+def get_refresher():
+    """One refresher per server process, so every session and tab shares its data and its fetches"""
+    return Refresher(load_internships, interval=DASHBOARD_REFRESH).start()
+
+def post_category(key, data):
+    """
+    Post a category's unposted jobs to the subgroups that take it, through the
+    job store and outbox like a scheduled run, so nothing is posted twice
+    """
+    subgroups = [subgroup for subgroup in SUBGROUPS if key in subgroup.categories]
+    return post_all_internships(data, subgroups)
+
+def subgroup_button(key, data):
+    category = get_category(key)
+    if st.button(f"{category.emoji} {category.name} Subgroup", use_container_width=True):
+        if data.get(category.key):
+            with st.spinner(f"Posting to {category.name} subgroup..."):
+                results = post_category(category.key, data)
+            if results:
+                st.success(f"✅ Posted {sum(r.ok for r in results)}/{len(results)} message(s) to {category.name} subgroup!")
+            else:
+                st.info(f"ℹ️ Everything in {category.name} has already been posted.")
+        else:
+            st.info(f"ℹ️ No {category.name} internships available.")
+
+# The shared dataset; fetching happens on the refresher's thread, never in this script
+refresher = get_refresher()
 
 # Sidebar with bot status and controls
 st.sidebar.header("🤖 Bot Status")
 
 # Fetch data button
 if st.sidebar.button("🔄 Fetch Latest Internships", type="primary"):
-    with st.sidebar:
-        with st.spinner("Fetching internships..."):
-            st.session_state.data = get_internship_info()
-            st.session_state.last_fetch = datetime.now()
-            st.success("✅ Data fetched successfully!")
+    if not refresher.request():
+        st.sidebar.info("⏳ A fetch is already running, showing its progress.")
+
+state = refresher.snapshot()
+data = state["data"]
+
+if state["running"]:
+    text, fraction = state["status"]
+    st.sidebar.progress(min(fraction, 1.0), text=f"Fetching internships... {text}")
+if state["error"]:
+    st.sidebar.error(f"❌ Last fetch failed: {state['error']}")
 
 # Show last fetch time
-if st.session_state.last_fetch:
-    st.sidebar.info(f"📅 Last fetched: {st.session_state.last_fetch.strftime('%Y-%m-%d %H:%M:%S')}")
+if state["fetched_at"]:
+    st.sidebar.info(f"📅 Last fetched: {datetime.fromtimestamp(state['fetched_at']).strftime('%Y-%m-%d %H:%M:%S')}")
 
 # Show data summary if available
-if st.session_state.data and isinstance(st.session_state.data, dict):
+if data:
     st.sidebar.header("📊 Data Summary")
-    for category, jobs in st.session_state.data.items():
+    for category, jobs in data.items():
         if jobs:  # Only show categories with jobs
             st.sidebar.metric(category, len(jobs))
 
+# Show how much RapidAPI quota the response cache has saved
+cache_stats = HTTP_CACHE.stats()
+if cache_stats["hits"] or cache_stats["misses"] or cache_stats["revalidated"]:
+    st.sidebar.header("💾 API Cache")
+    st.sidebar.metric("Requests saved", cache_stats["requests_saved"])
+    st.sidebar.caption(
+        f"{cache_stats['hits']} hits · {cache_stats['revalidated']} revalidated · "
+        f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)"
+    )
+
+# And how many jobs were labelled without re-running the classifier
+label_stats = LABEL_CACHE.stats()
+if label_stats["hits"] or label_stats["disk_hits"] or label_stats["misses"]:
+    st.sidebar.header("🏷️ Label Cache")
+    st.sidebar.metric("Labels reused", label_stats["hits"] + label_stats["disk_hits"])
+    st.sidebar.caption(
+        f"{label_stats['hits']} memory · {label_stats['disk_hits']} disk · "
+        f"{label_stats['misses']} classified ({label_stats['hit_rate']:.0%} hit rate)"
+    )
+
+# Where the last scheduled run spent its time (written by groupme_internships.py)
+run_report = load_report(METRICS_REPORT_PATH) if METRICS_REPORT_PATH else None
+if run_report:
+    st.sidebar.header("⏱️ Last Run")
+    st.sidebar.metric("Duration", f"{run_report['duration_s']:.1f}s")
+    st.sidebar.caption(f"Started {run_report['started_at']}")
+    if run_report["stages"]:
+        st.sidebar.bar_chart({name: stage["seconds"] for name, stage in run_report["stages"].items()})
+    st.sidebar.caption(
+        f"{counter_total(run_report, 'pages_fetched_total')} pages · "
+        f"{counter_total(run_report, 'duplicates_removed_total')} duplicates removed · "
+        f"{counter_total(run_report, 'posts_total', result='sent')} posts sent · "
+        f"{counter_total(run_report, 'posts_total', result='failed')} failed · "
+        f"{counter_total(run_report, 'fetch_retries_total') + counter_total(run_report, 'post_retries_total')} retries"
+    )
+    for series in run_report["histograms"].get("http_request_seconds", []):
+        st.sidebar.caption(
+            f"{series['labels']['method']} {series['labels']['host']}: {series['count']} requests, "
+            f"p50 {series['p50'] * 1000:.0f}ms · p95 {series['p95'] * 1000:.0f}ms"
+        )
+
 # Main content area
 col1, col2 = st.columns([2, 1])
 
@@ -60,10 +146,11 @@ with col1:
     st.header("🎯 Post to Subgroups")
     
     # Check if data is available
-    if st.session_state.data is None:
-        st.warning("📥 Please fetch internship data first using the sidebar button.")
-    elif isinstance(st.session_state.data, str):
-        st.error(f"❌ Error fetching data: {st.session_state.data}")
+    if data is None:
+        if state["running"]:
+            st.info("⏳ Fetching internships, this page updates when they're in.")
+        else:
+            st.warning("📥 Please fetch internship data first using the sidebar button.")
     else:
         # Individual subgroup buttons
         st.subheader("Individual Subgroups")
@@ -71,121 +158,51 @@ with col1:
         col_a, col_b, col_c = st.columns(3)
         
         with col_a:
-            if st.button("🖥️ CS/IT Subgroup", use_container_width=True):
-                if st.session_state.data.get("CS/IT"):
-                    with st.spinner("Posting to CS/IT subgroup..."):
-                        cs_messages = topic_handler("CS/IT", st.session_state.data)
-                        for message in cs_messages:
-                            post_to_subgroup(message, CS_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(cs_messages)} message(s) to CS/IT subgroup!")
-                else:
-                    st.info("ℹ️ No CS/IT internships available.")
-            
-            if st.button("🩺 Health Sciences Subgroup", use_container_width=True):
-                if st.session_state.data.get("Health Sciences"):
-                    with st.spinner("Posting to Health Sciences subgroup..."):
-                        health_messages = topic_handler("Health Sciences", st.session_state.data)
-                        for message in health_messages:
-                            post_to_subgroup(message, MED_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(health_messages)} message(s) to Health Sciences subgroup!")
-                else:
-                    st.info("ℹ️ No Health Sciences internships available.")
+            subgroup_button("CS/IT", data)
+            subgroup_button("Health Sciences", data)
         
         with col_b:
-            if st.button("🛠️ Engineering Subgroup", use_container_width=True):
-                if st.session_state.data.get("Engineering"):
-                    with st.spinner("Posting to Engineering subgroup..."):
-                        eng_messages = topic_handler("Engineering", st.session_state.data)
-                        for message in eng_messages:
-                            post_to_subgroup(message, ENGINEERING_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(eng_messages)} message(s) to Engineering subgroup!")
-                else:
-                    st.info("ℹ️ No Engineering internships available.")
-            
-            if st.button("⚖️ Social Sciences/Law Subgroup", use_container_width=True):
-                if st.session_state.data.get("Social Sciences / Law"):
-                    with st.spinner("Posting to Social Sciences/Law subgroup..."):
-                        social_messages = topic_handler("Social Sciences/Law", st.session_state.data)
-                        for message in social_messages:
-                            post_to_subgroup(message, LAW_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(social_messages)} message(s) to Social Sciences/Law subgroup!")
-                else:
-                    st.info("ℹ️ No Social Sciences/Law internships available.")
+            subgroup_button("Engineering", data)
+            subgroup_button("Social Sciences / Law", data)
         
         with col_c:
-            if st.button("💼 Business Subgroup", use_container_width=True):
-                if st.session_state.data.get("Business"):
-                    with st.spinner("Posting to Business subgroup..."):
-                        business_messages = topic_handler("Business", st.session_state.data)
-                        for message in business_messages:
-                            post_to_subgroup(message, BUSINESS_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(business_messages)} message(s) to Business subgroup!")
-                else:
-                    st.info("ℹ️ No Business internships available.")
-            
-            if st.button("🎨 Humanities Subgroup", use_container_width=True):
-                if st.session_state.data.get("Humanities"):
-                    with st.spinner("Posting to Humanities subgroup..."):
-                        humanities_messages = topic_handler("Humanities", st.session_state.data)
-                        for message in humanities_messages:
-                            post_to_subgroup(message, HUMANITIES_ID)
-                            time.sleep(1)
-                    st.success(f"✅ Posted {len(humanities_messages)} message(s) to Humanities subgroup!")
-                else:
-                    st.info("ℹ️ No Humanities internships available.")
+            subgroup_button("Business", data)
+            subgroup_button("Humanities", data)
         
         # Post to all subgroups button
         st.markdown("---")
         st.subheader("🚀 Post to All Subgroups")
         
         if st.button("📢 POST TO ALL SUBGROUPS", type="primary", use_container_width=True):
-            total_messages = 0
-            progress_bar = st.progress(0)
             status_text = st.empty()
             
-            categories = [
-                ("CS/IT", CS_ID, "🖥️"),
-                ("Engineering", ENGINEERING_ID, "🛠️"), 
-                ("Health Sciences", MED_ID, "🩺"),
-                ("Social Sciences/Law", LAW_ID, "⚖️"),
-                ("Business", BUSINESS_ID, "💼"),
-                ("Humanities", HUMANITIES_ID, "🎨")
-            ]
+            def show(result):
+                if not result.ok:
+                    st.warning(f"⚠️ {result.label} message {result.index + 1}/{result.total} failed{': ' + result.error if result.error else ''}")
+                status_text.text(f"Posted {result.label} message {result.index + 1}/{result.total}")
             
-            for i, (category, subgroup_id, emoji) in enumerate(categories):
-                status_text.text(f"Posting to {emoji} {category}...")
-                
-                if st.session_state.data.get(category.replace("/", " / ")):  # Handle category name format
-                    messages = topic_handler(category, st.session_state.data)
-                    for message in messages:
-                        post_to_subgroup(message, subgroup_id)
-                        time.sleep(1)
-                    total_messages += len(messages)
-                
-                progress_bar.progress((i + 1) / len(categories))
-                time.sleep(0.5)
+            # Every subgroup's unposted jobs go through the outbox, then out to all subgroups at once
+            with st.spinner("Posting to all subgroups..."):
+                results = post_all_internships(data, on_result=show)
             
             status_text.empty()
-            progress_bar.empty()
-            st.success(f"🎉 Successfully posted {total_messages} message(s) to all subgroups!")
+            if results:
+                st.success(f"🎉 Successfully posted {sum(r.ok for r in results)}/{len(results)} message(s) to all subgroups!")
+            else:
+                st.info("ℹ️ Everything has already been posted.")
 
 with col2:
     st.header("📋 Preview Data")
     
-    if st.session_state.data and isinstance(st.session_state.data, dict):
+    if data:
         # Show preview of each category
-        for category, jobs in st.session_state.data.items():
+        for category, jobs in data.items():
             if jobs:  # Only show categories with jobs
                 with st.expander(f"{category} ({len(jobs)} jobs)"):
-                    for i, (company, title, url) in enumerate(jobs[:3], 1):  # Show first 3
-                        st.write(f"**{i}. {company}**")
-                        st.write(f"   Position: {title}")
-                        st.write(f"   URL: {url}")
+                    for i, job in enumerate(jobs[:3], 1):  # Show first 3
+                        st.write(f"**{i}. {job.company}**")
+                        st.write(f"   Position: {job.position}")
+                        st.write(f"   URL: {job.link}")
                         st.write("---")
                     
                     if len(jobs) > 3:
@@ -195,3 +212,8 @@ with col2:
 st.markdown("---")
 st.markdown("**🤖 Ladders GroupMe Internship Bot** - Automated internship posting to categorized subgroups")
 st.markdown("*Made with ❤️ using Streamlit*")
+
+# Keep redrawing while a fetch runs, so its progress (and then its data) shows up
+if state["running"]:
+    time.sleep(1)
+    st.rerun()
@@ -0,0 +1,137 @@
+import json
+import re
+from dataclasses import dataclass, field
+
+from categories import CATEGORIES, get_category
+
+
+@dataclass(frozen=True)
+class Subgroup:
+    """
+    One GroupMe group or subgroup we post to, and which jobs it wants.
+
+    A job goes to it when one of its labels is in `categories` and it gets
+    past the filters: with `include`, its title or company has to match
+    one of those patterns, and it mustn't match any `exclude` pattern
+    (both case-insensitive). A job with several wanted labels is filed
+    under the first of them, in `categories` order.
+
+    `token_env` names the env var holding the GroupMe token to post with
+    (ACCESS_TOKEN if None); `rate`/`burst` override POST_RATE/POST_BURST
+    for its queue, and `interval` the daemon's post interval. Subgroups with
+    the same `rate_group` share that one rate limit instead of each having it.
+    """
+    name: str                 # label in logs, metrics and the outbox
+    subgroup_id: str
+    categories: tuple         # category keys
+    tenant: str = "default"
+    include: tuple = ()
+    exclude: tuple = ()
+    token_env: str = None
+    rate: float = None
+    burst: int = None
+    interval: float = None
+    rate_group: str = None
+    _include: re.Pattern = field(default=None, init=False, repr=False, compare=False)
+    _exclude: re.Pattern = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name in ("include", "exclude"):
+            patterns = getattr(self, name)
+            if patterns:
+                object.__setattr__(self, f"_{name}", re.compile("|".join(f"(?:{p})" for p in patterns), re.I))
+
+    def wants(self, job):
+        if self._include and not (self._include.search(job.title) or self._include.search(job.organization)):
+            return False
+        return not (self._exclude and (self._exclude.search(job.title) or self._exclude.search(job.organization)))
+
+    def file_under(self, job, labels):
+        """The category this subgroup would post a job with these labels under, or None"""
+        for category in self.categories:
+            if category in labels:
+                return category if self.wants(job) else None
+        return None
+
+
+def default_subgroups(placeholder=None):
+    """
+    The original six subgroups, one per category, with ids from CS_ID ...
+    HUMANITIES_ID. A category whose id isn't set is left out (see
+    unconfigured_categories), or, with `placeholder`, gets
+    placeholder.format(category key) instead.
+    """
+    subgroups = []
+    for category in CATEGORIES:
+        subgroup_id = category.subgroup_id
+        if not subgroup_id and placeholder:
+            subgroup_id = placeholder.format(category.key)
+        if subgroup_id:
+            subgroups.append(Subgroup(category.name, subgroup_id, (category.key,)))
+    return subgroups
+
+
+def unconfigured_categories():
+    """The categories default_subgroups() leaves out because their subgroup id isn't set"""
+    return [category for category in CATEGORIES if not category.subgroup_id]
+
+
+def _categories(names, where):
+    keys = []
+    for name in names:
+        category = get_category(name)
+        if category is None:
+            raise ValueError(f"{where}: unknown category {name!r}")
+        keys.append(category.key)
+    return tuple(keys)
+
+
+def load_tenants(path):
+    """
+    Subgroups for every tenant in a JSON file like:
+
+        {"tenants": [{
+            "name": "state-u",
+            "token_env": "STATE_U_TOKEN",
+            "post_rate": 1, "post_burst": 3, "post_interval": 3600,
+            "subgroups": [
+                {"id": "1001", "categories": ["CS/IT", "Engineering"], "exclude": ["unpaid"]},
+                {"id": "1002", "categories": ["Business"], "include": ["finance", "accounting"]}
+            ]
+        }]}
+
+    Everything but the tenant name, subgroup ids and categories is
+    optional, and a subgroup's own token_env/post_* settings win over its
+    tenant's. A tenant's post_rate/post_burst is one limit for all of its
+    subgroups that don't set their own. Raises ValueError on unknown categories or a subgroup id
+    used twice, so a typo can't quietly route jobs to the wrong group.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    subgroups = []
+    seen = {}
+    for tenant in config.get("tenants", []):
+        for entry in tenant.get("subgroups", []):
+            subgroup_id = str(entry["id"])
+            where = f"{path}: tenant {tenant['name']!r}, subgroup {subgroup_id}"
+            if subgroup_id in seen:
+                raise ValueError(f"{where}: already used by {seen[subgroup_id]!r}")
+            categories = _categories(entry.get("categories", []), where)
+            if not categories:
+                raise ValueError(f"{where}: no categories")
+            settings = {**tenant, **entry}
+            name = entry.get("name") or f"{tenant['name']} {'+'.join(get_category(key).name for key in categories)}"
+            seen[subgroup_id] = name
+            subgroups.append(Subgroup(
+                name, subgroup_id, categories,
+                tenant=tenant["name"],
+                include=tuple(entry.get("include", ())),
+                exclude=tuple(entry.get("exclude", ())),
+                token_env=settings.get("token_env"),
+                rate=settings.get("post_rate"),
+                burst=settings.get("post_burst"),
+                interval=settings.get("post_interval"),
+                rate_group=subgroup_id if "post_rate" in entry or "post_burst" in entry else f"tenant {tenant['name']}",
+            ))
+    return subgroups
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+# Nothing the tests import should read or write state files in the checkout
+for name in ("HTTP_CACHE_PATH", "LABEL_CACHE_PATH", "PATTERN_CACHE_PATH", "METRICS_REPORT_PATH"):
+    os.environ.setdefault(name, "")
@@ -0,0 +1,33 @@
+import pytest
+
+from bench_classify import GOLDEN, legacy_classifier, synthetic_jobs
+from classifier import CompiledClassifier
+from groupme_internships import CLASSIFIER, CS_TOKENS, FILTERS, classify_job
+from job import Job
+from job_table import JobTable
+
+
+@pytest.mark.parametrize("title, description, expected", GOLDEN)
+def test_golden(title, description, expected):
+    assert classify_job(Job(title=title, description=description)) == expected
+
+
+def test_matches_per_pattern_classifier():
+    legacy = legacy_classifier()
+    for job in synthetic_jobs(2000, description_words=60, seed=1):
+        assert classify_job(job) == legacy(job), (job.title, job.description)
+
+
+def test_classify_table_matches_classify_text():
+    jobs = [Job(title=title, description=description) for title, description, _ in GOLDEN]
+    jobs += synthetic_jobs(500, description_words=60, seed=2)
+    table = JobTable.from_jobs(jobs)
+    CLASSIFIER.classify_table(table)
+    assert [CLASSIFIER.labels[label_id] for label_id in table.category] == [classify_job(job) for job in jobs]
+
+
+def test_multi_alternative_tokens_keep_their_boundaries():
+    # Only the outer ends of "custodian|janitor" are word-bounded, as with rf"\b{token}\b"
+    classifier = CompiledClassifier(CS_TOKENS, ["custodian|janitor"], FILTERS)
+    assert CompiledClassifier.CS_BLOCK in classifier.hits("software custodians")
+    assert CompiledClassifier.CS_BLOCK not in classifier.hits("software janitors")
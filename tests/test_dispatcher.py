@@ -0,0 +1,65 @@
+import threading
+
+from dispatcher import PostDispatcher
+
+
+class FakeGroupMe:
+    """post_to_subgroup stand-in that fails each text the number of times given in `failures`"""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.attempts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text, subgroup_id, source_guid=None):
+        with self.lock:
+            self.attempts.append((subgroup_id, text, source_guid))
+            if self.failures.get(text, 0):
+                self.failures[text] -= 1
+                return False
+        return True
+
+
+def dispatcher(post, **kwargs):
+    return PostDispatcher(post, rate=1000, burst=1000, sleep=lambda _: None, **kwargs)
+
+
+def test_keeps_each_subgroups_order():
+    groupme = FakeGroupMe()
+    posts = dispatcher(groupme)
+    for i in range(20):
+        posts.enqueue("cs" if i % 2 else "biz", f"message {i}")
+    results = posts.run()
+    assert all(result.ok for result in results)
+    for subgroup_id in ("cs", "biz"):
+        sent = [text for group, text, _ in groupme.attempts if group == subgroup_id]
+        assert sent == sorted(sent, key=lambda text: int(text.split()[1]))
+
+
+def test_retries_with_the_same_guid():
+    groupme = FakeGroupMe(failures={"hello": 2})
+    posts = dispatcher(groupme, max_attempts=3)
+    guid = posts.enqueue("cs", "hello")
+    [result] = posts.run()
+    assert (result.ok, result.attempts, result.source_guid) == (True, 3, guid)
+    assert [source_guid for _, _, source_guid in groupme.attempts] == [guid] * 3
+
+
+def test_halt_on_failure_holds_back_only_that_subgroup():
+    groupme = FakeGroupMe(failures={"cs 1": 5})
+    posts = dispatcher(groupme, max_attempts=2, halt_on_failure=True)
+    for text in ("cs 1", "cs 2", "cs 3"):
+        posts.enqueue("cs", text, label="CS/IT")
+    posts.enqueue("biz", "biz 1")
+    cs = sorted((result for result in posts.run() if result.subgroup_id == "cs"), key=lambda result: result.index)
+    assert [(result.ok, result.attempts) for result in cs] == [(False, 2), (False, 0), (False, 0)]
+    assert ("biz", "biz 1") in [(group, text) for group, text, _ in groupme.attempts]
+    assert [text for group, text, _ in groupme.attempts if group == "cs"] == ["cs 1", "cs 1"]
+
+
+def test_without_halt_later_messages_still_go():
+    groupme = FakeGroupMe(failures={"cs 1": 5})
+    posts = dispatcher(groupme, max_attempts=1)
+    posts.enqueue("cs", "cs 1")
+    posts.enqueue("cs", "cs 2")
+    assert sorted((result.index, result.ok) for result in posts.run()) == [(0, False), (1, True)]
@@ -0,0 +1,48 @@
+from corpus import generate_jobs
+from fetcher import FetchPlanner, PageFetcher
+from ratelimit import TokenBucket
+from stub_server import StubAPI
+from transport import Transport
+
+
+def fetcher(api, **kwargs):
+    kwargs.setdefault("limiter", TokenBucket(rate=1000))
+    return PageFetcher({}, base_url=api.url, concurrency=4, get=Transport().get, **kwargs)
+
+
+def test_fetches_every_page_in_order():
+    jobs = generate_jobs(95, duplicate_rate=0, seed=1)
+    with StubAPI(jobs=jobs) as api:
+        fetched = fetcher(api).fetch_all(max_pages=20)
+    assert [job["url"] for job in fetched] == [job["url"] for job in jobs]
+
+
+def test_stops_at_a_page_of_known_jobs():
+    jobs = generate_jobs(200, duplicate_rate=0, seed=2)
+    known = {job["url"] for job in jobs[50:]}
+    with StubAPI(jobs=jobs) as api:
+        fetched = fetcher(api, known=lambda job: job["url"] in known).fetch_all(max_pages=20)
+        requests = api.requests
+    assert [job["url"] for job in fetched[:50]] == [job["url"] for job in jobs[:50]]
+    assert requests < 20
+
+
+def test_retries_throttled_pages():
+    jobs = generate_jobs(60, duplicate_rate=0, seed=3)
+    with StubAPI(jobs=jobs, quota_per_sec=3) as api:
+        fetched = fetcher(api, limiter=TokenBucket(rate=20), max_retries=10).fetch_all(max_pages=10)
+        throttled = api.throttled
+    assert len(fetched) == 60
+    assert throttled > 0
+
+
+def test_planner_fetches_each_shard():
+    jobs = generate_jobs(80, duplicate_rate=0, seed=4)
+    for i, job in enumerate(jobs):
+        job["locations_derived"] = ["Austin, United States" if i % 2 else "Toronto, Canada"]
+    limiter = TokenBucket(rate=1000)
+    with StubAPI(jobs=jobs) as api:
+        shards = [fetcher(api, params={"location_filter": country}, limiter=limiter)
+                  for country in ("United States", "Canada")]
+        fetched = FetchPlanner(shards).fetch_all(max_pages=10)
+    assert sorted(job["url"] for job in fetched) == sorted(job["url"] for job in jobs)
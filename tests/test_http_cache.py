@@ -0,0 +1,125 @@
+from http_cache import HTTPCache
+
+URL = "https://api.example.com/jobs"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    from_cache = False
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeGet:
+    """Stands in for Transport.get: answers from a list of responses, recording each request's headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, headers=None, params=None, **kwargs):
+        self.requests.append((url, dict(headers or {}), params))
+        return self.responses.pop(0)
+
+
+def test_fresh_entries_skip_the_network():
+    clock = Clock()
+    cache = HTTPCache(ttl=60, clock=clock)
+    get = FakeGet(FakeResponse(200, b"page"))
+    assert cache.fetch(get, URL, params={"offset": 0}).content == b"page"
+    clock.now += 59
+    assert cache.fetch(get, URL, params={"offset": 0}).content == b"page"
+    assert len(get.requests) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_params_are_part_of_the_key():
+    cache = HTTPCache(ttl=60, clock=Clock())
+    get = FakeGet(FakeResponse(200, b"first"), FakeResponse(200, b"second"))
+    cache.fetch(get, URL, params={"offset": 0, "limit": 10})
+    assert cache.fetch(get, URL, params={"limit": 10, "offset": 0}).content == b"first"
+    assert cache.fetch(get, URL, params={"offset": 10, "limit": 10}).content == b"second"
+
+
+def test_expired_entry_without_validators_is_refetched():
+    clock = Clock()
+    cache = HTTPCache(ttl=60, clock=clock)
+    get = FakeGet(FakeResponse(200, b"old"), FakeResponse(200, b"new"))
+    cache.fetch(get, URL)
+    clock.now += 60
+    assert cache.fresh(URL) is None
+    assert cache.fetch(get, URL).content == b"new"
+    assert "If-None-Match" not in get.requests[1][1]
+
+
+def test_expired_entry_is_revalidated_with_its_etag():
+    clock = Clock()
+    cache = HTTPCache(ttl=60, clock=clock)
+    get = FakeGet(FakeResponse(200, b"page", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+                  FakeResponse(304))
+    cache.fetch(get, URL, headers={"x-key": "secret"})
+    clock.now += 120
+    response = cache.fetch(get, URL, headers={"x-key": "secret"})
+    sent = get.requests[1][1]
+    assert sent["If-None-Match"] == '"v1"' and sent["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert sent["x-key"] == "secret"
+    assert (response.status_code, response.content, response.from_cache) == (200, b"page", True)
+    assert cache.stats()["revalidated"] == 1
+
+    # A 304 makes the entry fresh again
+    clock.now += 30
+    assert cache.fetch(get, URL).content == b"page"
+    assert len(get.requests) == 2
+
+
+def test_changed_page_replaces_the_entry():
+    clock = Clock()
+    cache = HTTPCache(ttl=60, clock=clock)
+    get = FakeGet(FakeResponse(200, b"v1", {"ETag": '"v1"'}), FakeResponse(200, b"v2", {"ETag": '"v2"'}))
+    cache.fetch(get, URL)
+    clock.now += 60
+    assert cache.fetch(get, URL).content == b"v2"
+    assert cache.fresh(URL).content == b"v2"
+
+
+def test_errors_are_not_cached():
+    cache = HTTPCache(ttl=60, clock=Clock())
+    get = FakeGet(FakeResponse(429), FakeResponse(200, b"page"))
+    assert cache.fetch(get, URL).status_code == 429
+    assert cache.fetch(get, URL).content == b"page"
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    clock = Clock()
+    cache = HTTPCache(path=str(tmp_path / "cache.db"), ttl=60, max_entries=2, clock=clock)
+    get = FakeGet(*(FakeResponse(200, f"page {i}".encode()) for i in range(4)))
+    for offset in (0, 10, 0, 20):  # the second fetch of 0 is a hit that leaves 10 least recently used
+        cache.fetch(get, URL, params={"offset": offset})
+        clock.now += 1
+    assert cache.fresh(URL, {"offset": 10}) is None
+    assert cache.fresh(URL, {"offset": 0}) is not None
+    assert cache.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 2
+
+
+def test_entries_survive_a_new_process(tmp_path):
+    path = str(tmp_path / "cache.db")
+    clock = Clock()
+    HTTPCache(path=path, ttl=60, clock=clock).fetch(FakeGet(FakeResponse(200, b"page")), URL)
+    reopened = HTTPCache(path=path, ttl=60, clock=clock)
+    assert reopened.fresh(URL).content == b"page"
+
+
+def test_nothing_is_written_until_first_use(tmp_path):
+    path = tmp_path / "cache.db"
+    HTTPCache(path=str(path))
+    assert not path.exists()
@@ -0,0 +1,145 @@
+import pytest
+
+import groupme_internships as g
+from dispatcher import PostDispatcher
+from job_store import JobStore
+from outbox import Outbox
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeGroupMe:
+    """post_to_subgroup stand-in: fails the texts in `failing`, records every attempt"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.attempts = []  # (subgroup_id, text, source_guid)
+
+    def __call__(self, text, subgroup_id, source_guid=None):
+        self.attempts.append((subgroup_id, text, source_guid))
+        return text not in self.failing
+
+
+@pytest.fixture
+def store():
+    with JobStore(":memory:") as store:
+        yield store
+
+
+def run(outbox, post):
+    """One run's worth of posting: everything due, through a fresh dispatcher"""
+    dispatcher = PostDispatcher(post, rate=1000, burst=1000, max_attempts=1, halt_on_failure=True, sleep=lambda _: None)
+    return outbox.deliver(dispatcher)
+
+
+def status(store, source_guid):
+    return store.conn.execute("SELECT status, attempts FROM outbox WHERE source_guid = ?", (source_guid,)).fetchone()
+
+
+def test_enqueue_is_durable_and_marks_jobs_posted(store):
+    outbox = Outbox(store=store)
+    guid = outbox.enqueue("cs", "hello", label="CS/IT", job_ids=["1", "2"])
+    assert [row['source_guid'] for row in outbox.due()] == [guid]
+    posted = store.conn.execute("SELECT job_id FROM posts WHERE subgroup_id = 'cs' ORDER BY job_id").fetchall()
+    assert [row[0] for row in posted] == ["1", "2"]
+
+
+def test_sent_messages_leave_the_queue(store):
+    outbox = Outbox(store=store)
+    guid = outbox.enqueue("cs", "hello")
+    run(outbox, FakeGroupMe())
+    assert tuple(status(store, guid)) == ("sent", 1)
+    assert outbox.due() == []
+
+
+def test_failed_message_resumes_with_the_same_guid(store):
+    clock = Clock()
+    outbox = Outbox(store=store, clock=clock)
+    guid = outbox.enqueue("cs", "hello")
+    groupme = FakeGroupMe(failing={"hello"})
+    run(outbox, groupme)
+    assert tuple(status(store, guid)) == ("pending", 1)
+    assert outbox.due() == []  # still backing off
+
+    clock.now += 3600
+    groupme.failing.clear()
+    run(outbox, groupme)
+    assert [source_guid for _, _, source_guid in groupme.attempts] == [guid, guid]
+    assert tuple(status(store, guid)) == ("sent", 2)
+
+
+def test_dead_letter_after_max_attempts(store):
+    clock = Clock()
+    outbox = Outbox(store=store, max_attempts=3, clock=clock)
+    guid = outbox.enqueue("cs", "hello")
+    groupme = FakeGroupMe(failing={"hello"})
+    for _ in range(5):
+        run(outbox, groupme)
+        clock.now += 24 * 3600
+    assert len(groupme.attempts) == 3
+    assert tuple(status(store, guid)) == ("dead", 3)
+    assert outbox.counts() == {"dead": 1}
+
+
+def test_messages_wait_behind_one_backing_off(store):
+    clock = Clock()
+    outbox = Outbox(store=store, clock=clock)
+    outbox.enqueue("cs", "cs 1")
+    groupme = FakeGroupMe(failing={"cs 1"})
+    run(outbox, groupme)
+    outbox.enqueue("cs", "cs 2")
+    outbox.enqueue("biz", "biz 1")
+    assert [row['text'] for row in outbox.due()] == ["biz 1"]
+    assert outbox.backing_off() == {"cs"}
+
+    clock.now += 3600
+    groupme = FakeGroupMe()
+    run(outbox, groupme)
+    assert [text for subgroup_id, text, _ in groupme.attempts if subgroup_id == "cs"] == ["cs 1", "cs 2"]
+
+
+def test_failure_holds_back_the_rest_of_the_run(store):
+    clock = Clock()
+    outbox = Outbox(store=store, clock=clock)
+    for text in ("cs 1", "cs 2", "cs 3"):
+        outbox.enqueue("cs", text)
+    groupme = FakeGroupMe(failing={"cs 1"})
+    run(outbox, groupme)
+    assert [text for _, text, _ in groupme.attempts] == ["cs 1"]
+    assert outbox.counts() == {"pending": 3}
+    assert [row['attempts'] for row in store.conn.execute("SELECT attempts FROM outbox ORDER BY id")] == [1, 0, 0]
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+
+
+class FakeTransport:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.payloads = []
+
+    def post(self, url, params=None, json=None):
+        self.payloads.append(json)
+        return FakeResponse(self.status_code)
+
+
+@pytest.mark.parametrize("status_code, sent", [(201, True), (409, True), (500, False)])
+def test_post_to_subgroup_counts_409_as_sent(monkeypatch, store, status_code, sent):
+    transport = FakeTransport(status_code)
+    monkeypatch.setattr(g, "TRANSPORT", transport)
+    monkeypatch.setattr(g, "DRY_RUN", False)
+    monkeypatch.setattr(g, "ACCESS_TOKEN", "token")
+    outbox = Outbox(store=store)
+    guid = outbox.enqueue("cs", "hello")
+    run(outbox, g.post_to_subgroup)
+    assert transport.payloads[0]["message"]["source_guid"] == guid
+    assert status(store, guid)['status'] == ("sent" if sent else "pending")
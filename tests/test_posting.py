@@ -0,0 +1,40 @@
+import contextlib
+import io
+
+import pytest
+
+import groupme_internships as g
+from corpus import generate_jobs
+from stub_server import StubAPI
+from tenants import Subgroup
+
+SUBGROUPS = [Subgroup("CS/IT", "cs", ("CS/IT",)), Subgroup("Business", "biz", ("Business",))]
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    with StubAPI(jobs=generate_jobs(60, duplicate_rate=0, seed=8)) as api:
+        for name, value in {"RAPIDAPI_URL": api.url, "GROUPME_API_BASE": api.base_url, "ACCESS_TOKEN": "token",
+                            "DRY_RUN": False, "SUBGROUPS": SUBGROUPS, "TENANTS_PATH": "", "MAX_PAGES": 10,
+                            "FETCH_RATE": 1000, "POST_RATE": 1000, "POST_BURST": 1000, "METRICS_REPORT_PATH": "",
+                            "JOB_STORE_PATH": str(tmp_path / "jobs.db")}.items():
+            monkeypatch.setattr(g, name, value)
+        yield api
+
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def test_dashboard_posts_are_not_posted_again(api):
+    data = quietly(g.get_internship_info)
+    results = quietly(g.post_all_internships, data, [SUBGROUPS[0]])
+    assert results and all(result.ok for result in results)
+    assert {group for group, _ in api.messages} == {"cs"}
+
+    # Pressing the button again, or the scheduled run, only posts what's left
+    assert quietly(g.post_all_internships, data, [SUBGROUPS[0]]) == []
+    posted = len(api.messages)
+    quietly(g.post_last_week_internships)
+    assert {group for group, _ in api.messages[posted:]} == {"biz"}
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+from job import Job
+from render import GROUPME_MAX_CHARS, NO_LINK, MessageStream, pack_messages, render_entry
+
+WEEK = "10/01 - 10/08"
+
+
+def jobs(count, **fields):
+    return [Job(title=f"Software Intern {i}", organization="Acme", url=f"https://example.com/jobs/{i}", **fields)
+            for i in range(count)]
+
+
+def streamed(jobs, category="CS/IT"):
+    stream = MessageStream()
+    stream.week_range = WEEK
+    texts = [text for job in jobs for _, text, _ in stream.add(category, job)]
+    return texts + [text for _, text, _ in stream.flush()]
+
+
+def packed(jobs, category="CS/IT"):
+    return [text for text, _ in pack_messages(category, jobs, WEEK)]
+
+
+def parts(texts):
+    return [re.search(r"\(Part (\d+)(?:/(\d+))?\)", text.splitlines()[0]) for text in texts]
+
+
+def numbers(texts):
+    return [int(number) for text in texts for number in re.findall(r"^(\d+)\. ", text, re.M)]
+
+
+@pytest.mark.parametrize("render", [packed, streamed])
+def test_one_message_has_no_part_label(render):
+    texts = render(jobs(3))
+    assert len(texts) == 1
+    assert parts(texts) == [None]
+    assert numbers(texts) == [1, 2, 3]
+
+
+def test_pack_messages_numbers_parts_out_of_the_total():
+    texts = packed(jobs(40))
+    assert len(texts) > 1
+    assert [(int(match[1]), int(match[2])) for match in parts(texts)] == [(i, len(texts)) for i in range(1, len(texts) + 1)]
+    assert numbers(texts) == list(range(1, 41))
+
+
+def test_stream_numbers_parts_as_it_goes():
+    texts = streamed(jobs(40))
+    assert len(texts) > 1
+    assert [(int(match[1]), match[2]) for match in parts(texts)] == [(i, None) for i in range(1, len(texts) + 1)]
+    assert numbers(texts) == list(range(1, 41))
+
+
+def test_pack_messages_counts_jobs_per_message():
+    assert sum(count for _, count in pack_messages("CS/IT", jobs(40), WEEK)) == 40
+
+
+@pytest.mark.parametrize("render", [packed, streamed])
+@pytest.mark.parametrize("fields", [
+    {},
+    {"url": "https://example.com/" + "a" * 1000},
+    {"organization": "C" * 1500},
+    {"title": "T" * 1500},
+    {"title": "T" * 900, "organization": "C" * 900, "url": "https://example.com/" + "a" * 900},
+])
+def test_every_message_fits(render, fields):
+    batch = jobs(15)
+    batch[7] = Job(**{"title": "Intern", "organization": "Acme", "url": "https://example.com/7", **fields})
+    texts = render(batch)
+    assert all(len(text) <= GROUPME_MAX_CHARS for text in texts)
+    assert numbers(texts) == list(range(1, 16))
+
+
+def test_oversized_entry_keeps_what_fits():
+    job = Job(title="Data Science Intern", organization="Acme", url="https://example.com/" + "a" * 1000)
+    entry = render_entry(1, job, budget=300)
+    assert len(entry) <= 300
+    assert "Acme" in entry and "Data Science Intern" in entry and NO_LINK in entry
+
+    job = Job(title="T" * 500, organization="Acme", url="https://example.com/1")
+    entry = render_entry(1, job, budget=300)
+    assert len(entry) <= 300
+    assert "https://example.com/1" in entry and "…" in entry
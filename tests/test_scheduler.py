@@ -0,0 +1,64 @@
+from scheduler import FakeClock, Scheduler
+
+HOUR = 60 * 60
+
+
+def test_tasks_run_on_their_own_cadence():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    runs = {"fetch": [], "post": []}
+    scheduler.every("fetch", HOUR, lambda: runs["fetch"].append(clock.time()))
+    scheduler.every("post", HOUR / 2, lambda: runs["post"].append(clock.time()), delay=60)
+    scheduler.run(until=3 * HOUR)
+    assert runs["fetch"] == [0, HOUR, 2 * HOUR]
+    assert runs["post"] == [60 + i * HOUR / 2 for i in range(6)]
+
+
+def test_jitter_stays_within_bounds():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock, seed=1)
+    times = []
+    scheduler.every("fetch", HOUR, lambda: times.append(clock.time()), jitter=0.1)
+    scheduler.run(until=24 * HOUR)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert all(0.9 * HOUR <= gap <= 1.1 * HOUR for gap in gaps)
+    assert len(set(gaps)) > 1
+
+
+def test_failures_are_recorded_and_keep_the_schedule():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+
+    def fail():
+        raise RuntimeError("feed down")
+    scheduler.every("fetch", HOUR, fail)
+    scheduler.run(until=2 * HOUR + 1)
+    status = scheduler.status()["tasks"]["fetch"]
+    assert (status["runs"], status["failures"], status["last_error"]) == (3, 3, "feed down")
+
+
+def test_overrunning_task_runs_again_without_catching_up():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    times = []
+
+    def slow():
+        times.append(clock.time())
+        if len(times) == 1:
+            clock.advance(3.5 * HOUR)
+    scheduler.every("fetch", HOUR, slow)
+    scheduler.run(until=5 * HOUR)
+    assert times == [0, 3.5 * HOUR, 4.5 * HOUR]
+
+
+def test_stop_finishes_the_current_task():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    runs = []
+
+    def once():
+        runs.append(clock.time())
+        scheduler.stop()
+    scheduler.every("fetch", HOUR, once)
+    scheduler.run()
+    assert runs == [0]
@@ -0,0 +1,50 @@
+import pytest
+
+from bench_classify import synthetic_jobs
+from classifier import ScoredClassifier
+from corpus import generate_jobs
+from groupme_internships import CLASSIFIER, SCORER
+from job import Job
+
+# Labels under the default settings (threshold 3, title hits 3, cutoff 0.5 of the top score), best first
+PINNED = [
+    ("Software Engineer Intern", "Build backend services in Python on AWS", ["CS/IT"]),
+    ("Biomedical Engineer Intern", "Design medical devices in a clinical lab", ["Engineering", "Health Sciences"]),
+    ("Healthcare Operations Intern", "Support our clinic's operations team", ["Business", "Health Sciences"]),
+    ("Machine Learning Intern", "NLP research for clinical trials at our pharma lab", ["CS/IT"]),
+    ("Paralegal Intern", "Support our legal team", ["Social Sciences / Law"]),
+    ("Marketing Intern", "Write copy for our museum and film clients", ["Business"]),
+    ("Mechanical Engineering Intern", "CAD work on prototypes, some marketing support", ["Engineering"]),
+    ("Security Guard", "Patrol the software campus overnight", []),
+    ("Summer Camp Counselor", "Lead outdoor activities for kids", []),
+]
+
+
+@pytest.mark.parametrize("title, description, expected", PINNED)
+def test_pinned_labels(title, description, expected):
+    assert [field for field, _ in SCORER.classify(Job(title, description=description))] == expected
+
+
+def test_relative_cutoff_drops_weak_extra_labels():
+    job = Job("Machine Learning Intern", description="NLP research for clinical trials at our pharma lab")
+    assert [field for field, _ in ScoredClassifier(CLASSIFIER, relative_cutoff=0).classify(job)] == [
+        "CS/IT", "Health Sciences"]
+    assert [field for field, _ in ScoredClassifier(CLASSIFIER, relative_cutoff=0.5).classify(job)] == ["CS/IT"]
+
+
+def test_below_threshold_is_unlabelled():
+    # Two description words make 2, under the default threshold of 3
+    job = Job("Summer Intern", description="marketing and sales")
+    assert SCORER.score_batch([job])[0]["Business"] == 2.0
+    assert SCORER.classify(job) == []
+
+
+def test_corpus_postings_rarely_fan_out():
+    jobs = [Job.from_record(record) for record in generate_jobs(2000, duplicate_rate=0)]
+    fanned = sum(len(labels) > 1 for labels in SCORER.classify_batch(jobs))
+    assert fanned <= 20
+
+
+def test_batch_matches_per_job():
+    jobs = synthetic_jobs(300, description_words=200, seed=3)
+    assert SCORER.classify_batch(jobs) == [SCORER.classify(job) for job in jobs]
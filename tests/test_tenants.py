@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import groupme_internships as g
+from categories import CATEGORIES
+from job import Job
+from tenants import default_subgroups, load_tenants, unconfigured_categories
+
+STATE_U = {
+    "name": "state-u",
+    "token_env": "STATE_U_TOKEN",
+    "post_rate": 2, "post_burst": 4, "post_interval": 3600,
+    "subgroups": [
+        {"id": "1001", "categories": ["CS/IT", "Engineering"], "exclude": ["unpaid"]},
+        {"id": "1002", "categories": ["business"], "include": ["finance", "accounting"]},
+        {"id": "1003", "name": "Law", "categories": ["Social Sciences/Law"], "post_rate": 5, "token_env": "LAW_TOKEN"},
+    ],
+}
+TECH = {"name": "tech", "subgroups": [{"id": 2001, "categories": ["CS/IT"]}]}
+
+
+def write(tmp_path, *tenants):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps({"tenants": list(tenants)}))
+    return str(path)
+
+
+def test_load_tenants(tmp_path):
+    cs, business, law, tech = load_tenants(write(tmp_path, STATE_U, TECH))
+    assert (cs.name, cs.subgroup_id, cs.categories, cs.tenant) == ("state-u CS/IT+Engineering", "1001",
+                                                                   ("CS/IT", "Engineering"), "state-u")
+    assert business.categories == ("Business",)
+    assert (law.name, law.token_env, law.rate, law.burst, law.interval) == ("Law", "LAW_TOKEN", 5, 4, 3600)
+    assert (cs.token_env, cs.rate, cs.burst) == ("STATE_U_TOKEN", 2, 4)
+    assert (tech.subgroup_id, tech.token_env, tech.rate, tech.interval) == ("2001", None, None, None)
+
+
+def test_subgroup_filters(tmp_path):
+    cs, business, _ = load_tenants(write(tmp_path, STATE_U))
+    assert cs.file_under(Job(title="Software Intern", organization="Acme"), ["Engineering", "CS/IT"]) == "CS/IT"
+    assert cs.file_under(Job(title="Unpaid Software Intern", organization="Acme"), ["CS/IT"]) is None
+    assert cs.file_under(Job(title="Marketing Intern", organization="Acme"), ["Business"]) is None
+    assert business.wants(Job(title="Intern", organization="Acme Finance"))
+    assert not business.wants(Job(title="Sales Intern", organization="Acme"))
+
+
+@pytest.mark.parametrize("tenants, error", [
+    ([{"name": "a", "subgroups": [{"id": "1", "categories": ["Astrology"]}]}], "unknown category 'Astrology'"),
+    ([{"name": "a", "subgroups": [{"id": "1", "categories": []}]}], "no categories"),
+    ([{"name": "a", "subgroups": [{"id": "1", "categories": ["CS/IT"]}]},
+      {"name": "b", "subgroups": [{"id": 1, "categories": ["Business"]}]}], "already used by 'a CS/IT'"),
+])
+def test_bad_configs_are_rejected(tmp_path, tenants, error):
+    with pytest.raises(ValueError, match=error):
+        load_tenants(write(tmp_path, *tenants))
+
+
+def test_default_subgroups_skip_unset_ids(monkeypatch):
+    for category in CATEGORIES:
+        monkeypatch.delenv(category.subgroup_env, raising=False)
+    monkeypatch.setenv("CS_ID", "42")
+    assert [(subgroup.name, subgroup.subgroup_id) for subgroup in default_subgroups()] == [("CS/IT", "42")]
+    assert len(default_subgroups(placeholder="dry-run-{}")) == len(CATEGORIES)
+    assert [category.key for category in unconfigured_categories()] == [category.key for category in CATEGORIES[1:]]
+
+
+def test_tenant_subgroups_share_its_rate_limit(tmp_path, monkeypatch):
+    subgroups = load_tenants(write(tmp_path, STATE_U, TECH))
+    monkeypatch.setattr(g, "SUBGROUPS", subgroups)
+    limits = g.post_limits()
+    assert limits["1001"] is limits["1002"]
+    assert (limits["1001"].rate, limits["1001"].capacity) == (2, 4)
+    # A subgroup with its own post_rate gets its own bucket, and one with no limits uses the defaults
+    assert limits["1003"] is not limits["1001"] and limits["1003"].rate == 5
+    assert "2001" not in limits
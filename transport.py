@@ -0,0 +1,96 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class Transport:
+    """
+    Pooled keep-alive HTTP sessions, one per host.
+
+    Every request to the same host reuses a warm TCP+TLS connection from the
+    pool instead of handshaking again. Connection errors and 5xx responses
+    are retried with exponential backoff. POSTs are only retried when the
+    request never reached the server, and 429s are left to the caller's
+    rate limiter. TLS is always verified, against certifi's bundle unless
+    `verify` points somewhere else.
+
+    With a Metrics instance, every request's latency (retries included) goes
+    into the http_request_seconds histogram, labelled by method and host.
+
+    requests is only imported with the first session: it takes longer to
+    load than the rest of the bot, and plenty of callers never send anything.
+    """
+
+    def __init__(self, pool_size=10, timeout=(5, 30), retries=3, backoff=0.5, verify=True, metrics=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.verify = verify
+        self.metrics = metrics
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def _retry(self):
+        from urllib3.util.retry import Retry
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),  # a POST that reached the server isn't replayed
+            # Otherwise urllib3 retries any 429 with a Retry-After itself, behind the rate limiter's back
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+
+    def session(self, url):
+        """The pooled session for url's scheme+host, created on first use"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        import requests
+        from requests.adapters import HTTPAdapter
+        with self.lock:
+            session = self.sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=self._retry())
+                session.mount(origin, adapter)
+                self.sessions[origin] = session
+            return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # Per request, so REQUESTS_CA_BUNDLE can't quietly override a custom CA path
+        kwargs.setdefault("verify", self.verify)
+        if self.metrics is None:
+            return self.send(method, url, **kwargs)
+
+        host = urlparse(url).netloc
+        status = "error"
+        start = time.perf_counter()
+        try:
+            response = self.send(method, url, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            self.metrics.observe("http_request_seconds", time.perf_counter() - start, method=method, host=host)
+            self.metrics.inc("http_requests_total", method=method, host=host, status=status)
+
+    def send(self, method, url, **kwargs):
+        """Put the request on the wire (the seam RecordingTransport and ReplayTransport hook into)"""
+        return self.session(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()